@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Batch render many CV YAML files in parallel.
+
+Files are rendered on a pool of resident RenderCV workers (the same render
+pipeline the editor uses). A manifest in the output directory records the
+content hash of every file, so unchanged files are skipped on the next run.
+
+Usage:
+    python batch_render.py cvs/                      # every *.yaml in a directory
+    python batch_render.py "cvs/**/*_CV.yaml" -j 4   # a glob, four workers
+    python batch_render.py cvs/ --profile export --force
+"""
+
+import argparse
+import glob
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from utils.render_cache import get_rendercv_version, make_cache_key
+from utils.render_pool import RenderPool
+from utils.render_profiles import RENDER_PROFILES, render_args
+from utils.render_worker import RenderCancelled
+
+MANIFEST_NAME = "batch_manifest.json"
+
+def collect_files(targets):
+    """Expand directories and glob patterns into a sorted list of YAML files."""
+    files = set()
+    for target in targets:
+        if os.path.isdir(target):
+            for pattern in ("*.yaml", "*.yml"):
+                files.update(glob.glob(os.path.join(target, pattern)))
+        else:
+            files.update(path for path in glob.glob(target, recursive=True) if os.path.isfile(path))
+    return sorted(os.path.abspath(path) for path in files)
+
+def load_manifest(path):
+    """Load the manifest of previously rendered files, if any."""
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(path, manifest):
+    """Write the manifest atomically."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=2)
+    os.replace(tmp_path, path)
+
+def output_name(yaml_path, root, keep_extension=False):
+    """Name a file's PDF after its path relative to the common root.
+
+    With keep_extension the YAML extension stays in the name, which tells
+    cv.yaml and cv.yml apart.
+    """
+    relative = os.path.relpath(yaml_path, root)
+    if not keep_extension:
+        relative = os.path.splitext(relative)[0]
+    return relative.replace(os.sep, "__") + ".pdf"
+
+def output_names(files, root):
+    """Give every file its own PDF name, keeping the extension where stems collide."""
+    stems = {}
+    for path in files:
+        stems.setdefault(output_name(path, root), []).append(path)
+    return {path: output_name(path, root, keep_extension=len(paths) > 1)
+            for paths in stems.values() for path in paths}
+
+def render_file(pool, yaml_content, pdf_target, profile, timeout):
+    """Render one document on the calling pool thread's worker."""
+    started = time.perf_counter()
+    render_dir = None
+    try:
+        render_dir = tempfile.mkdtemp(prefix="batch_render_")
+        with open(os.path.join(render_dir, "temp_cv.yaml"), 'w', encoding='utf-8') as file:
+            file.write(yaml_content)
+    except OSError as e:
+        if render_dir:
+            shutil.rmtree(render_dir, ignore_errors=True)
+        return {"error": f"Could not prepare render: {e}", "duration": time.perf_counter() - started}
+    try:
+        worker = pool.current_worker()
+        try:
+            result = worker.run(render_args("temp_cv.yaml", profile), cwd=render_dir, timeout=timeout)
+        except RenderCancelled:
+            return {"error": "Render cancelled", "duration": time.perf_counter() - started}
+        except Exception as e:
+            return {"error": f"Render error: {e}", "duration": time.perf_counter() - started}
+
+        output_dir = os.path.join(render_dir, "rendercv_output")
+        if not os.path.isdir(output_dir):
+            output_dir = render_dir
+        pdf_files = [name for name in os.listdir(output_dir) if name.endswith('.pdf')]
+        if result["returncode"] != 0 or not pdf_files:
+            error = (result["stderr"] or result["stdout"] or "Unknown error").strip()
+            return {"error": error.splitlines()[-1] if error else "Unknown error",
+                    "duration": time.perf_counter() - started}
+
+        try:
+            shutil.copyfile(os.path.join(output_dir, pdf_files[0]), pdf_target)
+            if profile != "preview":
+                # Keep the other formats next to the PDF
+                extras_dir = os.path.splitext(pdf_target)[0]
+                shutil.rmtree(extras_dir, ignore_errors=True)
+                shutil.copytree(output_dir, extras_dir)
+        except OSError as e:
+            return {"error": f"Could not save output: {e}", "duration": time.perf_counter() - started}
+        return {"pdf": pdf_target, "duration": time.perf_counter() - started}
+    finally:
+        shutil.rmtree(render_dir, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch render CV YAML files with RenderCV.")
+    parser.add_argument("targets", nargs="+", help="Directories or glob patterns of YAML files")
+    parser.add_argument("-o", "--output", default="batch_output", help="Directory for the PDFs")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 2,
+                        help="Number of parallel render workers")
+    parser.add_argument("--profile", choices=sorted(RENDER_PROFILES), default="preview",
+                        help="Render profile (preview = PDF only)")
+    parser.add_argument("--timeout", type=int, default=60, help="Per-file render timeout in seconds")
+    parser.add_argument("--force", action="store_true", help="Render files even if unchanged")
+    args = parser.parse_args()
+
+    files = collect_files(args.targets)
+    if not files:
+        print("❌ No YAML files found")
+        return 1
+
+    os.makedirs(args.output, exist_ok=True)
+    manifest_path = os.path.join(args.output, MANIFEST_NAME)
+    manifest = load_manifest(manifest_path)
+    root = os.path.commonpath([os.path.dirname(path) for path in files])
+    version = get_rendercv_version()
+    names = output_names(files, root)
+
+    results = {}
+    to_render = []
+    for path in files:
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                content = file.read()
+        except (OSError, UnicodeDecodeError) as e:
+            results[path] = {"status": "failed", "error": f"Could not read file: {e}"}
+            manifest.pop(path, None)
+            continue
+        key = make_cache_key(content + "\0" + args.profile, version)
+        previous = manifest.get(path)
+        if (not args.force and previous and previous.get("key") == key
+                and os.path.exists(previous.get("pdf", ""))):
+            results[path] = {"status": "skipped", "pdf": previous["pdf"]}
+        else:
+            pdf_target = os.path.abspath(os.path.join(args.output, names[path]))
+            to_render.append((path, content, key, pdf_target))
+
+    unreadable = sum(1 for result in results.values() if result["status"] == "failed")
+    print(f"📄 {len(files)} files: {len(to_render)} to render, "
+          f"{len(files) - len(to_render) - unreadable} unchanged, {unreadable} unreadable "
+          f"(profile: {args.profile})")
+
+    workers = max(1, min(args.jobs, len(to_render)))
+    started = time.perf_counter()
+    if to_render:
+        pool = RenderPool(size=workers)
+        try:
+            # One "session" per file so the pool spreads them over every worker
+            futures = [(path, key, pool.submit(path, render_file, pool, content, pdf_target,
+                                               args.profile, args.timeout))
+                       for path, content, key, pdf_target in to_render]
+            for path, key, future in futures:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # One broken file must not lose the other results
+                    result = {"error": f"Render error: {e}", "duration": 0.0}
+                if "error" in result:
+                    results[path] = {"status": "failed", **result}
+                    manifest.pop(path, None)
+                else:
+                    results[path] = {"status": "rendered", **result}
+                    manifest[path] = {"key": key, "pdf": result["pdf"],
+                                      "rendered_at": datetime.now().isoformat()}
+                print(f"  {'✅' if 'error' not in result else '❌'} "
+                      f"{os.path.relpath(path, root)} ({result['duration'] * 1000:.0f} ms)")
+        finally:
+            pool.shutdown()
+    save_manifest(manifest_path, manifest)
+    elapsed = time.perf_counter() - started
+
+    print("\nSummary")
+    print(f"{'File':<40} {'Status':<9} {'Time':>9}")
+    for path in files:
+        result = results[path]
+        duration = f"{result['duration'] * 1000:.0f} ms" if "duration" in result else "-"
+        print(f"{os.path.relpath(path, root):<40} {result['status']:<9} {duration:>9}")
+    failures = [path for path in files if results[path]["status"] == "failed"]
+    for path in failures:
+        print(f"  ❌ {os.path.relpath(path, root)}: {results[path]['error']}")
+
+    counts = {status: sum(1 for r in results.values() if r["status"] == status)
+              for status in ("rendered", "skipped", "failed")}
+    print(f"\n{counts['rendered']} rendered, {counts['skipped']} skipped, "
+          f"{counts['failed']} failed in {elapsed:.1f}s with {workers} workers")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
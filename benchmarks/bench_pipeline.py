@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Benchmark: the save -> render -> serve pipeline on synthetic CVs.
+
+Synthetic documents are generated from the structure of working_CV.yaml,
+from small (the file as-is) to very large (many sections, many highlights).
+For each size the benchmark measures:
+  - validate:          yaml.safe_load of the document
+  - save:              SimpleYAMLEditor.save_yaml with a warm render cache
+  - render:            start_render -> finished render_pdf on the worker pool
+  - create_suggestion: ChatManager.create_suggestion diffing an edited copy
+  - serve / serve_304: GET /pdf/<id> through the Flask app (full and revalidated)
+
+Results are written as JSON so runs can be compared between versions.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--sizes small,medium] [--runs 20]
+        [--renders 3] [--output bench_pipeline.json] [--compare baseline.json]
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import yaml
+
+# Multipliers applied to working_CV.yaml: (section copies, entries per section, highlights per entry)
+SIZES = {
+    "small": (1, 1, None),
+    "medium": (2, 3, 6),
+    "large": (4, 6, 10),
+    "xlarge": (8, 12, 16),
+}
+
+def synthesize(base, section_copies, entry_factor, highlights):
+    """Scale a parsed CV: clone sections, repeat entries and pad highlights."""
+    doc = copy.deepcopy(base)
+    sections = doc["cv"]["sections"]
+    scaled = {}
+    for copy_index in range(section_copies):
+        for name, entries in sections.items():
+            section_name = name if copy_index == 0 else f"{name}_{copy_index + 1}"
+            new_entries = []
+            for repeat in range(entry_factor):
+                for entry in entries:
+                    entry = copy.deepcopy(entry)
+                    if isinstance(entry, dict):
+                        if repeat:
+                            for key in ("company", "institution", "name", "label"):
+                                if isinstance(entry.get(key), str):
+                                    entry[key] = f"{entry[key]} ({repeat + 1})"
+                        if highlights and isinstance(entry.get("highlights"), list):
+                            while len(entry["highlights"]) < highlights:
+                                n = len(entry["highlights"]) + 1
+                                entry["highlights"].append(
+                                    f"Delivered improvement #{n} across data, tooling and "
+                                    f"stakeholder reporting, cutting turnaround by {n * 3}%")
+                    elif repeat and isinstance(entry, str):
+                        entry = f"{entry} ({repeat + 1})"
+                    new_entries.append(entry)
+            scaled[section_name] = new_entries
+    doc["cv"]["sections"] = scaled
+    return doc
+
+def describe(doc, text):
+    """Size figures for a synthetic document."""
+    sections = doc["cv"]["sections"]
+    entries = [entry for section in sections.values() for entry in section]
+    highlights = sum(len(entry.get("highlights", [])) for entry in entries if isinstance(entry, dict))
+    return {"bytes": len(text.encode("utf-8")), "lines": text.count("\n") + 1,
+            "sections": len(sections), "entries": len(entries), "highlights": highlights}
+
+def edited_copy(doc):
+    """An edited version of a document, as an AI suggestion would produce."""
+    doc = copy.deepcopy(doc)
+    for index, entries in enumerate(doc["cv"]["sections"].values()):
+        if index % 3 == 0 and entries and isinstance(entries[0], dict) and entries[0].get("highlights"):
+            entries[0]["highlights"][0] = "Rewritten highlight with stronger, quantified impact"
+    return yaml.safe_dump(doc, sort_keys=False, allow_unicode=True)
+
+def measure(fn, runs):
+    """Call fn `runs` times and return the latencies in seconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def summarize(timings, **extra):
+    ordered = sorted(timings)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    summary = {
+        "n": len(timings),
+        "mean_ms": round(statistics.mean(timings) * 1000, 3),
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "p95_ms": round(p95 * 1000, 3),
+        "min_ms": round(ordered[0] * 1000, 3),
+    }
+    summary.update(extra)
+    return summary
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+def compare(results, baseline_path):
+    """Print the change of every median against a previous results file."""
+    with open(baseline_path, 'r', encoding='utf-8') as file:
+        baseline = json.load(file)["results"]
+    print(f"\nCompared with {baseline_path} (median, + is slower):")
+    for stage, by_size in results.items():
+        for size, summary in by_size.items():
+            old = baseline.get(stage, {}).get(size)
+            if not old or not old.get("median_ms"):
+                continue
+            change = (summary["median_ms"] - old["median_ms"]) / old["median_ms"] * 100
+            flag = "  ⚠️" if change > 10 else ""
+            print(f"  {stage:<18} {size:<7} {old['median_ms']:9.2f} -> {summary['median_ms']:9.2f} ms "
+                  f"({change:+.0f}%){flag}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(SIZES), help="Comma-separated document sizes")
+    parser.add_argument("--runs", type=int, default=20, help="Iterations for the in-process stages")
+    parser.add_argument("--renders", type=int, default=3, help="Renders per size")
+    parser.add_argument("--yaml", default=os.path.join(REPO_ROOT, "working_CV.yaml"),
+                        help="CV whose structure the synthetic documents follow")
+    parser.add_argument("--output", default="bench_pipeline.json", help="Where to write the JSON results")
+    parser.add_argument("--compare", help="Previous results file to compare against")
+    args = parser.parse_args()
+
+    sizes = [size.strip() for size in args.sizes.split(",") if size.strip()]
+    unknown = [size for size in sizes if size not in SIZES]
+    if unknown:
+        parser.error(f"unknown sizes: {', '.join(unknown)} (choose from {', '.join(SIZES)})")
+    output_path = os.path.abspath(args.output)
+    compare_path = os.path.abspath(args.compare) if args.compare else None
+
+    with open(args.yaml, 'r', encoding='utf-8') as file:
+        base = yaml.safe_load(file)
+
+    # The editor module works relative to the current directory: keep it in a sandbox
+    workdir = tempfile.mkdtemp(prefix="bench_pipeline_")
+    os.chdir(workdir)
+    with open("working_CV.yaml", 'w', encoding='utf-8') as file:
+        yaml.safe_dump(base, file, sort_keys=False, allow_unicode=True)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        import simple_yaml_editor as app_module
+        from utils.workspaces import DEFAULT_SESSION
+        editor = app_module.workspaces.get(DEFAULT_SESSION).editor
+        chat_manager = app_module.ChatManager()
+    client = app_module.app.test_client()
+
+    # One throwaway render so worker start-up is not billed to the first size
+    with contextlib.redirect_stdout(io.StringIO()):
+        info = editor.start_render(f"{yaml.safe_dump(base, sort_keys=False)}# warm-up\n")
+        if info["timestamp"] in editor.pending_renders:
+            editor.pending_renders[info["timestamp"]].result()
+
+    documents = {}
+    results = {stage: {} for stage in ("validate", "save", "render", "create_suggestion", "serve", "serve_304")}
+    quiet = io.StringIO()
+
+    for size in sizes:
+        doc = synthesize(base, *SIZES[size])
+        text = yaml.safe_dump(doc, sort_keys=False, allow_unicode=True)
+        documents[size] = describe(doc, text)
+        print(f"📄 {size}: {documents[size]['bytes'] / 1024:.1f} KiB, {documents[size]['sections']} sections, "
+              f"{documents[size]['entries']} entries, {documents[size]['highlights']} highlights")
+
+        results["validate"][size] = summarize(measure(lambda: yaml.safe_load(text), args.runs))
+
+        # Warm cache: save_yaml costs validation, the file write and the cache lookup
+        placeholder_pdf = os.path.join(workdir, f"placeholder_{size}.pdf")
+        with open(placeholder_pdf, 'wb') as file:
+            file.write(b"%PDF-1.4\n" + os.urandom(64 * 1024))
+        editor.render_cache.put(editor.render_cache.key_for(text), placeholder_pdf)
+        with contextlib.redirect_stdout(quiet):
+            results["save"][size] = summarize(measure(lambda: editor.save_yaml(text), args.runs))
+
+        # Cold renders: unique content each time so the cache never answers
+        render_timings = []
+        successes = 0
+        for run in range(args.renders):
+            unique = f"{text}# bench {size} {run} {time.time_ns()}\n"
+            with contextlib.redirect_stdout(quiet):
+                start = time.perf_counter()
+                info = editor.start_render(unique)
+                future = editor.pending_renders.get(info["timestamp"])
+                outcome = future.result() if future else {"success": info.get("ready")}
+                render_timings.append(time.perf_counter() - start)
+            successes += bool(outcome.get("success"))
+        results["render"][size] = summarize(render_timings, successes=successes)
+
+        suggested = edited_copy(doc)
+        with contextlib.redirect_stdout(quiet):
+            results["create_suggestion"][size] = summarize(
+                measure(lambda: chat_manager.create_suggestion(text, suggested, "benchmark"), args.runs))
+        chat_manager.pending_suggestions.clear()
+
+        # Serving: the last warm save points the current render at the placeholder PDF
+        with contextlib.redirect_stdout(quiet):
+            info = editor.save_yaml(text)["render"]
+        url = info["pdf_url"]
+        first = client.get(url)
+        etag = first.headers.get("ETag")
+        pdf_size = len(first.data)
+        serve = measure(lambda: client.get(url), args.runs)
+        results["serve"][size] = summarize(
+            serve, status=first.status_code,
+            requests_per_s=round(len(serve) / sum(serve), 1),
+            mb_per_s=round(pdf_size * len(serve) / sum(serve) / 1e6, 1))
+        revalidate = measure(lambda: client.get(url, headers={"If-None-Match": etag}), args.runs)
+        results["serve_304"][size] = summarize(
+            revalidate, requests_per_s=round(len(revalidate) / sum(revalidate), 1))
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "rendercv_version": editor.render_cache.get_stats()["rendercv_version"],
+            "runs": args.runs,
+            "renders": args.renders,
+        },
+        "documents": documents,
+        "results": results,
+    }
+    with open(output_path, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2)
+
+    print(f"\n{'stage':<18} " + " ".join(f"{size:>10}" for size in sizes) + "   (median ms)")
+    for stage, by_size in results.items():
+        print(f"{stage:<18} " + " ".join(f"{by_size[size]['median_ms']:>10.2f}" for size in sizes))
+    if any(results["render"][size]["successes"] < results["render"][size]["n"] for size in sizes):
+        print("⚠️  Some renders failed; render timings cover the failing path")
+    print(f"\n💾 Results written to {output_path}")
+
+    if compare_path:
+        compare(results, compare_path)
+
+    app_module.render_pool.shutdown()
+
+if __name__ == "__main__":
+    main()
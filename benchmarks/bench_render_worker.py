@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: resident RenderCV worker vs. a fresh `python -m rendercv` per render.
+
+Usage:
+    python benchmarks/bench_render_worker.py [--runs 5] [--yaml working_CV.yaml]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.render_worker import RenderWorker
+
+def time_renders(worker, yaml_content, runs):
+    """Render the same document `runs` times and return per-render latencies."""
+    timings = []
+    returncodes = set()
+    for _ in range(runs):
+        render_dir = tempfile.mkdtemp(prefix="bench_render_")
+        try:
+            with open(os.path.join(render_dir, "temp_cv.yaml"), 'w', encoding='utf-8') as file:
+                file.write(yaml_content)
+            start = time.perf_counter()
+            result = worker.run(["render", "temp_cv.yaml"], cwd=render_dir, timeout=120)
+            timings.append(time.perf_counter() - start)
+            returncodes.add(result["returncode"])
+        finally:
+            shutil.rmtree(render_dir, ignore_errors=True)
+    return timings, returncodes
+
+def summarize(label, timings):
+    print(f"{label:<12} mean {statistics.mean(timings) * 1000:8.1f} ms   "
+          f"median {statistics.median(timings) * 1000:8.1f} ms   "
+          f"min {min(timings) * 1000:8.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Renders per mode")
+    parser.add_argument("--yaml", default="working_CV.yaml", help="CV file to render")
+    args = parser.parse_args()
+
+    with open(args.yaml, 'r', encoding='utf-8') as file:
+        yaml_content = file.read()
+
+    subprocess_worker = RenderWorker(enabled=False)
+    sub_timings, sub_codes = time_renders(subprocess_worker, yaml_content, args.runs)
+
+    resident_worker = RenderWorker()
+    start = time.perf_counter()
+    if not resident_worker.start():
+        print("❌ Resident worker could not start (is rendercv[full] installed?)")
+        sys.exit(1)
+    warmup = time.perf_counter() - start
+    try:
+        res_timings, res_codes = time_renders(resident_worker, yaml_content, args.runs)
+    finally:
+        resident_worker.stop()
+
+    print(f"RenderCV benchmark: {args.runs} renders of {args.yaml}")
+    summarize("subprocess", sub_timings)
+    summarize("resident", res_timings)
+    print(f"worker warm-up (one-off): {warmup * 1000:.1f} ms")
+    saved = statistics.mean(sub_timings) - statistics.mean(res_timings)
+    print(f"saved per render: {saved * 1000:.1f} ms "
+          f"({saved / statistics.mean(sub_timings) * 100:.0f}%)")
+    if sub_codes != {0} or res_codes != {0}:
+        print(f"⚠️  Some renders failed (return codes: subprocess {sorted(sub_codes)}, "
+              f"resident {sorted(res_codes)}); timings cover the failing path")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Shared pytest fixtures.
+RenderCV renders are replaced by a small fake worker script that speaks the
+resident worker's JSON-lines protocol, so render-path tests run without
+Typst and in milliseconds. What a fake render does is driven by the YAML it
+is given: `# sleep: 2` delays it, `# fail` makes it fail and `# crash` kills
+the worker process mid-job.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+FAKE_WORKER = r'''
+import json, os, sys, time
+
+def render(args, cwd):
+    name = args[1]
+    with open(os.path.join(cwd, name), encoding="utf-8") as file:
+        text = file.read()
+    with open(os.environ["FAKE_WORKER_LOG"], "a", encoding="utf-8") as log:
+        log.write(json.dumps({"pid": os.getpid(), "cwd": cwd, "args": args}) + "\n")
+    for line in text.splitlines():
+        if line.startswith("# sleep:"):
+            time.sleep(float(line.split(":", 1)[1]))
+    if "# crash" in text:
+        os._exit(3)
+    if "# fail" in text:
+        return {"returncode": 1, "stdout": "", "stderr": "fake failure"}
+    output = os.path.join(cwd, "rendercv_output")
+    os.makedirs(output, exist_ok=True)
+    stem = os.path.splitext(name)[0]
+    with open(os.path.join(output, stem + ".pdf"), "w") as file:
+        file.write("%PDF-fake " + text)
+    if "--dont-generate-markdown" not in args:
+        with open(os.path.join(output, stem + ".md"), "w") as file:
+            file.write(text)
+    return {"returncode": 0, "stdout": "rendered", "stderr": ""}
+
+if sys.argv[1:2] == ["--once"]:
+    result = render(sys.argv[2:], os.getcwd())
+    sys.stdout.write(result["stdout"])
+    sys.stderr.write(result["stderr"])
+    sys.exit(result["returncode"])
+
+if os.environ.get("FAKE_WORKER_BROKEN"):
+    print(json.dumps({"ready": False, "error": "broken"}), flush=True)
+    sys.exit(1)
+print(json.dumps({"ready": True}), flush=True)
+for line in sys.stdin:
+    job = json.loads(line)
+    print(json.dumps(render(job["args"], job["cwd"])), flush=True)
+'''
+
+class FakeRenderCV:
+    """Handle on the fake worker: the jobs it ran and the processes that ran them."""
+
+    def __init__(self, log_path):
+        self.log_path = log_path
+
+    def jobs(self):
+        if not os.path.exists(self.log_path):
+            return []
+        with open(self.log_path, encoding="utf-8") as log:
+            return [json.loads(line) for line in log]
+
+@pytest.fixture
+def fake_rendercv(tmp_path, monkeypatch):
+    """Route the resident worker and the subprocess fallback to the fake worker."""
+    script = tmp_path / "fake_worker.py"
+    script.write_text(FAKE_WORKER, encoding="utf-8")
+    log_path = str(tmp_path / "fake_worker.log")
+    monkeypatch.setenv("FAKE_WORKER_LOG", log_path)
+    real_popen = subprocess.Popen
+
+    def popen(cmd, *args, **kwargs):
+        if list(cmd[:3]) == [sys.executable, "-m", "utils.render_worker"]:
+            cmd = [sys.executable, str(script)]
+        elif list(cmd[:3]) == [sys.executable, "-m", "rendercv"]:
+            cmd = [sys.executable, str(script), "--once"] + list(cmd[3:])
+        return real_popen(cmd, *args, **kwargs)
+
+    monkeypatch.setattr("utils.render_worker.subprocess.Popen", popen)
+    return FakeRenderCV(log_path)
@@ -7,22 +7,54 @@ Right: Fast PDF preview using RenderCV
 """
 
 import os
+import io
 try:
     import yaml
 except ImportError:  # pragma: no cover - runtime dependency check
     print("\u26a0\ufe0f PyYAML is not installed. Install with: pip install pyyaml")
     raise SystemExit(1)
 import subprocess
+import atexit
+import asyncio
+import threading
 import tempfile
 import shutil
 from datetime import datetime
 from pathlib import Path
-from flask import Flask, render_template_string, request, jsonify, send_file
+from flask import Flask, render_template_string, request, jsonify, send_file, send_from_directory, Response, stream_with_context, g
+from werkzeug.http import dump_cookie
 import json
+import time
 import uuid
-import difflib
-from concurrent.futures import ThreadPoolExecutor
+import hashlib
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import TimeoutError as FutureTimeout
 import re
+from utils.render_cache import RenderCache
+from utils.render_worker import RenderWorker, RenderCancelled
+from utils.render_pool import RenderPool
+from utils.workspaces import Workspace, WorkspaceManager, DEFAULT_SESSION, new_session_id, is_valid_session_id
+from utils.render_events import RenderEventBroker, format_sse
+from utils.render_gc import RenderSweeper, SweeperGroup
+from utils.render_profiles import RENDER_PROFILES, RenderTimings, render_args
+from utils.render_history import RenderHistory
+from utils.pdf_cache import PDFBytesCache
+from utils.metrics import MetricsRegistry
+from utils.schema_validation import SchemaValidator
+from utils.persistence import WriteBehindFile
+from utils.yaml_cache import ParsedDocCache, thaw
+from utils.text_delta import content_revision, apply_line_patch
+from utils.chat_stream import JSONFieldStreamer
+from utils.chat_engine import AsyncChatEngine, ChatTimeout
+from utils.llm_cache import LLMResponseCache
+from utils.yaml_patch import PatchError, apply_patch, format_pointer
+from utils.tree_diff import diff_documents, same_tree
+from utils.yaml_roundtrip import update_text
+from utils.intent_router import IntentRouter
+from utils.chat_store import ChatStore
+from utils.chat_db import ChatDatabase
+from utils.asgi import ASGIApp, ASGIResponse, json_response, run_blocking
 
 # AI Integration - you can switch between different providers
 try:
@@ -34,11 +66,83 @@ except ImportError:
 
 app = Flask(__name__)
 
+CHAT_MODEL = "gpt-4o-mini"  # or gpt-4, gpt-3.5-turbo, etc.
+CHAT_TEMPERATURE = 0.3  # Lower = more focused, Higher = more creative
+CHAT_MAX_TOKENS = 2000
+EXPORT_TIMEOUT = 60  # Seconds a full export may render
+EXPORT_QUEUE_TIMEOUT = 60  # Seconds an export may wait for a free render worker
+CHAT_HISTORY_PAGE = 100  # Messages per /api/chat/history page by default
+CHAT_HISTORY_MAX_PAGE = 500
+
+CHAT_SYSTEM_PROMPT = """You are an AI assistant helping with CV/resume editing. You can:
+1. Answer questions about CV writing and formatting
+2. Suggest improvements to the CV content  
+3. Suggest edits to the CV's YAML
+
+IMPORTANT RULES:
+- For general questions, advice, or explanations: Set edits to null and provide helpful text in chat_response
+- For actual CV modifications: Describe them as a list of edit operations in the edits field
+- NEVER paste YAML in chat_response - only provide explanations and advice there
+- NEVER return the whole document: only the operations needed for the change
+
+Each edit is a JSON object with "op", "path" and (for add and replace) "value":
+- "path" is a JSON Pointer into the parsed YAML, e.g. "/cv/phone" or "/cv/sections/experience/0/highlights/1"
+- "replace" sets an existing key or list item
+- "add" inserts a key, or a list item before the given index; "/-" appends to a list
+- "remove" deletes a key or list item
+- "move" moves the value at "from" to "path"
+- "value" is JSON (a string, number, list or object), never a YAML string
+Operations are applied in order, so list indices refer to the list after the previous edits.
+
+The CV uses RenderCV format. Here's the current YAML:
+
+```yaml
+{current_yaml}
+```
+
+Respond in JSON format:
+{{
+    "chat_response": "Your explanation, advice, or response (DO NOT include YAML here)",
+    "edits": [{{"op": "replace", "path": "/cv/sections/skills/0/details", "value": "Python, SQL"}}],
+    "explanation": "Short explanation of the changes you're suggesting"
+}}
+
+EXAMPLES:
+- User asks "How do I improve my CV?": Set edits to null, provide advice in chat_response
+- User asks "Add a new skill": One "add" edit appending the skill entry to the skills section
+- User asks "What's wrong with my CV?": Set edits to null, provide analysis in chat_response
+- User asks "Reword my first job's highlights": One "replace" edit per changed highlight
+
+Make sure your JSON is properly formatted and valid.
+"""
+
+# Part of the AI response cache key: editing the prompt invalidates cached replies
+CHAT_PROMPT_VERSION = hashlib.sha256(CHAT_SYSTEM_PROMPT.encode("utf-8")).hexdigest()[:12]
+
 class ChatManager:
-    def __init__(self):
-        self.messages = []
+    # The setup warning is printed once per process, not once per session
+    _warned_no_key = False
+
+    def __init__(self, parsed_docs=None, metrics=None, chat_engine=None, llm_cache=None, intent_router=None,
+                 store=None):
+        # Bounded chat history and suggestions, see create_chat_store
+        self.store = store or ChatStore()
+        self.llm_cache = llm_cache  # optional, see create_llm_cache
+        self.intent_router = intent_router or IntentRouter()
+        # Shared between sessions when provided: one event loop and one pooled client
+        self.chat_engine = chat_engine or create_chat_engine()
+        self.parsed_docs = parsed_docs or ParsedDocCache()
+        self.metrics = metrics or MetricsRegistry()
+        self.chat_ttft = self.metrics.histogram(
+            "cv_chat_ttft_seconds", "Time from sending a chat request to the first streamed token")
+        self.chat_duration = self.metrics.histogram(
+            "cv_chat_duration_seconds", "Time to a complete AI reply", labels=("mode",))
+        self.chat_requests = self.metrics.counter(
+            "cv_chat_requests_total", "AI chat requests by mode and outcome", labels=("mode", "outcome"))
+        self.chat_intents = self.metrics.counter(
+            "cv_chat_intents_total", "Chat messages matched by the intent router, answered locally or escalated",
+            labels=("intent", "outcome"))
         self.openai_client = None
-        self.pending_suggestions = {}  # Store pending suggestions
         self.setup_ai()
     
     def setup_ai(self):
@@ -46,10 +150,13 @@ class ChatManager:
         if AI_AVAILABLE:
             api_key = os.getenv('OPENAI_API_KEY')
             if api_key:
-                self.openai_client = openai.OpenAI(api_key=api_key)
+                self.openai_client = self.chat_engine.get_client(
+                    lambda: openai.AsyncOpenAI(api_key=api_key, max_retries=1))
             else:
-                print("⚠️  OPENAI_API_KEY not found in environment variables")
-                print("   Set it with: export OPENAI_API_KEY=your_key_here")
+                if not ChatManager._warned_no_key:
+                    ChatManager._warned_no_key = True
+                    print("⚠️  OPENAI_API_KEY not found in environment variables")
+                    print("   Set it with: export OPENAI_API_KEY=your_key_here")
                 self.add_message("system", "⚠️ OpenAI API key not found. Chat features are disabled.")
         else:
             self.add_message("system", "⚠️ OpenAI package is not installed. Chat features are disabled.")
@@ -61,291 +168,541 @@ class ChatManager:
             "role": role,
             "content": content,
             "timestamp": datetime.now().isoformat(),
-            "yaml_content": yaml_content,
+            # The suggestion already holds these changes as a patch
+            "yaml_content": None if suggestion_id else yaml_content,
             "suggestion_id": suggestion_id
         }
-        self.messages.append(message)
-        return message
+        return self.store.add_message(message)
     
-    def get_chat_history(self):
-        """Get the chat history."""
-        return self.messages
+    def get_chat_history(self, limit=None, before=None):
+        """Get the chat history, optionally only the `limit` messages before seq `before`."""
+        return self.store.history(limit=limit, before=before)
     
     def create_suggestion(self, original_yaml, suggested_yaml, explanation):
         """Create a new suggestion with diff information."""
         suggestion_id = str(uuid.uuid4())
         
-        print(f"DEBUG: Creating suggestion with ID: {suggestion_id}")
-        print(f"DEBUG: Original YAML length: {len(original_yaml)}")
-        print(f"DEBUG: Suggested YAML length: {len(suggested_yaml)}")
-        print(f"DEBUG: Explanation: {explanation}")
-        
         # Ensure suggested_yaml is a string
         if isinstance(suggested_yaml, dict):
             import yaml
             suggested_yaml = yaml.dump(suggested_yaml, default_flow_style=False, sort_keys=False)
-            print(f"DEBUG: Converted dict to YAML string, length: {len(suggested_yaml)}")
-        
-        # Generate diff
-        original_lines = original_yaml.splitlines(keepends=True)
-        suggested_lines = suggested_yaml.splitlines(keepends=True)
         
-        diff = list(difflib.unified_diff(
-            original_lines, 
-            suggested_lines, 
-            fromfile='current', 
-            tofile='suggested',
-            lineterm=''
-        ))
+        # Per-node changes as line hunks against the original, for highlighting
+        changes = diff_documents(original_yaml, suggested_yaml, load=self.parsed_docs.get)
         
         suggestion = {
             "id": suggestion_id,
             "original_yaml": original_yaml,
             "suggested_yaml": suggested_yaml,
             "explanation": explanation,
-            "diff": diff,
+            "changes": changes,
             "created_at": datetime.now().isoformat(),
             "status": "pending"  # pending, accepted, declined
         }
         
-        self.pending_suggestions[suggestion_id] = suggestion
-        print(f"DEBUG: Suggestion created and stored. Total suggestions: {len(self.pending_suggestions)}")
+        self.store.add_suggestion(suggestion)
         return suggestion
     
     def get_suggestion(self, suggestion_id):
         """Get a specific suggestion."""
-        return self.pending_suggestions.get(suggestion_id)
+        return self.store.get_suggestion(suggestion_id)
     
     def accept_suggestion(self, suggestion_id):
         """Accept a suggestion."""
-        suggestion = self.pending_suggestions.get(suggestion_id)
+        suggestion = self.store.set_status(suggestion_id, "accepted")
         if suggestion:
-            suggestion["status"] = "accepted"
             return suggestion["suggested_yaml"]
         return None
     
     def decline_suggestion(self, suggestion_id):
         """Decline a suggestion."""
-        suggestion = self.pending_suggestions.get(suggestion_id)
-        if suggestion:
-            suggestion["status"] = "declined"
-        return suggestion
+        return self.store.set_status(suggestion_id, "declined")
 
     def apply_quick_edits(self, user_message: str, current_yaml: str):
-        """Handle simple edits directly without calling the AI service."""
+        """Handle routine edits locally with the intent router instead of calling the AI service."""
         try:
-            data = yaml.safe_load(current_yaml) or {}
+            document = self.parsed_docs.get(current_yaml)
         except yaml.YAMLError:
             return None
 
-        if not isinstance(data, dict) or "cv" not in data:
+        if not isinstance(document, Mapping) or "cv" not in document:
             return None
 
-        cv_data = data.get("cv", {})
-        original = yaml.dump(data, default_flow_style=False, sort_keys=False)
-        modified = False
-        explanations = []
-
-        # Name update
-        m = re.search(r"(?:change|update|set).*name\s*(?:to)?\s*(.+)", user_message, re.I)
-        if m:
-            new_name = m.group(1).strip()
-            if new_name and cv_data.get("name") != new_name:
-                explanations.append(f"Updated name from '{cv_data.get('name')}' to '{new_name}'")
-                cv_data["name"] = new_name
-                modified = True
-
-        # Email update
-        m = re.search(r"(?:change|update|set).*email\s*(?:to)?\s*([\w.+-]+@[\w.-]+)", user_message, re.I)
-        if m:
-            new_email = m.group(1).strip()
-            if cv_data.get("email") != new_email:
-                explanations.append(f"Updated email from '{cv_data.get('email')}' to '{new_email}'")
-                cv_data["email"] = new_email
-                modified = True
-
-        # Phone update
-        m = re.search(r"(?:change|update|set).*phone\s*(?:to)?\s*([\d +().-]+)", user_message, re.I)
-        if m:
-            new_phone = m.group(1).strip()
-            if cv_data.get("phone") != new_phone:
-                explanations.append(f"Updated phone from '{cv_data.get('phone')}' to '{new_phone}'")
-                cv_data["phone"] = new_phone
-                modified = True
-
-        # Location update
-        m = re.search(r"(?:change|update|set).*location\s*(?:to)?\s*(.+)", user_message, re.I)
-        if m:
-            new_loc = m.group(1).strip()
-            if new_loc and cv_data.get("location") != new_loc:
-                explanations.append(
-                    f"Updated location from '{cv_data.get('location')}' to '{new_loc}'"
-                )
-                cv_data["location"] = new_loc
-                modified = True
-
-        if not modified:
+        routed = self.intent_router.route(user_message, document)
+        if routed is None:
+            return None
+        if not routed["handled"]:
+            self.chat_intents.inc(intent=routed["intent"], outcome="escalated")
             return None
+        self.chat_intents.inc(intent=routed["intent"], outcome="local")
 
-        data["cv"] = cv_data
-        new_yaml = yaml.dump(data, default_flow_style=False, sort_keys=False)
-        suggestion = self.create_suggestion(original, new_yaml, "\n".join(explanations))
+        # Rewrite only the edited fields, keeping the rest of the text as is
+        new_yaml = update_text(current_yaml, routed["document"], load=self.parsed_docs.get)
+        suggestion = self.create_suggestion(current_yaml, new_yaml, routed["explanation"])
 
         return {
-            "chat_response": "\n".join(explanations),
+            "chat_response": routed["explanation"],
             "yaml_changes": new_yaml,
             "suggestion": suggestion,
         }
     
-    async def get_ai_response(self, user_message, current_yaml):
-        """Get AI response and potentially modify YAML."""
-        if not self.openai_client:
-            return {
-                "chat_response": "AI is not available. Please set your OPENAI_API_KEY environment variable.",
-                "yaml_changes": None,
-                "suggestion": None
-            }
-        
-        # Prepare the system prompt
-        system_prompt = """You are an AI assistant helping with CV/resume editing. You can:
-1. Answer questions about CV writing and formatting
-2. Suggest improvements to the CV content  
-3. Provide suggestions for YAML modifications
-
-IMPORTANT RULES:
-- For general questions, advice, or explanations: Set yaml_changes to null and provide helpful text in chat_response
-- For actual CV modifications: Provide the complete modified YAML in yaml_changes field
-- NEVER paste the current YAML in chat_response - only provide explanations and advice there
-- When making changes, always use the yaml_changes field, not the chat_response field
-- CRITICAL: The yaml_changes field must be a YAML string, not a JSON object
+    def prompt_context(self, user_message, current_yaml):
+        """
+        The YAML shown to the model. When the message names sections of the
+        CV, only those sections are included, followed by the paths of the
+        parts left out, so section edits do not send the whole document.
+        """
+        try:
+            data = self.parsed_docs.get(current_yaml)
+        except yaml.YAMLError:
+            return current_yaml
+        cv = data.get("cv") if isinstance(data, Mapping) else None
+        sections = cv.get("sections") if isinstance(cv, Mapping) else None
+        if not isinstance(sections, Mapping):
+            return current_yaml
+
+        message = user_message.lower().replace("_", " ")
+        scoped = [name for name in sections
+                  if re.search(r"\b%ss?\b" % re.escape(str(name).replace("_", " ").lower().rstrip("s")), message)]
+        if not scoped:
+            return current_yaml
+
+        context = yaml.dump({"cv": {"sections": {name: thaw(sections[name]) for name in scoped}}},
+                            default_flow_style=False, sort_keys=False)
+        hidden = [format_pointer([key]) for key in data if key != "cv"]
+        hidden += [format_pointer(["cv", key]) for key in cv if key != "sections"]
+        hidden += [format_pointer(["cv", "sections", name]) for name in sections if name not in scoped]
+        if hidden:
+            context += "# Not shown: " + ", ".join(hidden) + "\n"
+        return context
+
+    def build_messages(self, user_message, current_yaml):
+        """Build the chat completion messages for a request."""
+        context = self.prompt_context(user_message, current_yaml)
+        return [
+            {"role": "system", "content": CHAT_SYSTEM_PROMPT.format(current_yaml=context)},
+            {"role": "user", "content": user_message}
+        ]
+
+    def apply_edits(self, current_yaml, edits):
+        """
+        Apply patch-style edits from the AI to the current document.
+        Returns the new YAML, or None if the edits change nothing.
+        Raises PatchError or yaml.YAMLError if they cannot be applied.
+        """
+        original = self.parsed_docs.get(current_yaml)
+        data = apply_patch(thaw(original), edits)
+        if same_tree(original, data):
+            return None
+        return update_text(current_yaml, data, load=self.parsed_docs.get)
 
-The CV uses RenderCV format. Here's the current YAML:
+    def parse_ai_response(self, ai_response, current_yaml):
+        """Turn a complete AI reply into a chat result, creating a suggestion for YAML changes."""
+        # Try to parse as JSON, fallback to plain text
+        try:
+            if ai_response:
+                parsed_response = json.loads(ai_response)
+                yaml_changes = parsed_response.get("yaml_changes")
+                edits = parsed_response.get("edits")
+                if edits:
+                    try:
+                        yaml_changes = self.apply_edits(current_yaml, edits)
+                    except (PatchError, yaml.YAMLError) as e:
+                        return {
+                            "chat_response": (f"{parsed_response.get('chat_response', '')}\n\n"
+                                              f"⚠️ The suggested edits could not be applied: {e}").strip(),
+                            "yaml_changes": None,
+                            "suggestion": None
+                        }
 
-```yaml
-{current_yaml}
-```
+                # If there are YAML changes, create a suggestion
+                suggestion = None
+                if yaml_changes and yaml_changes != current_yaml:
+                    suggestion = self.create_suggestion(
+                        current_yaml, 
+                        yaml_changes, 
+                        parsed_response.get("explanation", "AI suggested changes")
+                    )
+                
+                return {
+                    "chat_response": parsed_response.get("chat_response", ai_response),
+                    "yaml_changes": yaml_changes,
+                    "suggestion": suggestion
+                }
+            else:
+                return {
+                    "chat_response": "No response from AI",
+                    "yaml_changes": None,
+                    "suggestion": None
+                }
+        except json.JSONDecodeError:
+            # AI didn't follow JSON format. Try to extract YAML from the response
+            yaml_block = None
+            match = re.search(r"```(?:yaml)?\n(.*?)\n```", ai_response, re.DOTALL)
+            if match:
+                yaml_block = match.group(1).strip()
+                explanation = (ai_response[:match.start()] + ai_response[match.end():]).strip()
+            else:
+                # Maybe the entire response is raw YAML
+                try:
+                    self.parsed_docs.get(ai_response)
+                    yaml_block = ai_response
+                    explanation = ""
+                except yaml.YAMLError:
+                    explanation = ai_response
+
+            if yaml_block:
+                suggestion = None
+                if yaml_block != current_yaml:
+                    suggestion = self.create_suggestion(
+                        current_yaml,
+                        yaml_block,
+                        "AI suggested changes"
+                    )
+                return {
+                    "chat_response": explanation or "AI provided YAML changes.",
+                    "yaml_changes": yaml_block,
+                    "suggestion": suggestion
+                }
+            else:
+                return {
+                    "chat_response": ai_response or "No response from AI",
+                    "yaml_changes": None,
+                    "suggestion": None
+                }
 
-Respond in JSON format:
-{{
-    "chat_response": "Your explanation, advice, or response (DO NOT include YAML here)",
-    "yaml_changes": "Complete modified YAML content as a string (only if making actual changes, otherwise null)",
-    "explanation": "Detailed explanation of the changes you're suggesting"
-}}
+    def unavailable_response(self):
+        """Chat result used when no AI client is configured."""
+        return {
+            "chat_response": "AI is not available. Please set your OPENAI_API_KEY environment variable.",
+            "yaml_changes": None,
+            "suggestion": None
+        }
 
-EXAMPLES:
-- User asks "How do I improve my CV?": Set yaml_changes to null, provide advice in chat_response
-- User asks "Add a new skill": Set yaml_changes to the complete modified YAML string with the new skill added
-- User asks "What's wrong with my CV?": Set yaml_changes to null, provide analysis in chat_response
-- User asks "Make my CV more professional": Set yaml_changes to the complete modified YAML string with improvements
+    def error_response(self, message):
+        """Chat result reporting a failed AI request."""
+        return {
+            "chat_response": message,
+            "yaml_changes": None,
+            "suggestion": None
+        }
 
-CRITICAL: The yaml_changes field must be a YAML string, not a JSON object. If you're modifying the CV, return the complete YAML as a string.
+    def cached_reply(self, user_message, current_yaml):
+        """Look up a cached raw reply. Returns (cache key, reply or None)."""
+        if not self.llm_cache:
+            return None, None
+        key = self.llm_cache.key_for(user_message, current_yaml, CHAT_MODEL, CHAT_PROMPT_VERSION)
+        return key, self.llm_cache.get(key)
 
-Make sure your JSON is properly formatted and valid.
-"""
+    async def get_ai_response(self, user_message, current_yaml):
+        """Get AI response and potentially modify YAML."""
+        if not self.openai_client:
+            return self.unavailable_response()
+        cache_key, cached = await run_blocking(self.cached_reply, user_message, current_yaml)
+        if cached is not None:
+            self.chat_requests.inc(mode="request", outcome="cached")
+            # Parsing the cached reply gives this request its own suggestion
+            result = await run_blocking(self.parse_ai_response, cached, current_yaml)
+            return dict(result, cached=True)
+        started = time.perf_counter()
+        try:
+            response = await self.openai_client.chat.completions.create(
+                model=CHAT_MODEL,
+                messages=self.build_messages(user_message, current_yaml),
+                temperature=CHAT_TEMPERATURE,
+                max_tokens=CHAT_MAX_TOKENS
+            )
+        except Exception as e:
+            self.chat_requests.inc(mode="request", outcome="error")
+            return self.error_response(f"Error getting AI response: {str(e)}")
+        self.chat_duration.observe(time.perf_counter() - started, mode="request")
+        self.chat_requests.inc(mode="request", outcome="ok")
+        ai_response = response.choices[0].message.content
+        if cache_key and ai_response:
+            await run_blocking(self.llm_cache.put, cache_key, ai_response)
+        # Diffing the suggestion is CPU work; keep it off the engine's event loop
+        return await run_blocking(self.parse_ai_response, ai_response, current_yaml)
+
+    def request_ai_response(self, user_message, current_yaml):
+        """Get a complete AI response, waiting on the chat engine's event loop."""
+        if not self.openai_client:
+            return self.unavailable_response()
+        try:
+            return self.chat_engine.run(self.get_ai_response(user_message, current_yaml))
+        except ChatTimeout as e:
+            self.chat_requests.inc(mode="request", outcome="timeout")
+            return self.error_response(f"Error getting AI response: {str(e)}")
 
+    async def arequest_ai_response(self, user_message, current_yaml):
+        """request_ai_response for async routes: awaits the engine without holding a thread."""
+        if not self.openai_client:
+            return self.unavailable_response()
         try:
-            messages = [
-                {"role": "system", "content": system_prompt.format(current_yaml=current_yaml)},
-                {"role": "user", "content": user_message}
-            ]
-            
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=messages,
-                temperature=0.3,
-                max_tokens=2000
+            return await self.chat_engine.arun(self.get_ai_response(user_message, current_yaml))
+        except ChatTimeout as e:
+            self.chat_requests.inc(mode="request", outcome="timeout")
+            return self.error_response(f"Error getting AI response: {str(e)}")
+
+    async def astream_ai_response(self, user_message, current_yaml):
+        """
+        Stream an AI response as ("token", text) events followed by one
+        ("done", result) event. The suggestion is created only once the
+        whole reply has arrived, since YAML changes are not usable partially.
+        """
+        cache_key, cached = await run_blocking(self.cached_reply, user_message, current_yaml)
+        if cached is not None:
+            self.chat_requests.inc(mode="stream", outcome="cached")
+            result = await run_blocking(self.parse_ai_response, cached, current_yaml)
+            yield "done", dict(result, cached=True)
+            return
+        started = time.perf_counter()
+        first_token = None
+        parts = []
+        streamer = JSONFieldStreamer("chat_response")
+        try:
+            stream = await self.openai_client.chat.completions.create(
+                model=CHAT_MODEL,
+                messages=self.build_messages(user_message, current_yaml),
+                temperature=CHAT_TEMPERATURE,
+                max_tokens=CHAT_MAX_TOKENS,
+                stream=True
             )
-            
-            ai_response = response.choices[0].message.content
-            
-            # Try to parse as JSON, fallback to plain text
-            try:
-                if ai_response:
-                    parsed_response = json.loads(ai_response)
-                    yaml_changes = parsed_response.get("yaml_changes")
-                    
-                    # If there are YAML changes, create a suggestion
-                    suggestion = None
-                    if yaml_changes and yaml_changes != current_yaml:
-                        suggestion = self.create_suggestion(
-                            current_yaml, 
-                            yaml_changes, 
-                            parsed_response.get("explanation", "AI suggested changes")
-                        )
-                    
-                    return {
-                        "chat_response": parsed_response.get("chat_response", ai_response),
-                        "yaml_changes": yaml_changes,
-                        "suggestion": suggestion
-                    }
-                else:
-                    return {
-                        "chat_response": "No response from AI",
-                        "yaml_changes": None,
-                        "suggestion": None
-                    }
-            except json.JSONDecodeError:
-                # AI didn't follow JSON format. Try to extract YAML from the response
-                yaml_block = None
-                match = re.search(r"```(?:yaml)?\n(.*?)\n```", ai_response, re.DOTALL)
-                if match:
-                    yaml_block = match.group(1).strip()
-                    explanation = (ai_response[:match.start()] + ai_response[match.end():]).strip()
-                else:
-                    # Maybe the entire response is raw YAML
-                    try:
-                        yaml.safe_load(ai_response)
-                        yaml_block = ai_response
-                        explanation = ""
-                    except yaml.YAMLError:
-                        explanation = ai_response
-
-                if yaml_block:
-                    suggestion = None
-                    if yaml_block != current_yaml:
-                        suggestion = self.create_suggestion(
-                            current_yaml,
-                            yaml_block,
-                            "AI suggested changes"
-                        )
-                    return {
-                        "chat_response": explanation or "AI provided YAML changes.",
-                        "yaml_changes": yaml_block,
-                        "suggestion": suggestion
-                    }
-                else:
-                    return {
-                        "chat_response": ai_response or "No response from AI",
-                        "yaml_changes": None,
-                        "suggestion": None
-                    }
-                
+            async with stream:
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if not delta:
+                        continue
+                    if first_token is None:
+                        first_token = time.perf_counter() - started
+                        self.chat_ttft.observe(first_token)
+                    parts.append(delta)
+                    text = streamer.feed(delta)
+                    if text:
+                        yield "token", {"text": text}
+        except asyncio.CancelledError:
+            self.chat_requests.inc(mode="stream", outcome="cancelled")
+            raise
         except Exception as e:
-            return {
-                "chat_response": f"Error getting AI response: {str(e)}",
-                "yaml_changes": None,
-                "suggestion": None
-            }
+            self.chat_requests.inc(mode="stream", outcome="error")
+            yield "done", self.error_response(f"Error getting AI response: {str(e)}")
+            return
+        self.chat_duration.observe(time.perf_counter() - started, mode="stream")
+        self.chat_requests.inc(mode="stream", outcome="ok")
+        ai_response = "".join(parts)
+        if cache_key and ai_response:
+            await run_blocking(self.llm_cache.put, cache_key, ai_response)
+        result = await run_blocking(self.parse_ai_response, ai_response, current_yaml)
+        result["ttft_ms"] = round(first_token * 1000, 1) if first_token is not None else None
+        yield "done", result
+
+    def stream_ai_response(self, user_message, current_yaml):
+        """
+        Synchronous view of astream_ai_response for Flask response generators.
+        Closing it early (the browser disconnected) cancels the AI request.
+        """
+        if not self.openai_client:
+            yield "done", self.unavailable_response()
+            return
+        try:
+            yield from self.chat_engine.stream(self.astream_ai_response(user_message, current_yaml))
+        except ChatTimeout as e:
+            self.chat_requests.inc(mode="stream", outcome="timeout")
+            yield "done", self.error_response(f"Error getting AI response: {str(e)}")
+
+    async def aiter_ai_response(self, user_message, current_yaml):
+        """stream_ai_response for async routes, iterated without holding a thread."""
+        if not self.openai_client:
+            yield "done", self.unavailable_response()
+            return
+        try:
+            async for event in self.chat_engine.astream(self.astream_ai_response(user_message, current_yaml)):
+                yield event
+        except ChatTimeout as e:
+            self.chat_requests.inc(mode="stream", outcome="timeout")
+            yield "done", self.error_response(f"Error getting AI response: {str(e)}")
+
+def create_chat_engine():
+    """Create the asyncio chat engine configured from the environment."""
+    engine = AsyncChatEngine(timeout=float(os.getenv("CHAT_TIMEOUT", "60")))
+    atexit.register(engine.stop)
+    return engine
+
+def create_llm_cache():
+    """Create the AI response cache if enabled (CHAT_CACHE=true), else None."""
+    if os.getenv("CHAT_CACHE", "false").lower() != "true":
+        return None
+    return LLMResponseCache(
+        ttl=float(os.getenv("CHAT_CACHE_TTL", "3600")),
+        max_entries=int(os.getenv("CHAT_CACHE_MAX_ENTRIES", "256")),
+        cache_dir=os.getenv("CHAT_CACHE_DIR") or None
+    )
+
+def create_chat_database():
+    """Open the SQLite chat database if enabled (CHAT_DB_PATH is set), else None."""
+    path = os.getenv("CHAT_DB_PATH")
+    if not path:
+        return None
+    database = ChatDatabase(path, delay=float(os.getenv("CHAT_DB_WRITE_DELAY", "0.5")))
+    atexit.register(database.close)
+    return database
+
+def create_chat_store(session_id, chat_database=None):
+    """
+    Create a session's bounded chat and suggestion store, persisted in
+    `chat_database` when one is given.
+    """
+    store = ChatStore(
+        max_messages=int(os.getenv("CHAT_MAX_MESSAGES", "500")),
+        max_suggestions=int(os.getenv("CHAT_MAX_SUGGESTIONS", "50")),
+        resolved_ttl=float(os.getenv("CHAT_SUGGESTION_TTL", "3600"))
+    )
+    return chat_database.session(session_id, store) if chat_database else store
+
+def create_render_cache():
+    """Create the render cache configured from the environment."""
+    return RenderCache(
+        cache_dir=os.getenv("RENDER_CACHE_DIR", "render_cache"),
+        max_entries=int(os.getenv("RENDER_CACHE_MAX_ENTRIES", "50")),
+        max_bytes=int(os.getenv("RENDER_CACHE_MAX_MB", "200")) * 1024 * 1024
+    )
+
+def create_schema_validator():
+    """Create the RenderCV schema validator configured from the environment."""
+    return SchemaValidator(enabled=os.getenv("CV_SCHEMA_VALIDATION", "true").lower() == "true")
+
+def create_render_pool(size=None):
+    """
+    Create a render pool of resident RenderCV workers configured from the
+    environment. Its threads and worker processes start with the first
+    workspace (see start_background_services) or the first render.
+    """
+    worker_enabled = os.getenv("RENDER_WORKER", "true").lower() == "true"
+    timeout = int(os.getenv("RENDER_TIMEOUT", "15"))
+    pool = RenderPool(
+        size=size or int(os.getenv("RENDER_POOL_SIZE", "2")),
+        worker_factory=lambda: RenderWorker(timeout=timeout, enabled=worker_enabled),
+        start=False
+    )
+    atexit.register(pool.shutdown)
+    return pool
+
+def create_sweeper_group():
+    """Create the (not yet started) sweeper that serves every session's render directory."""
+    group = SweeperGroup(interval=float(os.getenv("RENDER_GC_INTERVAL", "60")))
+    atexit.register(group.stop)
+    return group
 
 class SimpleYAMLEditor:
-    def __init__(self):
-        self.working_cv_file = "working_CV.yaml"
-        self.temp_dir = "temp_renders"
+    def __init__(self, working_cv_file="working_CV.yaml", temp_dir="temp_renders",
+                 render_cache=None, render_pool=None, session_id=DEFAULT_SESSION, metrics=None,
+                 schema_validator=None, parsed_docs=None, sweepers=None):
+        self.working_cv_file = working_cv_file
+        # Saves are hashed, coalesced and written atomically in the background
+        self.cv_file = WriteBehindFile(working_cv_file, delay=float(os.getenv("CV_SAVE_DELAY", "0.5")))
+        # Latest accepted (revision, text): the base for delta saves and for
+        # endpoints that refer to the document by revision
+        self._document = None
+        self._document_lock = threading.Lock()
+        self.temp_dir = temp_dir
+        self.session_id = session_id
         self.ensure_directories()
         self.current_render = None
-        self.executor = ThreadPoolExecutor(max_workers=1)
         self.pending_renders = {}
+        self.superseded_renders = OrderedDict()  # timestamp -> newer timestamp
+        self.max_superseded = 200
+        self.events = RenderEventBroker()
+        self.render_timings = RenderTimings()
+        self.history = RenderHistory(
+            os.path.join(self.temp_dir, "render_index.json"),
+            max_entries=int(os.getenv("RENDER_HISTORY_MAX", "200"))
+        )
+        # Cache and workers are shared between sessions when provided
+        self.render_cache = render_cache or create_render_cache()
+        self.render_pool = render_pool or create_render_pool(size=1)
+        self.schema_validator = schema_validator or create_schema_validator()
+        self.parsed_docs = parsed_docs or ParsedDocCache()
+        self._active_worker = None
+        self._exports_in_flight = 0
+        self._exports_lock = threading.Lock()
+        # Export timestamp -> time it finished (None while rendering); finished
+        # exports stay downloadable for export_keep seconds
+        self._export_dirs = {}
+        self.export_keep = float(os.getenv("RENDER_GC_EXPORT_KEEP", "3600"))
+        # Series are registered by name, so editors sharing a registry share them
+        self.metrics = metrics or MetricsRegistry()
+        self.stage_seconds = self.metrics.histogram(
+            "cv_render_stage_seconds", "Time spent in each stage of the save/render path",
+            labels=("stage",))
+        self.renders_total = self.metrics.counter(
+            "cv_renders_total", "Renders by profile and outcome", labels=("profile", "outcome"))
+        self.saves_total = self.metrics.counter(
+            "cv_saves_total", "Saves by outcome", labels=("outcome",))
+        self.save_requests_total = self.metrics.counter(
+            "cv_save_requests_total", "Save requests by upload mode", labels=("mode",))
+        self.save_payload_bytes = self.metrics.counter(
+            "cv_save_payload_bytes_total", "Request bytes received by /api/save", labels=("mode",))
+        self.save_resyncs_total = self.metrics.counter(
+            "cv_save_resyncs_total", "Delta saves rejected and retried as full uploads")
+        self.sweeper = RenderSweeper(
+            self.temp_dir,
+            max_age=float(os.getenv("RENDER_GC_MAX_AGE", str(24 * 3600))),
+            max_count=int(os.getenv("RENDER_GC_MAX_COUNT", "20")),
+            max_bytes=int(os.getenv("RENDER_GC_MAX_MB", "500")) * 1024 * 1024,
+            interval=float(os.getenv("RENDER_GC_INTERVAL", "60")),
+            protected=self.protected_render_dirs,
+            prefix=("render_", "export_")
+        )
+        # Sessions share one sweeper thread when a group is provided
+        self.sweepers = sweepers
+        if sweepers:
+            sweepers.add(self.sweeper)
+        else:
+            self.sweeper.start()
+
+    def close(self):
+        """Stop background work owned by this editor."""
+        if self.sweepers:
+            self.sweepers.remove(self.sweeper)
+        else:
+            self.sweeper.stop()
+        self.cv_file.flush()
+
+    def busy(self):
+        """Whether renders or exports are queued or running for this editor."""
+        with self._exports_lock:
+            return bool(self.pending_renders) or self._exports_in_flight > 0
     
     def ensure_directories(self):
         """Ensure required directories exist."""
         os.makedirs(self.temp_dir, exist_ok=True)
+
+    def protected_render_dirs(self):
+        """
+        Directories the sweeper must keep: the current and pending renders,
+        exports still rendering and exports finished within export_keep seconds.
+        """
+        protected = [os.path.join(self.temp_dir, f"render_{timestamp}")
+                     for timestamp in list(self.pending_renders)]
+        current = self.current_render
+        if current and current.get("temp_dir"):
+            protected.append(current["temp_dir"])
+        cutoff = time.time() - self.export_keep
+        with self._exports_lock:
+            for timestamp, finished in list(self._export_dirs.items()):
+                if finished is not None and finished < cutoff:
+                    del self._export_dirs[timestamp]
+                else:
+                    protected.append(os.path.join(self.temp_dir, f"export_{timestamp}"))
+        return protected
     
     def load_yaml(self):
         """Load YAML content from file."""
         try:
-            if os.path.exists(self.working_cv_file):
-                with open(self.working_cv_file, 'r', encoding='utf-8') as file:
-                    return file.read()
+            content = self.cv_file.read()
+            if content is not None:
+                return content
             else:
                 return """# Create your CV YAML here
 cv:
@@ -418,81 +775,247 @@ design:
         except Exception as e:
             return f"# Error loading file: {str(e)}"
     
+    def current_document(self):
+        """Return the latest accepted (revision, text), loading it on first use."""
+        with self._document_lock:
+            if self._document is None:
+                text = self.load_yaml()
+                self._document = (content_revision(text), text)
+            return self._document
+
+    def apply_delta(self, base_revision, patch, checksum):
+        """
+        Rebuild a document from a line patch against the current revision.
+        Returns (text, None), or (None, reason) when the client must resend in full.
+        """
+        revision, base = self.current_document()
+        if base_revision != revision:
+            reason = "Base revision is out of date"
+        else:
+            try:
+                text = apply_line_patch(base, patch)
+            except ValueError as e:
+                reason = f"Invalid patch: {e}"
+            else:
+                if content_revision(text) == checksum:
+                    return text, None
+                reason = "Checksum mismatch after applying the patch"
+        self.save_resyncs_total.inc()
+        return None, reason
+
     def save_yaml(self, yaml_content):
         """Save YAML and start rendering in the background."""
         try:
             # Validate YAML syntax
-            yaml.safe_load(yaml_content)
-
-            # Save to file
-            with open(self.working_cv_file, 'w', encoding='utf-8') as file:
-                file.write(yaml_content)
+            with self.stage_seconds.time(stage="validate"):
+                data = self.parsed_docs.get(yaml_content)
+
+            # Validate against the RenderCV data model (cached per content hash)
+            with self.stage_seconds.time(stage="schema"):
+                validation_errors = self.schema_validator.validate(yaml_content, data)
+
+            # Queue the save; unchanged content is skipped and the disk write is deferred
+            with self.stage_seconds.time(stage="save_write"):
+                self.cv_file.write(yaml_content)
+            revision = content_revision(yaml_content)
+            with self._document_lock:
+                self._document = (revision, yaml_content)
+
+            if validation_errors:
+                # The edit is kept, but a render would only fail: report the fields instead
+                self.saves_total.inc(outcome="invalid_schema")
+                count = len(validation_errors)
+                return {
+                    "error": f"The CV has {count} validation error{'s' if count != 1 else ''}",
+                    "validation_errors": validation_errors,
+                    "saved": True,
+                    "revision": revision
+                }
 
             # Start background render
             render_info = self.start_render(yaml_content)
 
+            self.saves_total.inc(outcome="ok")
             return {
                 "success": True,
+                "revision": revision,
                 "render": render_info
             }
         except yaml.YAMLError as e:
+            self.saves_total.inc(outcome="invalid_yaml")
             return {"error": f"Invalid YAML: {str(e)}"}
         except Exception as e:
+            self.saves_total.inc(outcome="error")
             return {"error": f"Error: {str(e)}"}
 
     def start_render(self, yaml_content):
         """Begin rendering asynchronously and return info."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        future = self.executor.submit(self.render_pdf, yaml_content, timestamp)
+        cache_key = self.render_cache.key_for(yaml_content)
+
+        # Only the newest document matters: drop older queued/in-flight renders
+        self.supersede_pending(timestamp)
+
+        # Identical content was rendered before: serve the cached PDF right away
+        cached_pdf = self.render_cache.get(cache_key)
+        if cached_pdf:
+            self.set_current_render({
+                "pdf_path": cached_pdf,
+                "timestamp": timestamp,
+                "temp_dir": None,
+                "cached": True
+            })
+            self.history.add(timestamp, cached_pdf, duration=0.0, cached=True)
+            self.renders_total.inc(profile="preview", outcome="cached")
+            self.events.publish("render-finished", {
+                "timestamp": timestamp,
+                "pdf_url": f"/pdf/{timestamp}",
+                "cached": True
+            })
+            return {
+                "started": True,
+                "ready": True,
+                "cached": True,
+                "pdf_url": f"/pdf/{timestamp}",
+                "timestamp": timestamp
+            }
+
+        future = self.render_pool.submit(self.session_id, self.render_pdf, yaml_content, timestamp, cache_key,
+                                         queued_at=time.perf_counter())
         self.pending_renders[timestamp] = future
         return {"started": True, "pdf_url": f"/pdf/{timestamp}", "timestamp": timestamp}
+
+    def supersede_pending(self, timestamp):
+        """Cancel queued renders and discard the in-flight one in favour of `timestamp`."""
+        cancel_running = False
+        for old_timestamp, future in list(self.pending_renders.items()):
+            self.superseded_renders[old_timestamp] = timestamp
+            if future.cancel():
+                self.pending_renders.pop(old_timestamp, None)
+            else:
+                cancel_running = True
+        while len(self.superseded_renders) > self.max_superseded:
+            self.superseded_renders.popitem(last=False)
+        worker = self._active_worker
+        if cancel_running and worker and worker.cancel():
+            print("Cancelled in-flight render in favour of newer content")
+
+    def get_pdf_path(self, timestamp):
+        """Return the PDF of the current render or any retained past render."""
+        current = self.current_render
+        if current and current['timestamp'] == timestamp and os.path.exists(current['pdf_path']):
+            return current['pdf_path']
+        record = self.history.get(timestamp)
+        return record["pdf_path"] if record else None
+
+    def list_renders(self, limit=None):
+        """Describe retained renders, newest first."""
+        current = self.current_render
+        return [
+            {
+                "id": record["id"],
+                "pdf_url": f"/pdf/{record['id']}",
+                "created_at": record["created_at"],
+                "duration_ms": record["duration_ms"],
+                "size_bytes": record["size_bytes"],
+                "profile": record["profile"],
+                "cached": record["cached"],
+                "current": bool(current and current["timestamp"] == record["id"])
+            }
+            for record in self.history.list(limit)
+        ]
+
+    def get_render_status(self, timestamp):
+        """Describe a render that is not (or no longer) the current one."""
+        if timestamp in self.superseded_renders:
+            return {"status": "superseded", "superseded_by": self.superseded_renders[timestamp]}
+        if timestamp in self.pending_renders:
+            return {"status": "pending"}
+        return None
+
+    def set_current_render(self, render):
+        """Point the preview at a render unless a newer one is already current."""
+        if self.current_render and self.current_render["timestamp"] > render["timestamp"]:
+            return
+        self.current_render = render
     
-    def render_pdf(self, yaml_content, timestamp):
+    def render_pdf(self, yaml_content, timestamp, cache_key=None, profile="preview", queued_at=None):
+        """Render CV to PDF and push the outcome to connected browsers."""
+        if queued_at is not None:
+            self.stage_seconds.observe(time.perf_counter() - queued_at, stage="queue_wait")
+        result = self._render_pdf(yaml_content, timestamp, cache_key, profile)
+        if result.get("success"):
+            self.renders_total.inc(profile=profile, outcome="success")
+            self.events.publish("render-finished", result)
+        elif result.get("superseded"):
+            self.renders_total.inc(profile=profile, outcome="superseded")
+            self.events.publish("render-superseded", {
+                "timestamp": timestamp,
+                "superseded_by": self.superseded_renders.get(timestamp)
+            })
+        else:
+            self.renders_total.inc(profile=profile, outcome="failed")
+            self.events.publish("render-failed", {"timestamp": timestamp, "error": result.get("error")})
+        return result
+
+    def _render_pdf(self, yaml_content, timestamp, cache_key=None, profile="preview"):
         """Render CV to PDF using RenderCV."""
+        if timestamp in self.superseded_renders:
+            self.pending_renders.pop(timestamp, None)
+            return {"superseded": True, "timestamp": timestamp}
+
+        self.events.publish("render-started", {"timestamp": timestamp})
         try:
-            # Create unique temp directory
-            temp_render_dir = os.path.join(self.temp_dir, f"render_{timestamp}")
-            os.makedirs(temp_render_dir, exist_ok=True)
-            
-            # Create temp YAML file
-            temp_yaml = os.path.join(temp_render_dir, "temp_cv.yaml")
-            with open(temp_yaml, 'w', encoding='utf-8') as file:
-                file.write(yaml_content)
+            with self.stage_seconds.time(stage="temp_write"):
+                # Create unique temp directory
+                temp_render_dir = os.path.join(self.temp_dir, f"render_{timestamp}")
+                os.makedirs(temp_render_dir, exist_ok=True)
+
+                # Create temp YAML file
+                temp_yaml = os.path.join(temp_render_dir, "temp_cv.yaml")
+                with open(temp_yaml, 'w', encoding='utf-8') as file:
+                    file.write(yaml_content)
             
             # Use RenderCV to render PDF (without --pdf-path as it may not be supported)
-            # Use just the filename since we're setting cwd to the temp directory
+            # Use just the filename since the render runs inside the temp directory
             yaml_filename = "temp_cv.yaml"
-            cmd = ["python", "-m", "rendercv", "render", yaml_filename]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=15, cwd=temp_render_dir)
+            render_started = time.perf_counter()
+            worker = self.render_pool.current_worker()
+            self._active_worker = worker
+            try:
+                with self.stage_seconds.time(stage="subprocess"):
+                    result = worker.run(render_args(yaml_filename, profile), cwd=temp_render_dir)
+            finally:
+                self._active_worker = None
             
             # Debug: Print render result
-            print(f"RenderCV return code: {result.returncode}")
-            print(f"RenderCV stdout: {result.stdout}")
-            print(f"RenderCV stderr: {result.stderr}")
+            print(f"RenderCV return code: {result['returncode']} (via {result['worker']}, {profile} profile)")
+            print(f"RenderCV stdout: {result['stdout']}")
+            print(f"RenderCV stderr: {result['stderr']}")
             
-            # RenderCV creates PDF in a rendercv_output subdirectory
-            # Look for PDF files in the rendercv_output directory
-            rendercv_output_dir = os.path.join(temp_render_dir, "rendercv_output")
-            if os.path.exists(rendercv_output_dir):
+            with self.stage_seconds.time(stage="output_discovery"):
+                rendercv_output_dir = self.find_output_dir(temp_render_dir)
                 pdf_files = [f for f in os.listdir(rendercv_output_dir) if f.endswith('.pdf')]
-                print(f"Found {len(pdf_files)} PDF files in rendercv_output: {pdf_files}")
-            else:
-                # Fallback: look in the main temp directory
-                pdf_files = [f for f in os.listdir(temp_render_dir) if f.endswith('.pdf')]
-                rendercv_output_dir = temp_render_dir
-                print(f"Found {len(pdf_files)} PDF files in temp dir: {pdf_files}")
+            print(f"Found {len(pdf_files)} PDF files in {rendercv_output_dir}: {pdf_files}")
+            render_duration = time.perf_counter() - render_started
+            self.stage_seconds.observe(render_duration, stage="render")
+            self.render_timings.record(profile, render_duration,
+                                       success=result['returncode'] == 0 and bool(pdf_files))
             
-            if result.returncode == 0 and pdf_files:
+            if result['returncode'] == 0 and pdf_files:
                 # Use the first PDF found (there should be only one)
                 pdf_file = pdf_files[0]
                 pdf_path = os.path.join(rendercv_output_dir, pdf_file)
 
-                self.current_render = {
+                self.set_current_render({
                     "pdf_path": pdf_path,
                     "timestamp": timestamp,
                     "temp_dir": temp_render_dir
-                }
+                })
+
+                # Remember the PDF so identical content never renders twice
+                self.render_cache.put(cache_key or self.render_cache.key_for(yaml_content), pdf_path)
+                self.history.add(timestamp, pdf_path, temp_render_dir, render_duration, profile)
 
                 # Mark render as finished
                 self.pending_renders.pop(timestamp, None)
@@ -503,7 +1026,7 @@ design:
                     "timestamp": timestamp
                 }
             else:
-                error_msg = result.stderr or result.stdout or 'Unknown error'
+                error_msg = result['stderr'] or result['stdout'] or 'Unknown error'
                 print(f"RenderCV failed with error: {error_msg}")
                 print(f"Temp directory contents: {os.listdir(temp_render_dir)}")
                 if os.path.exists(rendercv_output_dir):
@@ -513,6 +1036,9 @@ design:
                     "error": f"RenderCV failed: {error_msg}"
                 }
                 
+        except RenderCancelled:
+            self.pending_renders.pop(timestamp, None)
+            return {"superseded": True, "timestamp": timestamp}
         except subprocess.TimeoutExpired:
             self.pending_renders.pop(timestamp, None)
             return {"error": "Rendering timed out"}
@@ -520,8 +1046,189 @@ design:
             self.pending_renders.pop(timestamp, None)
             return {"error": f"Render error: {str(e)}"}
 
-editor = SimpleYAMLEditor()
-chat_manager = ChatManager()
+    def find_output_dir(self, render_dir):
+        """Locate RenderCV's output directory inside a render directory."""
+        # RenderCV creates its outputs in a rendercv_output subdirectory
+        rendercv_output_dir = os.path.join(render_dir, "rendercv_output")
+        if os.path.exists(rendercv_output_dir):
+            return rendercv_output_dir
+        # Fallback: look in the main render directory
+        return render_dir
+
+    def export_render(self, yaml_content):
+        """Render every output format (PDF, Typst, Markdown, HTML, PNG) on demand."""
+        # Exports queue in their own lane so they never hold the session's preview slot
+        future = self.render_pool.submit(f"{self.session_id}/export", self._export_render, yaml_content)
+        with self._exports_lock:
+            self._exports_in_flight += 1
+        try:
+            return future.result(timeout=EXPORT_TIMEOUT + EXPORT_QUEUE_TIMEOUT)
+        except FutureTimeout:
+            future.cancel()
+            return {"error": "Export timed out waiting for a render worker"}
+        finally:
+            with self._exports_lock:
+                self._exports_in_flight -= 1
+
+    def _export_render(self, yaml_content):
+        """Run a full export on a render pool worker."""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        export_dir = os.path.join(self.temp_dir, f"export_{timestamp}")
+        with self._exports_lock:
+            self._export_dirs[timestamp] = None
+        exported = False
+        try:
+            os.makedirs(export_dir, exist_ok=True)
+            with open(os.path.join(export_dir, "temp_cv.yaml"), 'w', encoding='utf-8') as file:
+                file.write(yaml_content)
+
+            render_started = time.perf_counter()
+            worker = self.render_pool.current_worker()
+            result = worker.run(render_args("temp_cv.yaml", "export"), cwd=export_dir, timeout=EXPORT_TIMEOUT)
+            output_dir = self.find_output_dir(export_dir)
+            files = sorted(f for f in os.listdir(output_dir) if f != "temp_cv.yaml")
+            success = result['returncode'] == 0 and any(f.endswith('.pdf') for f in files)
+            self.render_timings.record("export", time.perf_counter() - render_started, success=success)
+            self.renders_total.inc(profile="export", outcome="success" if success else "failed")
+
+            if not success:
+                error_msg = result['stderr'] or result['stdout'] or 'Unknown error'
+                return {"error": f"RenderCV failed: {error_msg}"}
+
+            pdf_path = os.path.join(output_dir, next(f for f in files if f.endswith('.pdf')))
+            self.render_cache.put(self.render_cache.key_for(yaml_content), pdf_path)
+            exported = True
+            return {
+                "success": True,
+                "timestamp": timestamp,
+                "files": [
+                    {"name": f, "url": f"/export/{timestamp}/{f}"}
+                    for f in files
+                ]
+            }
+        except RenderCancelled:
+            self.renders_total.inc(profile="export", outcome="cancelled")
+            return {"error": "Export was cancelled", "cancelled": True}
+        except subprocess.TimeoutExpired:
+            return {"error": "Export timed out"}
+        except Exception as e:
+            return {"error": f"Export error: {str(e)}"}
+        finally:
+            with self._exports_lock:
+                if exported:
+                    self._export_dirs[timestamp] = time.time()
+                else:
+                    # Nothing to download: let the sweeper take the directory
+                    self._export_dirs.pop(timestamp, None)
+
+    def get_export_dir(self, timestamp):
+        """Return the output directory of an export, or None if it does not exist."""
+        if not re.fullmatch(r"[0-9_]+", timestamp):
+            return None
+        export_dir = os.path.join(self.temp_dir, f"export_{timestamp}")
+        if not os.path.isdir(export_dir):
+            return None
+        return self.find_output_dir(export_dir)
+
+# Sessions are opt-in: by default every browser shares working_CV.yaml
+SESSIONS_ENABLED = os.getenv("CV_CHAT_SESSIONS", "false").lower() == "true"
+SESSIONS_DIR = os.getenv("CV_CHAT_SESSIONS_DIR", "sessions")
+SESSION_COOKIE = "cv_chat_session"
+
+render_cache = create_render_cache()
+render_pool = create_render_pool()
+render_sweepers = create_sweeper_group()
+schema_validator = create_schema_validator()
+parsed_docs = ParsedDocCache(max_entries=int(os.getenv("PARSED_DOC_CACHE_SIZE", "64")))
+chat_engine = create_chat_engine()
+llm_cache = create_llm_cache()
+chat_database = create_chat_database()
+intent_router = IntentRouter(threshold=float(os.getenv("CHAT_INTENT_THRESHOLD", "0.8")))
+pdf_bytes_cache = PDFBytesCache(max_bytes=int(os.getenv("PDF_MEMORY_CACHE_MB", "32")) * 1024 * 1024)
+metrics = MetricsRegistry()
+
+def register_process_metrics(registry):
+    """Expose the shared cache, pool and session state as scrape-time metrics."""
+    registry.gauge("cv_render_queue_depth", "Render jobs waiting for a worker",
+                   lambda: render_pool.get_stats()["queue_depth"])
+    registry.gauge("cv_render_running", "Render jobs currently running",
+                   lambda: render_pool.get_stats()["running"])
+    registry.gauge("cv_render_cache_hits_total", "Render cache hits",
+                   lambda: render_cache.get_stats()["hits"], kind="counter")
+    registry.gauge("cv_render_cache_misses_total", "Render cache misses",
+                   lambda: render_cache.get_stats()["misses"], kind="counter")
+    registry.gauge("cv_render_cache_bytes", "Bytes held by the render cache",
+                   lambda: render_cache.get_stats()["bytes"])
+    registry.gauge("cv_pdf_memory_cache_hits_total", "In-memory PDF cache hits",
+                   lambda: pdf_bytes_cache.get_stats()["hits"], kind="counter")
+    registry.gauge("cv_pdf_memory_cache_misses_total", "In-memory PDF cache misses",
+                   lambda: pdf_bytes_cache.get_stats()["misses"], kind="counter")
+    registry.gauge("cv_render_worker_restarts_total", "Resident render worker restarts",
+                   lambda: sum(w["restarts"] for w in render_pool.get_stats()["workers"]), kind="counter")
+    registry.gauge("cv_sessions", "Live editor sessions",
+                   lambda: workspaces.get_stats()["sessions"])
+    registry.gauge("cv_chat_store_bytes", "Approximate bytes held by chat histories and suggestions",
+                   lambda: chat_store_total("memory_bytes"))
+    registry.gauge("cv_chat_messages", "Chat messages held in memory",
+                   lambda: chat_store_total("messages"))
+    registry.gauge("cv_chat_suggestions", "Suggestions held in memory",
+                   lambda: chat_store_total("suggestions"))
+
+def chat_store_total(field):
+    """Sum a chat store statistic over the live sessions."""
+    return sum(workspace.chat_manager.store.get_stats()[field] for workspace in workspaces.snapshot())
+
+register_process_metrics(metrics)
+
+_background_lock = threading.Lock()
+_background_started = False
+
+def start_background_services():
+    """
+    Start the render workers, the render sweeper and the schema warm-up.
+    Importing this module starts no threads or processes; they start with the
+    first workspace, or when the server is launched from __main__.
+    """
+    global _background_started
+    with _background_lock:
+        if _background_started:
+            return
+        _background_started = True
+    render_pool.start()
+    render_sweepers.start()
+    schema_validator.warm_up()
+
+def create_workspace(session_id):
+    """Build the editor and chat state for a session."""
+    start_background_services()
+    if session_id == DEFAULT_SESSION:
+        editor = SimpleYAMLEditor(render_cache=render_cache, render_pool=render_pool, metrics=metrics,
+                                  schema_validator=schema_validator, parsed_docs=parsed_docs,
+                                  sweepers=render_sweepers)
+    else:
+        session_dir = os.path.join(SESSIONS_DIR, session_id)
+        os.makedirs(session_dir, exist_ok=True)
+        working_cv_file = os.path.join(session_dir, "working_CV.yaml")
+        # New sessions start from a copy of the shared working CV
+        if not os.path.exists(working_cv_file) and os.path.exists("working_CV.yaml"):
+            shutil.copyfile("working_CV.yaml", working_cv_file)
+        editor = SimpleYAMLEditor(
+            working_cv_file=working_cv_file,
+            temp_dir=os.path.join(session_dir, "temp_renders"),
+            render_cache=render_cache,
+            render_pool=render_pool,
+            session_id=session_id,
+            metrics=metrics,
+            schema_validator=schema_validator,
+            parsed_docs=parsed_docs,
+            sweepers=render_sweepers
+        )
+    return Workspace(session_id, editor, ChatManager(parsed_docs=parsed_docs, metrics=metrics,
+                                                       chat_engine=chat_engine, llm_cache=llm_cache,
+                                                       intent_router=intent_router,
+                                                       store=create_chat_store(session_id, chat_database)))
+
+workspaces = WorkspaceManager(create_workspace, max_sessions=int(os.getenv("CV_CHAT_MAX_SESSIONS", "50")))
 
 # HTML Template for the 3-panel editor
 EDITOR_HTML = """
@@ -578,6 +1285,36 @@ EDITOR_HTML = """
         .status.success {
             background: #28a745;
         }
+
+        .header-actions {
+            display: flex;
+            align-items: center;
+            gap: 10px;
+        }
+
+        .export-button {
+            padding: 4px 10px;
+            background: #404040;
+            color: #ffffff;
+            border: 1px solid #555;
+            border-radius: 4px;
+            cursor: pointer;
+            font-size: 14px;
+        }
+
+        .export-button:hover {
+            background: #505050;
+        }
+
+        .export-button:disabled {
+            color: #888;
+            cursor: not-allowed;
+        }
+
+        .message a {
+            color: #4fc3f7;
+            display: block;
+        }
         
         .main {
             display: flex;
@@ -642,6 +1379,21 @@ EDITOR_HTML = """
             font-size: 12px;
         }
         
+        .load-older {
+            align-self: center;
+            background: none;
+            border: 1px solid #404040;
+            border-radius: 12px;
+            color: #888;
+            cursor: pointer;
+            font-size: 12px;
+            padding: 4px 12px;
+        }
+        
+        .load-older:hover {
+            color: #ffffff;
+        }
+        
         .chat-input-area {
             border-top: 1px solid #404040;
             padding: 15px;
@@ -738,6 +1490,7 @@ EDITOR_HTML = """
         
         .preview-message {
             text-align: center;
+            white-space: pre-line;
             color: #666;
             font-size: 16px;
         }
@@ -844,7 +1597,10 @@ EDITOR_HTML = """
 <body>
     <div class="header">
         <h1>🤖 CV Chat</h1>
-        <div class="status" id="status">Ready</div>
+        <div class="header-actions">
+            <button class="export-button" id="export-button" title="Render PDF, HTML, Markdown and PNG">⬇ Export</button>
+            <div class="status" id="status">Ready</div>
+        </div>
     </div>
     
     <div class="main">
@@ -856,6 +1612,7 @@ EDITOR_HTML = """
                 <div class="message system">
                     Welcome! I'm your AI assistant. I can help you improve your CV, answer questions about resume writing, and directly modify your YAML content. Just ask me anything!
                 </div>
+                <button class="load-older" id="load-older" style="display: none;">Load older messages</button>
             </div>
             <div class="chat-input-area">
                 <div class="chat-input-container">
@@ -903,14 +1660,23 @@ EDITOR_HTML = """
         const previewMessage = document.getElementById('preview-message');
         const pdfPreview = document.getElementById('pdf-preview');
         const chatMessages = document.getElementById('chat-messages');
+        const loadOlderBtn = document.getElementById('load-older');
         const chatInput = document.getElementById('chat-input');
         const sendButton = document.getElementById('send-button');
         const suggestionControls = document.getElementById('suggestion-controls');
         const acceptSuggestionBtn = document.getElementById('accept-suggestion');
         const declineSuggestionBtn = document.getElementById('decline-suggestion');
+        const exportButton = document.getElementById('export-button');
 
         let saveTimeout;
+        // Last text the server acknowledged, and its revision (delta saves diff against it)
+        let syncedText = null;
+        let syncedRevision = null;
         let isRendering = false;
+        let renderEvents = null;
+        let awaitedRender = null;
+        let renderFallbackTimer = null;
+        const renderOutcomes = {};
         let isChatting = false;
         let currentSuggestion = null;
         let originalYaml = '';
@@ -939,14 +1705,69 @@ EDITOR_HTML = """
             pdfPreview.style.display = 'none';
         }
         
+        function displayPDF(url, message = 'Rendered successfully') {
+            // Render URLs are unique and revalidated by ETag, so no cache-busting
+            pdfPreview.src = url;
+            pdfPreview.style.display = 'block';
+            previewMessage.style.display = 'none';
+            setStatus(message, 'success');
+        }
+
+        function connectRenderEvents() {
+            if (!window.EventSource) return;
+            renderEvents = new EventSource('/api/render/events');
+            ['render-finished', 'render-failed', 'render-superseded'].forEach(type => {
+                renderEvents.addEventListener(type, e => {
+                    const data = JSON.parse(e.data);
+                    renderOutcomes[data.timestamp] = { type: type, data: data };
+                    handleRenderOutcome(data.timestamp);
+                });
+            });
+            renderEvents.addEventListener('render-started', () => {
+                if (awaitedRender) setStatus('Rendering...', 'info');
+            });
+        }
+
+        function handleRenderOutcome(timestamp) {
+            const outcome = renderOutcomes[timestamp];
+            if (!outcome || !awaitedRender || awaitedRender.timestamp !== timestamp) return;
+            awaitedRender = null;
+            clearTimeout(renderFallbackTimer);
+            Object.keys(renderOutcomes).forEach(key => delete renderOutcomes[key]);
+
+            if (outcome.type === 'render-finished') {
+                displayPDF(outcome.data.pdf_url);
+            } else if (outcome.type === 'render-failed') {
+                setStatus('Render error', 'error');
+                showPreviewMessage('❌ ' + outcome.data.error);
+            }
+        }
+
+        function waitForPDF(render) {
+            // Prefer pushed events; HEAD polling is only a fallback
+            if (!renderEvents || renderEvents.readyState !== EventSource.OPEN) {
+                showPDF(render.pdf_url);
+                return;
+            }
+            awaitedRender = render;
+            clearTimeout(renderFallbackTimer);
+            renderFallbackTimer = setTimeout(() => {
+                if (awaitedRender && awaitedRender.timestamp === render.timestamp) {
+                    awaitedRender = null;
+                    showPDF(render.pdf_url);
+                }
+            }, 15000);
+            handleRenderOutcome(render.timestamp);
+        }
+        
         function showPDF(url, attempts = 0) {
             fetch(url, { method: 'HEAD' })
                 .then(resp => {
                     if (resp.ok) {
-                        pdfPreview.src = url + '?t=' + Date.now();
-                        pdfPreview.style.display = 'block';
-                        previewMessage.style.display = 'none';
-                        setStatus('Rendered successfully', 'success');
+                        displayPDF(url);
+                    } else if (resp.status === 410) {
+                        // Superseded by a newer save, which is polled separately
+                        return;
                     } else if (attempts < 10) {
                         setTimeout(() => showPDF(url, attempts + 1), 1000);
                     } else {
@@ -980,44 +1801,36 @@ EDITOR_HTML = """
         function showSuggestionInEditor(suggestion) {
             currentSuggestion = suggestion;
             originalYaml = editor.getValue();
-            applySuggestionDiff(suggestion.diff);
+            applySuggestionDiff(suggestion.changes);
             suggestionControls.style.display = 'flex';
         }
 
-        function applySuggestionDiff(diff) {
-            const originalLines = originalYaml.split('\n');
-            let lineIndex = 0;
-
+        function applySuggestionDiff(changes) {
+            // Hunks address lines of the original and arrive sorted: apply them
+            // bottom-up so the line numbers of the ones above stay valid
             editor.operation(() => {
-                diff.forEach(line => {
-                    if (line.startsWith('@@')) {
-                        const m = /@@ -(\d+),\d+ \+(\d+),\d+ @@/.exec(line);
-                        if (m) {
-                            lineIndex = parseInt(m[1]) - 1;
-                        }
-                    } else if (line.startsWith('-')) {
-                        const text = originalLines[lineIndex] || '';
+                changes.slice().reverse().forEach(change => {
+                    for (let line = change.start; line < change.start + change.delete; line++) {
                         diffMarkers.push(
                             editor.markText(
-                                { line: lineIndex, ch: 0 },
-                                { line: lineIndex, ch: text.length },
+                                { line: line, ch: 0 },
+                                { line: line, ch: (editor.getLine(line) || '').length },
                                 { className: 'diff-removed' }
                             )
                         );
-                        lineIndex++;
-                    } else if (line.startsWith('+')) {
-                        const text = line.slice(1);
-                        editor.replaceRange(text + '\n', { line: lineIndex, ch: 0 });
-                        diffMarkers.push(
-                            editor.markText(
-                                { line: lineIndex, ch: 0 },
-                                { line: lineIndex, ch: text.length },
-                                { className: 'diff-added' }
-                            )
-                        );
-                        lineIndex++;
-                    } else if (!line.startsWith('---') && !line.startsWith('+++')) {
-                        lineIndex++;
+                    }
+                    const at = change.start + change.delete;
+                    if (change.insert.length) {
+                        editor.replaceRange(change.insert.join('\\n') + '\\n', { line: at, ch: 0 });
+                        change.insert.forEach((text, offset) => {
+                            diffMarkers.push(
+                                editor.markText(
+                                    { line: at + offset, ch: 0 },
+                                    { line: at + offset, ch: text.length },
+                                    { className: 'diff-added' }
+                                )
+                            );
+                        });
                     }
                 });
             });
@@ -1101,6 +1914,54 @@ EDITOR_HTML = """
             }
         }
         
+        function postSave(payload) {
+            return fetch('/api/save', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify(payload)
+            }).then(response => response.json());
+        }
+
+        function sha256Hex(text) {
+            return crypto.subtle.digest('SHA-256', new TextEncoder().encode(text)).then(buffer =>
+                Array.from(new Uint8Array(buffer)).map(b => b.toString(16).padStart(2, '0')).join(''));
+        }
+
+        function lineDelta(oldText, newText) {
+            // One hunk covering everything between the common prefix and suffix
+            const oldLines = oldText.split('\\n');
+            const newLines = newText.split('\\n');
+            let prefix = 0;
+            while (prefix < oldLines.length && prefix < newLines.length &&
+                   oldLines[prefix] === newLines[prefix]) {
+                prefix++;
+            }
+            let suffix = 0;
+            while (suffix < oldLines.length - prefix && suffix < newLines.length - prefix &&
+                   oldLines[oldLines.length - 1 - suffix] === newLines[newLines.length - 1 - suffix]) {
+                suffix++;
+            }
+            return [{
+                start: prefix,
+                delete: oldLines.length - prefix - suffix,
+                insert: newLines.slice(prefix, newLines.length - suffix)
+            }];
+        }
+
+        function buildSavePayload(text) {
+            // Full upload until the server has acknowledged a revision, or without WebCrypto
+            if (syncedRevision === null || !(window.crypto && crypto.subtle)) {
+                return Promise.resolve({ yaml: text });
+            }
+            return sha256Hex(text).then(checksum => {
+                const payload = { base_revision: syncedRevision, patch: lineDelta(syncedText, text), checksum: checksum };
+                // Large rewrites: the delta would be no smaller than the document
+                return JSON.stringify(payload).length < text.length ? payload : { yaml: text };
+            });
+        }
+
         function saveAndRender() {
             if (isRendering) return;
 
@@ -1113,24 +1974,36 @@ EDITOR_HTML = """
             
             const yamlContent = editor.getValue();
             
-            fetch('/api/save', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({ yaml: yamlContent })
+            buildSavePayload(yamlContent)
+            .then(payload => postSave(payload))
+            .then(data => {
+                // A delta the server could not apply: send the whole document
+                return data.resync ? postSave({ yaml: yamlContent }) : data;
             })
-            .then(response => response.json())
             .then(data => {
                 isRendering = false;
+                if (data.revision && (data.success || data.saved)) {
+                    syncedText = yamlContent;
+                    syncedRevision = data.revision;
+                }
 
                 if (data.success) {
-                    if (data.render && data.render.started) {
-                        showPDF(data.render.pdf_url);
+                    if (data.render && data.render.ready) {
+                        // Served from the render cache, no need to wait
+                        awaitedRender = null;
+                        displayPDF(data.render.pdf_url, 'Rendered successfully (cached)');
+                    } else if (data.render && data.render.started) {
+                        waitForPDF(data.render);
                     } else if (data.render && data.render.error) {
                         setStatus('Render error', 'error');
                         showPreviewMessage('❌ ' + data.render.error);
                     }
+                } else if (data.validation_errors) {
+                    setStatus(data.error, 'error');
+                    const details = data.validation_errors.map(err =>
+                        (err.line ? 'Line ' + err.line + ': ' : '') +
+                        (err.field ? err.field + ' — ' : '') + err.message);
+                    showPreviewMessage('❌ ' + data.error + '\\n\\n' + details.join('\\n'));
                 } else {
                     setStatus('Error: ' + data.error, 'error');
                     showPreviewMessage('❌ ' + data.error);
@@ -1143,6 +2016,93 @@ EDITOR_HTML = """
             });
         }
         
+        function exportCV() {
+            exportButton.disabled = true;
+            setStatus('Exporting...', 'info');
+
+            fetch('/api/export', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({ yaml: editor.getValue() })
+            })
+            .then(response => response.json())
+            .then(data => {
+                exportButton.disabled = false;
+                if (data.success) {
+                    setStatus('Export ready', 'success');
+                    const messageDiv = document.createElement('div');
+                    messageDiv.className = 'message system';
+                    messageDiv.textContent = '📦 Export ready:';
+                    data.files.forEach(file => {
+                        const link = document.createElement('a');
+                        link.href = file.url;
+                        link.textContent = file.name;
+                        messageDiv.appendChild(link);
+                    });
+                    chatMessages.appendChild(messageDiv);
+                    chatMessages.scrollTop = chatMessages.scrollHeight;
+                } else {
+                    setStatus('Export error', 'error');
+                    addMessage('system', '❌ Export failed: ' + data.error);
+                }
+            })
+            .catch(error => {
+                exportButton.disabled = false;
+                setStatus('Network error', 'error');
+                addMessage('system', '❌ Network error: ' + error.message);
+            });
+        }
+
+        exportButton.addEventListener('click', exportCV);
+        
+        function streamChat(body, onToken) {
+            return fetch('/api/chat/stream', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify(body)
+            }).then(response => {
+                const contentType = response.headers.get('Content-Type') || '';
+                if (!contentType.startsWith('text/event-stream') || !response.body) {
+                    // Errors (e.g. a stale revision) come back as plain JSON
+                    return response.json();
+                }
+                const reader = response.body.getReader();
+                const decoder = new TextDecoder();
+                let buffer = '';
+                let result = null;
+                const pump = () => reader.read().then(({ done, value }) => {
+                    if (done) {
+                        return result || { success: false, error: 'The reply stream ended unexpectedly' };
+                    }
+                    buffer += decoder.decode(value, { stream: true });
+                    let boundary;
+                    while ((boundary = buffer.indexOf('\\n\\n')) !== -1) {
+                        const frame = buffer.slice(0, boundary);
+                        buffer = buffer.slice(boundary + 2);
+                        let event = 'message';
+                        let data = '';
+                        frame.split('\\n').forEach(line => {
+                            if (line.startsWith('event: ')) event = line.slice(7);
+                            else if (line.startsWith('data: ')) data += line.slice(6);
+                        });
+                        if (!data) continue;
+                        const payload = JSON.parse(data);
+                        if (event === 'token') {
+                            onToken(payload.text);
+                        } else if (event === 'done') {
+                            result = payload;
+                        }
+                    }
+                    return pump();
+                });
+                return pump();
+            });
+        }
+
         function sendChatMessage() {
             const message = chatInput.value.trim();
             if (!message || isChatting) return;
@@ -1158,20 +2118,32 @@ EDITOR_HTML = """
             sendButton.disabled = true;
             
             const yamlContent = editor.getValue();
-            
-            fetch('/api/chat', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({ 
-                    message: message,
-                    yaml_content: yamlContent
-                })
-            })
-            .then(response => response.json())
+
+            // Refer to the saved revision instead of resending an unchanged document
+            const body = (syncedRevision !== null && yamlContent === syncedText)
+                ? { message: message, revision: syncedRevision }
+                : { message: message, yaml_content: yamlContent };
+
+            // The reply is shown as it streams in and replaced by the final message
+            let streamDiv = null;
+            const onToken = text => {
+                if (!streamDiv) {
+                    removeTypingIndicator();
+                    streamDiv = document.createElement('div');
+                    streamDiv.className = 'message ai';
+                    chatMessages.appendChild(streamDiv);
+                }
+                streamDiv.textContent += text;
+                chatMessages.scrollTop = chatMessages.scrollHeight;
+            };
+
+            streamChat(body, onToken)
+            .then(data => data.resync ? streamChat({ message: message, yaml_content: yamlContent }, onToken) : data)
             .then(data => {
                 removeTypingIndicator();
+                if (streamDiv) {
+                    streamDiv.remove();
+                }
                 
                 if (data.success) {
                     // Add AI response with suggestion if available
@@ -1227,26 +2199,58 @@ EDITOR_HTML = """
             }, 1500); // 1.5 second delay after stopping typing
         });
         
-        // Load chat history
-        fetch('/api/chat/history')
-            .then(response => response.json())
-            .then(data => {
-                if (data.success) {
-                    data.messages.forEach(msg => {
-                        if (msg.role !== 'system') {
-                            // Load suggestion if available
-                            let suggestion = null;
-                            if (msg.suggestion_id) {
-                                // For now, we'll load suggestions from the server
-                                // In a full implementation, you might want to store suggestions in localStorage
-                                // or implement a proper suggestion loading mechanism
+        // Load chat history one page at a time, newest first; older pages
+        // are inserted above the loaded ones on demand
+        let olderBefore = null;
+
+        function loadHistory(before) {
+            const url = before ? `/api/chat/history?before=${before}` : '/api/chat/history';
+            loadOlderBtn.disabled = true;
+            return fetch(url)
+                .then(response => response.json())
+                .then(data => {
+                    if (!data.success) {
+                        return;
+                    }
+                    if (before === null) {
+                        data.messages.forEach(msg => {
+                            if (msg.role !== 'system') {
+                                addMessage(msg.role, msg.content);
                             }
-                            addMessage(msg.role, msg.content, suggestion);
-                        }
-                    });
-                }
-            });
+                        });
+                    } else {
+                        // Keep the messages in view where they are
+                        const fromBottom = chatMessages.scrollHeight - chatMessages.scrollTop;
+                        const anchor = loadOlderBtn.nextSibling;
+                        data.messages.forEach(msg => {
+                            if (msg.role !== 'system') {
+                                const messageDiv = document.createElement('div');
+                                messageDiv.className = `message ${msg.role}`;
+                                messageDiv.textContent = msg.content;
+                                chatMessages.insertBefore(messageDiv, anchor);
+                            }
+                        });
+                        chatMessages.scrollTop = chatMessages.scrollHeight - fromBottom;
+                    }
+                    olderBefore = data.has_more ? data.next_before : null;
+                    loadOlderBtn.style.display = olderBefore ? 'block' : 'none';
+                })
+                .finally(() => {
+                    loadOlderBtn.disabled = false;
+                });
+        }
+
+        loadOlderBtn.addEventListener('click', () => {
+            if (olderBefore) {
+                loadHistory(olderBefore);
+            }
+        });
+
+        loadHistory(null);
         
+        // Render completion is pushed over Server-Sent Events
+        connectRenderEvents();
+
         // Initial render
         setTimeout(() => {
             saveAndRender();
@@ -1256,224 +2260,241 @@ EDITOR_HTML = """
 </html>
 """
 
+def session_for(cookie_value):
+    """The session id for a request's cookie, and whether it is a new session."""
+    if not SESSIONS_ENABLED:
+        return DEFAULT_SESSION, False
+    if not is_valid_session_id(cookie_value) or cookie_value == DEFAULT_SESSION:
+        return new_session_id(), True
+    return cookie_value, False
+
+@app.before_request
+def load_workspace():
+    """Attach the caller's workspace to the request."""
+    session_id, g.new_session = session_for(request.cookies.get(SESSION_COOKIE))
+    g.workspace = workspaces.get(session_id)
+
+@app.after_request
+def save_session_cookie(response):
+    """Hand newly created sessions their cookie."""
+    if getattr(g, "new_session", False):
+        response.set_cookie(SESSION_COOKIE, g.workspace.session_id, max_age=30 * 24 * 3600,
+                            httponly=True, samesite="Lax")
+    return response
+
 @app.route('/')
 def index():
     """Serve the main editor page."""
+    editor = g.workspace.editor
     yaml_content = editor.load_yaml()
     return render_template_string(EDITOR_HTML, yaml_content=yaml_content)
 
 @app.route('/api/save', methods=['POST'])  
 def save_yaml():
-    """Save YAML and render PDF."""
-    data = request.get_json()
-    yaml_content = data.get('yaml', '')
-    
+    """Save YAML and render PDF. Accepts the full text or a line patch."""
+    editor = g.workspace.editor
+    data = request.get_json() or {}
+    if 'patch' in data:
+        mode = "delta"
+        yaml_content, error = editor.apply_delta(data.get('base_revision'), data.get('patch'),
+                                                 data.get('checksum'))
+        if error:
+            # The client resends the full document
+            return jsonify({"success": False, "error": error, "resync": True,
+                            "revision": editor.current_document()[0]}), 409
+    else:
+        mode = "full"
+        yaml_content = data.get('yaml', '')
+    editor.save_requests_total.inc(mode=mode)
+    editor.save_payload_bytes.inc(request.content_length or 0, mode=mode)
+
     result = editor.save_yaml(yaml_content)
     return jsonify(result)
 
+def check_chat_request(data, editor):
+    """
+    Validate a chat request body and resolve the document it refers to.
+    Returns (message, yaml_content, None) or (None, None, (error body, status)).
+    """
+    user_message = data.get('message', '')
+    yaml_content = data.get('yaml_content')
+
+    if not user_message:
+        return None, None, ({"success": False, "error": "No message provided"}, 200)
+
+    if yaml_content is None:
+        # The client refers to the document by revision instead of resending it
+        revision, yaml_content = editor.current_document()
+        if data.get('revision') and data['revision'] != revision:
+            return None, None, ({"success": False, "error": "Base revision is out of date",
+                                 "resync": True, "revision": revision}, 409)
+    return user_message, yaml_content, None
+
+def resolve_chat_request():
+    """
+    Validate the current Flask chat request.
+    Returns (message, yaml_content, None) or (None, None, error response).
+    """
+    user_message, yaml_content, error = check_chat_request(request.get_json() or {}, g.workspace.editor)
+    if error:
+        body, status = error
+        return None, None, (jsonify(body), status)
+    return user_message, yaml_content, None
+
+def record_ai_reply(chat_manager, ai_result):
+    """Add an AI reply to the chat history."""
+    suggestion_id = ai_result["suggestion"]["id"] if ai_result["suggestion"] else None
+    chat_manager.add_message("ai", ai_result["chat_response"], ai_result["yaml_changes"], suggestion_id)
+
+def chat_reply_payload(ai_result):
+    """The client payload for a finished chat reply."""
+    return {
+        "success": True,
+        "response": ai_result["chat_response"],
+        "yaml_changes": ai_result["yaml_changes"],
+        "suggestion": ai_result["suggestion"],
+        "ttft_ms": ai_result.get("ttft_ms"),
+        "cached": ai_result.get("cached", False)
+    }
+
 @app.route('/api/chat', methods=['POST'])
 def chat():
     """Handle chat messages with AI."""
-    data = request.get_json()
-    user_message = data.get('message', '')
-    yaml_content = data.get('yaml_content', '')
-    
-    if not user_message:
-        return jsonify({"success": False, "error": "No message provided"})
+    chat_manager = g.workspace.chat_manager
+    user_message, yaml_content, error = resolve_chat_request()
+    if error:
+        return error
     
     # Add user message to chat history
     chat_manager.add_message("user", user_message)
 
-    # Attempt quick edits without calling the AI service
-    quick = chat_manager.apply_quick_edits(user_message, yaml_content)
-    if quick:
-        suggestion_id = quick["suggestion"]["id"] if quick["suggestion"] else None
-        chat_manager.add_message(
-            "ai",
-            quick["chat_response"],
-            quick["yaml_changes"],
-            suggestion_id,
-        )
-        return jsonify({
-            "success": True,
-            "response": quick["chat_response"],
-            "yaml_changes": quick["yaml_changes"],
-            "suggestion": quick["suggestion"],
-        })
-    
     try:
-        # Get AI response (this is a simplified synchronous version)
-        # In production, you might want to make this async
-        import asyncio
-        
-        # For now, we'll use a simple synchronous approach
-        if not chat_manager.openai_client:
-            ai_result = {
-                "chat_response": "AI is not available. Please set your OPENAI_API_KEY environment variable.",
-                "yaml_changes": None,
-                "suggestion": None
-            }
-        else:
-            # Simplified synchronous call - in production, consider async
-            try:
-                system_prompt = f"""You are an AI assistant helping with CV/resume editing. You can:
-1. Answer questions about CV writing and formatting
-2. Suggest improvements to the CV content  
-3. Provide suggestions for YAML modifications
+        # Attempt quick edits without calling the AI service
+        ai_result = (chat_manager.apply_quick_edits(user_message, yaml_content) or
+                     chat_manager.request_ai_response(user_message, yaml_content))
+        
+        # Add AI response to chat history
+        record_ai_reply(chat_manager, ai_result)
+        
+        return jsonify(chat_reply_payload(ai_result))
+        
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)})
 
-IMPORTANT RULES:
-- For general questions, advice, or explanations: Set yaml_changes to null and provide helpful text in chat_response
-- For actual CV modifications: Provide the complete modified YAML in yaml_changes field
-- NEVER paste the current YAML in chat_response - only provide explanations and advice there
-- When making changes, always use the yaml_changes field, not the chat_response field
-- CRITICAL: The yaml_changes field must be a YAML string, not a JSON object
+@app.route('/api/chat/stream', methods=['POST'])
+def chat_stream():
+    """Handle chat messages with AI, streaming the reply over Server-Sent Events."""
+    chat_manager = g.workspace.chat_manager
+    user_message, yaml_content, error = resolve_chat_request()
+    if error:
+        return error
 
-The CV uses RenderCV format. Here's the current YAML:
+    chat_manager.add_message("user", user_message)
 
-```yaml
-{yaml_content}
-```
+    def generate():
+        try:
+            quick = chat_manager.apply_quick_edits(user_message, yaml_content)
+            events = [("done", quick)] if quick else chat_manager.stream_ai_response(user_message, yaml_content)
+            for event, data in events:
+                if event == "done":
+                    record_ai_reply(chat_manager, data)
+                    data = chat_reply_payload(data)
+                yield format_sse(event, data)
+        except Exception as e:
+            yield format_sse("done", {"success": False, "error": str(e)})
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+# Under an ASGI server (see asgi_app) the chat routes below replace the two
+# Flask views above: a chat waiting on the AI holds no server thread.
+
+async def asgi_workspace(asgi_request):
+    """The caller's workspace, and the Set-Cookie header for a new session."""
+    session_id, new_session = session_for(asgi_request.cookies.get(SESSION_COOKIE))
+    headers = []
+    if new_session:
+        headers.append(("set-cookie", dump_cookie(SESSION_COOKIE, session_id, max_age=30 * 24 * 3600,
+                                                  httponly=True, samesite="Lax")))
+    # Opening a workspace may load its files from disk
+    return await run_blocking(workspaces.get, session_id), headers
+
+async def chat_async(asgi_request):
+    """Handle chat messages with AI on the ASGI event loop."""
+    workspace, headers = await asgi_workspace(asgi_request)
+    chat_manager = workspace.chat_manager
+    user_message, yaml_content, error = await run_blocking(check_chat_request, asgi_request.json(),
+                                                           workspace.editor)
+    if error:
+        body, status = error
+        return json_response(body, status=status, headers=headers)
+
+    await run_blocking(chat_manager.add_message, "user", user_message)
+    try:
+        ai_result = (await run_blocking(chat_manager.apply_quick_edits, user_message, yaml_content) or
+                     await chat_manager.arequest_ai_response(user_message, yaml_content))
+        await run_blocking(record_ai_reply, chat_manager, ai_result)
+        return json_response(chat_reply_payload(ai_result), headers=headers)
+    except Exception as e:
+        return json_response({"success": False, "error": str(e)}, headers=headers)
 
-Respond in JSON format:
-{{
-    "chat_response": "Your explanation, advice, or response (DO NOT include YAML here)",
-    "yaml_changes": "Complete modified YAML content as a string (only if making actual changes, otherwise null)",
-    "explanation": "Detailed explanation of the changes you're suggesting"
-}}
+async def chat_stream_async(asgi_request):
+    """Stream chat replies over Server-Sent Events on the ASGI event loop."""
+    workspace, headers = await asgi_workspace(asgi_request)
+    chat_manager = workspace.chat_manager
+    user_message, yaml_content, error = await run_blocking(check_chat_request, asgi_request.json(),
+                                                           workspace.editor)
+    if error:
+        body, status = error
+        return json_response(body, status=status, headers=headers)
 
-EXAMPLES:
-- User asks "How do I improve my CV?": Set yaml_changes to null, provide advice in chat_response
-- User asks "Add a new skill": Set yaml_changes to the complete modified YAML string with the new skill added
-- User asks "What's wrong with my CV?": Set yaml_changes to null, provide analysis in chat_response
-- User asks "Make my CV more professional": Set yaml_changes to the complete modified YAML string with improvements
+    await run_blocking(chat_manager.add_message, "user", user_message)
 
-CRITICAL: The yaml_changes field must be a YAML string, not a JSON object. If you're modifying the CV, return the complete YAML as a string.
+    async def generate():
+        try:
+            quick = await run_blocking(chat_manager.apply_quick_edits, user_message, yaml_content)
+            if quick:
+                await run_blocking(record_ai_reply, chat_manager, quick)
+                yield format_sse("done", chat_reply_payload(quick))
+                return
+            async for event, data in chat_manager.aiter_ai_response(user_message, yaml_content):
+                if event == "done":
+                    await run_blocking(record_ai_reply, chat_manager, data)
+                    data = chat_reply_payload(data)
+                yield format_sse(event, data)
+        except Exception as e:
+            yield format_sse("done", {"success": False, "error": str(e)})
 
-Make sure your JSON is properly formatted and valid.
-"""
-                
-                messages = [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message}
-                ]
-                
-                response = chat_manager.openai_client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=messages,
-                    temperature=0.3,
-                    max_tokens=2000
-                )
-                
-                ai_response = response.choices[0].message.content
-                
-                # Try to parse as JSON, fallback to plain text
-                try:
-                    if ai_response:
-                        print(f"DEBUG: Raw AI response: {ai_response[:200]}...")  # First 200 chars
-                        parsed_response = json.loads(ai_response)
-                        yaml_changes = parsed_response.get("yaml_changes")
-                        
-                        print(f"DEBUG: Parsed yaml_changes type: {type(yaml_changes)}")
-                        print(f"DEBUG: yaml_changes is None: {yaml_changes is None}")
-                        
-                        # If there are YAML changes, create a suggestion
-                        suggestion = None
-                        if yaml_changes and yaml_changes != yaml_content:
-                            print(f"DEBUG: Creating suggestion - changes detected")
-                            suggestion = chat_manager.create_suggestion(
-                                yaml_content, 
-                                yaml_changes, 
-                                parsed_response.get("explanation", "AI suggested changes")
-                            )
-                        elif yaml_changes:
-                            # Debug: YAML changes were provided but they're identical to current content
-                            print(f"DEBUG: YAML changes provided but identical to current content")
-                            print(f"DEBUG: yaml_changes length: {len(yaml_changes) if yaml_changes else 0}")
-                            print(f"DEBUG: yaml_content length: {len(yaml_content) if yaml_content else 0}")
-                            print(f"DEBUG: Are they equal? {yaml_changes == yaml_content}")
-                        else:
-                            print(f"DEBUG: No yaml_changes provided")
-                        
-                        ai_result = {
-                            "chat_response": parsed_response.get("chat_response", ai_response),
-                            "yaml_changes": yaml_changes,
-                            "suggestion": suggestion
-                        }
-                    else:
-                        ai_result = {
-                            "chat_response": "No response from AI",
-                            "yaml_changes": None,
-                            "suggestion": None
-                        }
-                except json.JSONDecodeError as e:
-                    print(f"DEBUG: JSON decode error: {e}")
-                    print(f"DEBUG: Failed to parse: {ai_response}")
-
-                    yaml_block = None
-                    match = re.search(r"```(?:yaml)?\n(.*?)\n```", ai_response, re.DOTALL)
-                    if match:
-                        yaml_block = match.group(1).strip()
-                        explanation = (ai_response[:match.start()] + ai_response[match.end():]).strip()
-                    else:
-                        try:
-                            yaml.safe_load(ai_response)
-                            yaml_block = ai_response
-                            explanation = ""
-                        except yaml.YAMLError:
-                            explanation = ai_response
-
-                    if yaml_block:
-                        suggestion = None
-                        if yaml_block != yaml_content:
-                            suggestion = chat_manager.create_suggestion(
-                                yaml_content,
-                                yaml_block,
-                                "AI suggested changes"
-                            )
-                        ai_result = {
-                            "chat_response": explanation or "AI provided YAML changes.",
-                            "yaml_changes": yaml_block,
-                            "suggestion": suggestion
-                        }
-                    else:
-                        ai_result = {
-                            "chat_response": ai_response or "No response from AI",
-                            "yaml_changes": None,
-                            "suggestion": None
-                        }
-                    
-            except Exception as e:
-                ai_result = {
-                    "chat_response": f"Error getting AI response: {str(e)}",
-                    "yaml_changes": None,
-                    "suggestion": None
-                }
-        
-        # Add AI response to chat history
-        suggestion_id = ai_result["suggestion"]["id"] if ai_result["suggestion"] else None
-        chat_manager.add_message("ai", ai_result["chat_response"], ai_result["yaml_changes"], suggestion_id)
-        
-        return jsonify({
-            "success": True,
-            "response": ai_result["chat_response"],
-            "yaml_changes": ai_result["yaml_changes"],
-            "suggestion": ai_result["suggestion"]
-        })
-        
-    except Exception as e:
-        return jsonify({"success": False, "error": str(e)})
+    return ASGIResponse(generate(), content_type="text/event-stream",
+                        headers=headers + [("cache-control", "no-cache"), ("x-accel-buffering", "no")])
 
 @app.route('/api/chat/history')
 def chat_history():
-    """Get chat history."""
+    """
+    Get a page of chat history: the newest `limit` messages (default 100)
+    before seq `before`. Pass `next_before` back to get the previous page.
+    """
+    chat_manager = g.workspace.chat_manager
+    try:
+        limit = min(max(int(request.args.get("limit", CHAT_HISTORY_PAGE)), 1), CHAT_HISTORY_MAX_PAGE)
+        before = int(request.args["before"]) if request.args.get("before") else None
+    except ValueError:
+        return jsonify({"success": False, "error": "limit and before must be integers"}), 400
+    # One extra message tells whether an older page exists
+    messages = chat_manager.get_chat_history(limit=limit + 1, before=before)
+    has_more = len(messages) > limit
+    messages = messages[-limit:]
     return jsonify({
         "success": True,
-        "messages": chat_manager.get_chat_history()
+        "messages": messages,
+        "has_more": has_more,
+        "next_before": messages[0]["seq"] if has_more else None
     })
 
 @app.route('/api/suggestion/<suggestion_id>')
 def get_suggestion(suggestion_id):
     """Get a specific suggestion."""
+    chat_manager = g.workspace.chat_manager
     suggestion = chat_manager.get_suggestion(suggestion_id)
     if suggestion:
         return jsonify({
@@ -1485,6 +2506,7 @@ def get_suggestion(suggestion_id):
 @app.route('/api/suggestion/<suggestion_id>/accept', methods=['POST'])
 def accept_suggestion(suggestion_id):
     """Accept a suggestion."""
+    chat_manager = g.workspace.chat_manager
     accepted_yaml = chat_manager.accept_suggestion(suggestion_id)
     if accepted_yaml:
         return jsonify({
@@ -1496,6 +2518,7 @@ def accept_suggestion(suggestion_id):
 @app.route('/api/suggestion/<suggestion_id>/decline', methods=['POST'])
 def decline_suggestion(suggestion_id):
     """Decline a suggestion."""
+    chat_manager = g.workspace.chat_manager
     suggestion = chat_manager.decline_suggestion(suggestion_id)
     if suggestion:
         return jsonify({
@@ -1504,16 +2527,111 @@ def decline_suggestion(suggestion_id):
         })
     return jsonify({"success": False, "error": "Suggestion not found"}), 404
 
+@app.route('/api/render/stats')
+def render_stats():
+    """Get render cache, worker and cleanup statistics."""
+    editor = g.workspace.editor
+    return jsonify({
+        "success": True,
+        "cache": render_cache.get_stats(),
+        "pool": render_pool.get_stats(),
+        "pdf_bytes": pdf_bytes_cache.get_stats(),
+        "schema": schema_validator.get_stats(),
+        "parsed_docs": parsed_docs.get_stats(),
+        "chat_engine": chat_engine.get_stats(),
+        "asgi": asgi_app.get_stats(),
+        "chat_cache": llm_cache.get_stats() if llm_cache else None,
+        "intent_router": intent_router.get_stats(),
+        "chat_store": g.workspace.chat_manager.store.get_stats(),
+        "chat_db": chat_database.get_stats() if chat_database else None,
+        "sessions": workspaces.get_stats(),
+        "gc": editor.sweeper.get_stats(),
+        "persistence": editor.cv_file.get_stats(),
+        "profiles": {
+            name: dict(profile, timings=editor.render_timings.get_stats().get(name))
+            for name, profile in RENDER_PROFILES.items()
+        }
+    })
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Expose render metrics in the Prometheus text format."""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/renders')
+def list_renders():
+    """List retained renders with their durations and sizes."""
+    editor = g.workspace.editor
+    limit = request.args.get('limit', type=int)
+    return jsonify({
+        "success": True,
+        "renders": editor.list_renders(limit)
+    })
+
+@app.route('/api/export', methods=['POST'])
+def export_cv():
+    """Render every output format for the current YAML."""
+    editor = g.workspace.editor
+    data = request.get_json() or {}
+    yaml_content = data.get('yaml') or editor.current_document()[1]
+    try:
+        editor.parsed_docs.get(yaml_content)
+    except yaml.YAMLError as e:
+        return jsonify({"success": False, "error": f"Invalid YAML: {str(e)}"})
+
+    result = editor.export_render(yaml_content)
+    if result.get("success"):
+        return jsonify(result)
+    return jsonify({"success": False, "error": result.get("error"), "cancelled": result.get("cancelled", False)})
+
+@app.route('/export/<timestamp>/<path:filename>')
+def serve_export(timestamp, filename):
+    """Serve a file produced by a full export."""
+    editor = g.workspace.editor
+    output_dir = editor.get_export_dir(timestamp)
+    if output_dir:
+        return send_from_directory(os.path.abspath(output_dir), filename, as_attachment=True)
+    return "Export not found", 404
+
+@app.route('/api/render/events')
+def render_events():
+    """Stream render-started/finished/failed events to the browser (SSE)."""
+    editor = g.workspace.editor
+    return Response(
+        stream_with_context(editor.events.stream()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/pdf/<timestamp>')
 def serve_pdf(timestamp):
     """Serve the rendered PDF."""
-    if editor.current_render and editor.current_render['timestamp'] == timestamp:
-        pdf_path = editor.current_render['pdf_path']
-        if os.path.exists(pdf_path):
-            return send_file(pdf_path, mimetype='application/pdf')
+    editor = g.workspace.editor
+    pdf_path = editor.get_pdf_path(timestamp)
+    if pdf_path:
+        try:
+            data, etag = pdf_bytes_cache.load(pdf_path)
+        except OSError:
+            return "PDF not found", 404
+        # conditional=True answers If-None-Match with 304 and Range with 206
+        response = send_file(io.BytesIO(data), mimetype='application/pdf',
+                             etag=etag, conditional=True, max_age=0)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+
+    status = editor.get_render_status(timestamp)
+    if status and status["status"] == "superseded":
+        # A newer save replaced this render; tell the client to stop waiting
+        return jsonify(status), 410
     
     return "PDF not found", 404
 
+# ASGI entry point: `uvicorn simple_yaml_editor:asgi_app`
+asgi_app = ASGIApp(app, routes={
+    ("POST", "/api/chat"): chat_async,
+    ("POST", "/api/chat/stream"): chat_stream_async,
+}, wsgi_threads=int(os.getenv("ASGI_WSGI_THREADS", "32")))
+
 if __name__ == '__main__':
     print("🚀 Starting AI-Powered YAML CV Editor")
     print("📝 Open your browser to: http://localhost:5000")
@@ -1529,5 +2647,13 @@ if __name__ == '__main__':
         print("🤖 AI assistant is ready!")
     
     print("\nPress Ctrl+C to stop")
-    
-    app.run(debug=True, host='0.0.0.0', port=5000) 
+    start_background_services()
+
+    try:
+        import uvicorn
+        import a2wsgi  # bridges the Flask routes under ASGI
+    except ImportError:
+        print("ℹ️  Install uvicorn and a2wsgi to serve chats asynchronously: pip install uvicorn a2wsgi")
+        app.run(debug=True, host='0.0.0.0', port=5000)
+    else:
+        uvicorn.run(asgi_app, host='0.0.0.0', port=5000)
@@ -188,7 +188,8 @@ def main():
     
     # Import and run the Flask app
     try:
-        from simple_yaml_editor import app
+        from simple_yaml_editor import app, start_background_services
+        start_background_services()
         app.run(debug=False, host='0.0.0.0', port=5000, use_reloader=False)
     except KeyboardInterrupt:
         print("\n👋 YAML Editor stopped")
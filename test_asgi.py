@@ -0,0 +1,138 @@
+"""
+Tests for the ASGI front (utils/asgi.py): async routes on the event loop,
+everything else through the Flask app.
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+flask = pytest.importorskip("flask")
+
+from utils.asgi import ASGIApp, json_response, ASGIResponse, run_blocking
+
+def _wsgi_app():
+    app = flask.Flask(__name__)
+
+    @app.route("/hello")
+    def hello():
+        return {"hello": flask.request.args.get("name"), "cookie": flask.request.cookies.get("sid")}
+
+    @app.route("/events")
+    def events():
+        return flask.Response((f"data: {index}\n\n" for index in range(3)), mimetype="text/event-stream")
+
+    return app
+
+async def _call(app, method, path, body=b"", query=b"", headers=(), disconnect_after=None):
+    """Drive one request through the app and collect what it sent."""
+    requests = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+    disconnected = asyncio.Event()
+
+    async def receive():
+        if requests:
+            return requests.pop(0)
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+        if disconnect_after and sum(1 for m in sent if m.get("body")) >= disconnect_after:
+            disconnected.set()
+
+    scope = {"type": "http", "method": method, "path": path, "query_string": query,
+             "headers": [(b"content-type", b"application/json"), *headers],
+             "http_version": "1.1", "scheme": "http", "server": ("testserver", 80),
+             "client": ("127.0.0.1", 1234), "root_path": ""}
+    await asyncio.wait_for(app(scope, receive, send), 5)
+    return sent
+
+def _body(sent):
+    return b"".join(message.get("body", b"") for message in sent if message["type"] == "http.response.body")
+
+def test_async_routes_are_served_on_the_event_loop():
+    async def echo(request):
+        return json_response({"data": request.json(), "sid": request.cookies.get("sid")})
+
+    app = ASGIApp(_wsgi_app(), routes={("POST", "/api/echo"): echo})
+    sent = asyncio.run(_call(app, "POST", "/api/echo", body=b'{"a": 1}', headers=[(b"cookie", b"sid=abc")]))
+    assert sent[0]["status"] == 200
+    assert json.loads(_body(sent)) == {"data": {"a": 1}, "sid": "abc"}
+    assert app.get_stats()["async_requests"] == 1
+
+def test_other_routes_reach_the_flask_app():
+    app = ASGIApp(_wsgi_app(), routes={})
+    sent = asyncio.run(_call(app, "GET", "/hello", query=b"name=Alex", headers=[(b"cookie", b"sid=abc")]))
+    assert sent[0]["status"] == 200
+    assert json.loads(_body(sent)) == {"hello": "Alex", "cookie": "abc"}
+    assert asyncio.run(_call(app, "GET", "/missing"))[0]["status"] == 404
+
+def test_streamed_flask_responses_are_forwarded():
+    app = ASGIApp(_wsgi_app(), routes={})
+    sent = asyncio.run(_call(app, "GET", "/events"))
+    assert _body(sent) == b"data: 0\n\ndata: 1\n\ndata: 2\n\n"
+
+def test_disconnect_cancels_an_async_stream():
+    closed = []
+
+    async def tokens():
+        try:
+            for index in range(1000):
+                await asyncio.sleep(0.01)
+                yield f"data: {index}\n\n"
+        finally:
+            closed.append(True)
+
+    async def stream(request):
+        return ASGIResponse(tokens(), content_type="text/event-stream")
+
+    app = ASGIApp(_wsgi_app(), routes={("POST", "/api/stream"): stream})
+    sent = asyncio.run(_call(app, "POST", "/api/stream", disconnect_after=2))
+    assert _body(sent).startswith(b"data: 0\n\ndata: 1\n\n")
+    assert closed == [True]
+    assert app.get_stats()["disconnects"] == 1
+
+def test_blocking_work_runs_off_the_event_loop():
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.ensure_future(ticker())
+        assert await run_blocking(lambda delay: time.sleep(delay) or "done", 0.3) == "done"
+        task.cancel()
+        return ticks
+
+    assert asyncio.run(main()) >= 10
+
+def test_a_slow_flask_request_does_not_hold_up_async_routes():
+    app = _wsgi_app()
+
+    @app.route("/slow")
+    def slow():
+        time.sleep(0.5)
+        return {"slow": True}
+
+    async def fast(request):
+        return json_response({"fast": True})
+
+    asgi = ASGIApp(app, routes={("GET", "/fast"): fast})
+
+    async def main():
+        slow_request = asyncio.ensure_future(_call(asgi, "GET", "/slow"))
+        await asyncio.sleep(0.05)
+        started = time.perf_counter()
+        fast_sent = await _call(asgi, "GET", "/fast")
+        elapsed = time.perf_counter() - started
+        return _body(await slow_request), _body(fast_sent), elapsed
+
+    slow_body, fast_body, elapsed = asyncio.run(main())
+    assert json.loads(slow_body) == {"slow": True} and json.loads(fast_body) == {"fast": True}
+    assert elapsed < 0.3
@@ -0,0 +1,99 @@
+"""
+Tests for the batch render CLI (batch_render.py), rendering with the fake
+RenderCV worker from conftest.py.
+"""
+
+import json
+import os
+import sys
+
+import batch_render
+
+def _run(monkeypatch, *argv):
+    monkeypatch.setattr(sys, "argv", ["batch_render.py", *argv])
+    return batch_render.main()
+
+def _manifest(output):
+    with open(os.path.join(output, batch_render.MANIFEST_NAME), encoding="utf-8") as file:
+        return json.load(file)
+
+def test_collect_files_expands_directories_and_globs(tmp_path):
+    (tmp_path / "a.yaml").write_text("cv: {}\n")
+    (tmp_path / "b.yml").write_text("cv: {}\n")
+    (tmp_path / "notes.txt").write_text("")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "c_CV.yaml").write_text("cv: {}\n")
+    assert [os.path.basename(p) for p in batch_render.collect_files([str(tmp_path)])] == ["a.yaml", "b.yml"]
+    assert [os.path.basename(p) for p in batch_render.collect_files([str(tmp_path / "**" / "*_CV.yaml")])] == ["c_CV.yaml"]
+
+def test_output_names_follow_the_relative_path(tmp_path):
+    root = str(tmp_path)
+    assert batch_render.output_name(str(tmp_path / "team" / "cv.yaml"), root) == "team__cv.pdf"
+
+def test_colliding_stems_keep_their_extension(tmp_path):
+    files = [str(tmp_path / "cv.yaml"), str(tmp_path / "cv.yml"), str(tmp_path / "sam.yaml")]
+    assert list(batch_render.output_names(files, str(tmp_path)).values()) == [
+        "cv.yaml.pdf", "cv.yml.pdf", "sam.pdf"]
+
+def test_unchanged_files_are_skipped_on_the_next_run(tmp_path, fake_rendercv, monkeypatch):
+    cvs, output = tmp_path / "cvs", str(tmp_path / "out")
+    cvs.mkdir()
+    (cvs / "alex.yaml").write_text("cv:\n  name: Alex\n")
+    (cvs / "sam.yaml").write_text("cv:\n  name: Sam\n")
+    assert _run(monkeypatch, str(cvs), "-o", output, "-j", "2") == 0
+    assert sorted(name for name in os.listdir(output) if name.endswith(".pdf")) == ["alex.pdf", "sam.pdf"]
+    assert len(fake_rendercv.jobs()) == 2
+
+    (cvs / "sam.yaml").write_text("cv:\n  name: Sam Lee\n")
+    assert _run(monkeypatch, str(cvs), "-o", output) == 0
+    assert len(fake_rendercv.jobs()) == 3
+    assert set(_manifest(output)) == {str(cvs / "alex.yaml"), str(cvs / "sam.yaml")}
+
+    assert _run(monkeypatch, str(cvs), "-o", output, "--force") == 0
+    assert len(fake_rendercv.jobs()) == 5
+
+def test_failed_files_are_reported_and_left_out_of_the_manifest(tmp_path, fake_rendercv, monkeypatch, capsys):
+    cvs, output = tmp_path / "cvs", str(tmp_path / "out")
+    cvs.mkdir()
+    (cvs / "good.yaml").write_text("cv:\n  name: Good\n")
+    (cvs / "bad.yaml").write_text("# fail\n")
+    assert _run(monkeypatch, str(cvs), "-o", output) == 1
+    assert "bad.yaml: fake failure" in capsys.readouterr().out
+    assert list(_manifest(output)) == [str(cvs / "good.yaml")]
+
+def test_export_profile_keeps_the_other_formats(tmp_path, fake_rendercv, monkeypatch):
+    cvs, output = tmp_path / "cvs", tmp_path / "out"
+    cvs.mkdir()
+    (cvs / "cv.yaml").write_text("cv:\n  name: Alex\n")
+    assert _run(monkeypatch, str(cvs), "-o", str(output), "--profile", "export") == 0
+    assert (output / "cv.pdf").exists()
+    assert (output / "cv" / "temp_cv.md").exists()
+
+def test_output_that_cannot_be_saved_fails_only_that_file(tmp_path, fake_rendercv, monkeypatch, capsys):
+    cvs, output = tmp_path / "cvs", tmp_path / "out"
+    cvs.mkdir()
+    (cvs / "alex.yaml").write_text("cv:\n  name: Alex\n")
+    (cvs / "sam.yaml").write_text("cv:\n  name: Sam\n")
+    (output / "alex.pdf").mkdir(parents=True)  # the PDF cannot be copied over a directory
+    assert _run(monkeypatch, str(cvs), "-o", str(output)) == 1
+    assert "alex.yaml: Could not save output" in capsys.readouterr().out
+    assert list(_manifest(str(output))) == [str(cvs / "sam.yaml")]
+
+def test_unreadable_file_fails_only_that_file(tmp_path, fake_rendercv, monkeypatch, capsys):
+    cvs, output = tmp_path / "cvs", str(tmp_path / "out")
+    cvs.mkdir()
+    (cvs / "alex.yaml").write_text("cv:\n  name: Alex\n")
+    (cvs / "latin1.yaml").write_bytes("cv:\n  name: Jos\xe9\n".encode("latin-1"))
+    assert _run(monkeypatch, str(cvs), "-o", output) == 1
+    assert "latin1.yaml: Could not read file" in capsys.readouterr().out
+    assert list(_manifest(output)) == [str(cvs / "alex.yaml")]
+    assert len(fake_rendercv.jobs()) == 1
+
+def test_yaml_and_yml_files_with_one_stem_get_separate_pdfs(tmp_path, fake_rendercv, monkeypatch):
+    cvs, output = tmp_path / "cvs", tmp_path / "out"
+    cvs.mkdir()
+    (cvs / "cv.yaml").write_text("cv:\n  name: Alex\n")
+    (cvs / "cv.yml").write_text("cv:\n  name: Sam\n")
+    assert _run(monkeypatch, str(cvs), "-o", str(output)) == 0
+    assert "Alex" in (output / "cv.yaml.pdf").read_text()
+    assert "Sam" in (output / "cv.yml.pdf").read_text()
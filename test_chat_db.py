@@ -0,0 +1,73 @@
+"""
+Tests for the SQLite chat database (utils/chat_db.py): warm restarts,
+history pages older than memory and retried batches.
+"""
+
+from utils.chat_db import ChatDatabase
+from utils.chat_store import ChatStore
+
+BASE = "cv:\n  name: Jordan Reyes\n  email: jordan@example.com\n"
+
+def _message(index):
+    return {"id": f"id-{index}", "role": "user", "content": f"m{index}", "timestamp": "2026-01-01T00:00:00"}
+
+def _suggestion(suggestion_id, name="Alex Reyes", base=BASE):
+    return {"id": suggestion_id, "original_yaml": base, "suggested_yaml": base.replace("Jordan Reyes", name),
+            "explanation": "rename", "status": "pending", "created_at": f"2026-01-01T00:00:{suggestion_id:0>2}"}
+
+def test_database_restart_is_warm(tmp_path):
+    path = str(tmp_path / "chat.db")
+    database = ChatDatabase(path, delay=60)
+    session = database.session("s1")
+    for index in range(5):
+        session.add_message(_message(index))
+    session.add_suggestion(_suggestion("1"))
+    session.add_suggestion(_suggestion("2", name="Sam Reyes"))
+    session.set_status("2", "accepted")
+    database.close()
+
+    database = ChatDatabase(path, delay=60)
+    session = database.session("s1")
+    assert [message["content"] for message in session.history()] == ["m0", "m1", "m2", "m3", "m4"]
+    # Only pending suggestions are loaded up front; resolved ones are read on demand
+    assert session.memory.get_stats()["suggestions"] == 1
+    assert session.get_suggestion("2")["status"] == "accepted"
+    assert database.session("other").history() == []
+    database.close()
+
+def test_database_serves_history_older_than_memory(tmp_path):
+    database = ChatDatabase(str(tmp_path / "chat.db"), delay=60)
+    session = database.session("s1", ChatStore(max_messages=4))
+    for index in range(10):
+        session.add_message(_message(index))
+    # The newest page comes from memory
+    assert [message["seq"] for message in session.history(limit=3)] == [8, 9, 10]
+    assert session.database_reads == 0
+    # Older pages come from the database
+    assert [message["seq"] for message in session.history(limit=3, before=4)] == [1, 2, 3]
+    assert session.database_reads == 1
+    assert len(session.history()) == 10
+    database.close()
+
+def test_evicted_suggestions_are_read_back(tmp_path):
+    database = ChatDatabase(str(tmp_path / "chat.db"), delay=60)
+    session = database.session("s1", ChatStore(max_suggestions=1))
+    session.add_suggestion(_suggestion("1"))
+    session.add_suggestion(_suggestion("2", name="Sam Reyes"))
+    assert session.memory.get_suggestion("1") is None
+    assert session.set_status("1", "accepted")["status"] == "accepted"
+    assert session.get_suggestion("1")["suggested_yaml"] == BASE.replace("Jordan Reyes", "Alex Reyes")
+    database.close()
+
+def test_failed_batches_are_kept_and_retried(tmp_path):
+    database = ChatDatabase(str(tmp_path / "chat.db"), delay=60, max_retry_delay=60)
+    database.enqueue("INSERT INTO missing_table VALUES (?)", (1,))
+    database.flush()
+    stats = database.get_stats()
+    assert stats["errors"] == 1 and stats["pending_writes"] == 1
+    assert database._timer is not None and database._retry_delay == 60
+    with database._lock:
+        database._pending = []
+        database._timer.cancel()
+        database._timer = None
+    database.close()
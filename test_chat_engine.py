@@ -0,0 +1,73 @@
+"""
+Tests for the asynchronous chat engine (utils/chat_engine.py), with
+coroutines standing in for AI requests.
+"""
+
+import asyncio
+
+import pytest
+
+from utils.chat_engine import AsyncChatEngine, ChatTimeout
+
+@pytest.fixture
+def engine():
+    engine = AsyncChatEngine(timeout=5)
+    yield engine
+    engine.stop()
+
+async def _reply(text, delay=0.0):
+    await asyncio.sleep(delay)
+    return text
+
+async def _tokens(count, delay=0.0, cancelled=None):
+    try:
+        for index in range(count):
+            await asyncio.sleep(delay)
+            yield f"t{index}"
+    except asyncio.CancelledError:
+        if cancelled is not None:
+            cancelled.append(True)
+        raise
+
+def test_loop_and_client_are_created_lazily(engine):
+    assert not engine.get_stats()["running"]
+    built = []
+    client = engine.get_client(lambda: built.append(1) or object())
+    assert engine.get_client(object) is client and built == [1]
+    assert engine.run(_reply("hi")) == "hi"
+    assert engine.get_stats()["running"]
+
+def test_slow_request_times_out(engine):
+    with pytest.raises(ChatTimeout):
+        engine.run(_reply("late", delay=5), timeout=0.05)
+    assert engine.get_stats()["timeouts"] == 1
+
+def test_errors_reach_the_caller(engine):
+    async def broken():
+        raise RuntimeError("api down")
+
+    with pytest.raises(RuntimeError, match="api down"):
+        engine.run(broken())
+    assert engine.get_stats()["errors"] == 1
+
+def test_stream_yields_every_item(engine):
+    assert list(engine.stream(_tokens(3))) == ["t0", "t1", "t2"]
+    assert engine.get_stats()["completed"] == 1
+
+def test_closing_a_stream_cancels_the_request(engine):
+    cancelled = []
+    items = engine.stream(_tokens(100, delay=0.01, cancelled=cancelled))
+    assert next(items) == "t0"
+    items.close()
+    engine.run(_reply(None, delay=0.1))
+    assert cancelled == [True]
+    stats = engine.get_stats()
+    assert (stats["cancelled"], stats["active"]) == (1, 0)
+
+def test_async_views_await_from_another_loop(engine):
+    async def main():
+        reply = await engine.arun(_reply("hi"))
+        tokens = [token async for token in engine.astream(_tokens(2))]
+        return reply, tokens
+
+    assert asyncio.run(main()) == ("hi", ["t0", "t1"])
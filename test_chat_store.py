@@ -0,0 +1,61 @@
+"""
+Tests for bounded chat storage (utils/chat_store.py): the message ring,
+history pages and suggestion eviction.
+"""
+
+import time
+
+from utils.chat_store import ChatStore
+
+BASE = "cv:\n  name: Jordan Reyes\n  email: jordan@example.com\n"
+
+def _suggestion(suggestion_id, name="Alex Reyes", base=BASE):
+    return {"id": suggestion_id, "original_yaml": base, "suggested_yaml": base.replace("Jordan Reyes", name),
+            "explanation": "rename", "status": "pending", "created_at": f"2026-01-01T00:00:{suggestion_id:0>2}"}
+
+def test_message_ring_keeps_the_newest_messages():
+    store = ChatStore(max_messages=3)
+    for index in range(5):
+        store.add_message({"role": "user", "content": f"m{index}"})
+    assert [message["content"] for message in store.history()] == ["m2", "m3", "m4"]
+    assert [message["seq"] for message in store.history()] == [3, 4, 5]
+    assert store.get_stats()["evicted_messages"] == 2
+
+def test_history_pages_by_sequence_number():
+    store = ChatStore()
+    for index in range(10):
+        store.add_message({"role": "user", "content": f"m{index}"})
+    assert [message["seq"] for message in store.history(limit=3)] == [8, 9, 10]
+    assert [message["seq"] for message in store.history(limit=3, before=8)] == [5, 6, 7]
+
+def test_suggestions_round_trip_through_their_compact_form():
+    store = ChatStore()
+    store.add_suggestion(_suggestion("1"))
+    suggestion = store.get_suggestion("1")
+    assert suggestion["original_yaml"] == BASE
+    assert suggestion["suggested_yaml"] == BASE.replace("Jordan Reyes", "Alex Reyes")
+    # Suggestions made against the same text share its base
+    store.add_suggestion(_suggestion("2", name="Sam Reyes"))
+    assert store.get_stats()["base_revisions"] == 1
+
+def test_resolved_suggestions_are_evicted_before_pending_ones():
+    store = ChatStore(max_suggestions=3)
+    for suggestion_id in ("1", "2", "3"):
+        store.add_suggestion(_suggestion(suggestion_id))
+    store.set_status("3", "accepted")
+    store.add_suggestion(_suggestion("4"))
+    assert [i for i in "1234" if store.get_suggestion(i)] == ["1", "2", "4"]
+    # With no resolved suggestion left, the oldest pending one goes
+    store.add_suggestion(_suggestion("5"))
+    assert [i for i in "12345" if store.get_suggestion(i)] == ["2", "4", "5"]
+    assert store.get_stats()["evicted_suggestions"] == 2
+
+def test_resolved_suggestions_expire_after_the_ttl():
+    store = ChatStore(resolved_ttl=60)
+    store.add_suggestion(_suggestion("1"))
+    store.set_status("1", "declined")
+    assert store.get_suggestion("1")["status"] == "declined"
+    store._suggestions["1"][0]["resolved_at"] = time.time() - 120
+    assert store.get_suggestion("1") is None
+    assert store.get_stats()["expired_suggestions"] == 1
+    assert store.memory_bytes() == 0
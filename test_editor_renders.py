@@ -0,0 +1,194 @@
+"""
+Tests for the editor's render path in simple_yaml_editor.py: background
+renders, the render cache, superseding stale renders, exports and the
+renders the sweeper must keep. Renders run on a real RenderPool whose
+workers talk to the fake RenderCV worker from conftest.py.
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("yaml")
+pytest.importorskip("flask")
+
+from simple_yaml_editor import SimpleYAMLEditor
+from utils.render_cache import RenderCache
+from utils.render_gc import SweeperGroup
+from utils.render_pool import RenderPool
+from utils.render_worker import RenderWorker
+from utils.text_delta import content_revision
+
+CV = "cv:\n  name: Jordan Reyes\n"
+
+@pytest.fixture
+def editor(tmp_path, fake_rendercv):
+    pool = RenderPool(size=2, worker_factory=lambda: RenderWorker(timeout=10))
+    editor = SimpleYAMLEditor(
+        working_cv_file=str(tmp_path / "working_CV.yaml"),
+        temp_dir=str(tmp_path / "temp_renders"),
+        render_cache=RenderCache(cache_dir=str(tmp_path / "cache")),
+        render_pool=pool,
+        sweepers=SweeperGroup(interval=3600)
+    )
+    yield editor
+    editor.close()
+    pool.shutdown()
+
+def _wait(editor, render):
+    return render["future"].result(timeout=15) if render.get("future") else None
+
+def _saved(editor, text):
+    result = editor.save_yaml(text)
+    assert result.get("success"), result
+    render = result["render"]
+    render["future"] = editor.pending_renders.get(render["timestamp"])
+    return render
+
+def test_save_renders_in_the_background(editor):
+    render = _saved(editor, CV)
+    result = _wait(editor, render)
+    assert result == {"success": True, "pdf_url": f"/pdf/{render['timestamp']}",
+                      "timestamp": render["timestamp"]}
+    assert open(editor.current_render["pdf_path"]).read().startswith("%PDF-fake")
+    assert not editor.pending_renders and not editor.busy()
+
+def test_identical_content_is_served_from_the_render_cache(editor, fake_rendercv):
+    _wait(editor, _saved(editor, CV))
+    render = _saved(editor, CV + "\n")
+    assert render["cached"] and render["ready"]
+    assert len(fake_rendercv.jobs()) == 1
+    assert editor.current_render["timestamp"] == render["timestamp"]
+
+def test_newer_saves_supersede_queued_and_running_renders(editor, fake_rendercv):
+    first = _saved(editor, CV + "# sleep: 3\n")
+    deadline = time.time() + 10
+    while not fake_rendercv.jobs():
+        assert time.time() < deadline
+        time.sleep(0.02)
+    queued = _saved(editor, CV + "# queued\n")
+    latest = _saved(editor, CV + "# latest\n")
+
+    assert editor.get_render_status(queued["timestamp"]) == {
+        "status": "superseded", "superseded_by": latest["timestamp"]}
+    assert _wait(editor, first)["superseded"]
+    assert _wait(editor, latest)["success"]
+    assert editor.current_render["timestamp"] == latest["timestamp"]
+    # The queued render never reached a worker
+    rendered = [os.path.basename(job["cwd"]) for job in fake_rendercv.jobs()]
+    assert rendered == [f"render_{first['timestamp']}", f"render_{latest['timestamp']}"]
+
+def test_failed_render_reports_the_error(editor):
+    render = _saved(editor, CV + "# fail\n")
+    assert _wait(editor, render) == {"error": "RenderCV failed: fake failure"}
+    assert editor.current_render is None
+
+def test_render_events_are_published(editor):
+    events = editor.events.subscribe()
+    _wait(editor, _saved(editor, CV))
+    names = []
+    while not events.empty():
+        names.append(events.get_nowait().split("\n", 1)[0])
+    assert names == ["event: render-started", "event: render-finished"]
+
+def test_current_and_pending_renders_are_protected_from_the_sweeper(editor):
+    _wait(editor, _saved(editor, CV))
+    pending = _saved(editor, CV + "# sleep: 1\n")
+    protected = {os.path.abspath(path) for path in editor.protected_render_dirs()}
+    assert os.path.abspath(editor.current_render["temp_dir"]) in protected
+    assert os.path.abspath(os.path.join(editor.temp_dir, f"render_{pending['timestamp']}")) in protected
+    _wait(editor, pending)
+
+def test_editors_share_the_sweeper_thread(editor):
+    assert editor.sweepers.get_stats()["directories"] == 1
+    editor.close()
+    assert editor.sweepers.get_stats()["directories"] == 0
+
+def test_export_produces_every_output(editor):
+    result = editor.export_render(CV)
+    assert result["success"]
+    names = {entry["name"] for entry in result["files"]}
+    assert {"temp_cv.pdf", "temp_cv.md"} <= names
+    assert os.path.isdir(editor.get_export_dir(result["timestamp"]))
+    assert editor.get_export_dir("../etc") is None
+
+def _sweep_everything(editor):
+    editor.sweeper.max_count = 1
+    editor.sweeper.max_age = 0.01
+    time.sleep(0.05)
+    return editor.sweeper.sweep()["deleted"]
+
+def test_recent_exports_are_protected_from_the_sweeper(editor):
+    result = editor.export_render(CV)
+    assert f"export_{result['timestamp']}" not in _sweep_everything(editor)
+    assert editor.get_export_dir(result["timestamp"])
+    # Once the download window has passed the export is swept like any render
+    editor.export_keep = 0
+    assert f"export_{result['timestamp']}" in _sweep_everything(editor)
+    assert editor.get_export_dir(result["timestamp"]) is None
+
+def test_exports_in_flight_are_protected_from_the_sweeper(editor):
+    outcome = {}
+    thread = threading.Thread(target=lambda: outcome.update(editor.export_render(CV + "# sleep: 1\n")))
+    thread.start()
+    deadline = time.time() + 10
+    while not [name for name in os.listdir(editor.temp_dir) if name.startswith("export_")]:
+        assert time.time() < deadline
+        time.sleep(0.02)
+    editor.export_keep = 0
+    assert not [name for name in _sweep_everything(editor) if name.startswith("export_")]
+    thread.join(10)
+    assert outcome["success"] and editor.get_export_dir(outcome["timestamp"])
+
+def test_export_does_not_wait_for_a_preview_render(editor):
+    preview = _saved(editor, CV + "# sleep: 3\n")
+    started = time.time()
+    assert editor.export_render(CV)["success"]
+    assert time.time() - started < 2.5
+    assert _wait(editor, preview)["success"]
+
+def test_past_renders_stay_servable(editor):
+    first = _saved(editor, CV)
+    _wait(editor, first)
+    second = _saved(editor, CV + "  location: Lisbon\n")
+    _wait(editor, second)
+    assert editor.get_pdf_path(first["timestamp"]) != editor.get_pdf_path(second["timestamp"])
+    assert [render["current"] for render in editor.list_renders()] == [True, False]
+    assert editor.get_pdf_path("20000101_000000_000000") is None
+
+def test_schema_errors_are_reported_instead_of_rendering(editor, fake_rendercv):
+    pytest.importorskip("rendercv.data")
+    result = editor.save_yaml(CV + "  sections:\n    education:\n      - institution: Lisbon\n        start_date: someday\n")
+    assert result["saved"] and "render" not in result
+    assert any(error["field"].endswith("start_date") for error in result["validation_errors"])
+    assert fake_rendercv.jobs() == []
+
+def test_line_delta_saves_rebuild_against_the_current_revision(editor):
+    _wait(editor, _saved(editor, CV))
+    revision, base = editor.current_document()
+    text = CV + "  location: Lisbon\n"
+    patch = [{"start": 2, "delete": 0, "insert": ["  location: Lisbon"]}]
+    assert editor.apply_delta(revision, patch, content_revision(text)) == (text, None)
+    assert editor.apply_delta("stale", patch, content_revision(text))[1] == "Base revision is out of date"
+    assert editor.apply_delta(revision, patch, "bad")[1] == "Checksum mismatch after applying the patch"
+
+IMPORT_CHECK = """
+import threading
+import simple_yaml_editor as app_module
+print(sorted(thread.name for thread in threading.enumerate()))
+print(app_module.render_pool.workers[0].timeout)
+"""
+
+def test_importing_the_app_starts_no_background_threads(tmp_path):
+    root = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=root, RENDER_TIMEOUT="42", OPENAI_API_KEY="")
+    output = subprocess.run([sys.executable, "-c", IMPORT_CHECK], cwd=str(tmp_path), env=env,
+                            capture_output=True, text=True, timeout=60)
+    assert output.returncode == 0, output.stderr
+    threads, timeout = output.stdout.strip().splitlines()[-2:]
+    assert threads == "['MainThread']"
+    assert timeout == "42"
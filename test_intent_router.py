@@ -0,0 +1,96 @@
+"""
+Tests for the local intent router (utils/intent_router.py), run against
+the sample CV in working_CV.yaml.
+"""
+
+import os
+
+import pytest
+
+yaml = pytest.importorskip("yaml")
+
+from utils.intent_router import IntentRouter, normalize_request
+
+CV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "working_CV.yaml")
+
+@pytest.fixture(scope="module")
+def cv():
+    with open(CV_PATH, encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+@pytest.fixture
+def router():
+    return IntentRouter(threshold=0.8)
+
+def test_normalize_request_strips_politeness():
+    assert normalize_request("Could you please set the theme to classic, thanks!") == "set the theme to classic"
+
+@pytest.mark.parametrize("message, intent", [
+    ("set the theme to moderncv", "set_theme"),
+    ("use the sb2nov theme", "set_theme"),
+    ("change the font size to 11pt", "set_font_size"),
+    ("set the page size to letter", "set_page_size"),
+    ("update my location to Sydney, Australia", "set_contact"),
+    ("change my email to jordan@example.org", "set_contact"),
+    ("set my website to https://reyes.example.com", "set_contact"),
+    ("add Kubernetes to the cloud skills", "add_skill"),
+    ("remove Jira from my skills", "remove_skill"),
+    ("rename experience to Work History", "rename_section"),
+    ("move experience above education", "move"),
+    ("move Aether Intelligence to the top", "move"),
+])
+def test_routine_edits_are_handled_locally(router, cv, message, intent):
+    result = router.route(message, cv)
+    assert result is not None
+    assert result["intent"] == intent
+    assert result["handled"], result["explanation"]
+
+def test_the_source_document_is_not_modified(router, cv):
+    before = yaml.safe_dump(cv)
+    router.route("set the theme to moderncv", cv)
+    assert yaml.safe_dump(cv) == before
+
+def test_edits_land_where_expected(router, cv):
+    document = router.route("add Kubernetes to the cloud skills", cv)["document"]
+    cloud = next(entry for entry in document["cv"]["sections"]["skills"] if entry["label"] == "Cloud")
+    assert cloud["details"].endswith(", Kubernetes")
+
+    document = router.route("move experience above education", cv)["document"]
+    keys = list(document["cv"]["sections"])
+    assert keys.index("experience") == keys.index("education") - 1
+
+    document = router.route("rename experience to Work History", cv)["document"]
+    assert "work_history" in document["cv"]["sections"]
+
+@pytest.mark.parametrize("message", [
+    "change name to",
+    "update my location to be in Sydney",
+    "change my name to Jordan and add Docker to my skills",
+    "change the name of my experience section to Work",
+])
+def test_link_words_and_second_clauses_are_not_contact_values(router, cv, message):
+    result = router.route(message, cv)
+    assert result is None or result["intent"] != "set_contact" or not result["handled"]
+
+@pytest.mark.parametrize("message", [
+    "set my name to be honest whatever",
+    "change my email to my work address",
+    "update my website to the new one",
+])
+def test_free_text_contact_values_are_escalated(router, cv, message):
+    result = router.route(message, cv)
+    assert result is not None and result["intent"] == "set_contact"
+    assert not result["handled"]
+
+def test_unknown_skill_group_is_escalated(router, cv):
+    result = router.route("add Kubernetes to the technical skills", cv)
+    assert result["intent"] == "add_skill"
+    assert not result["handled"]
+
+def test_unknown_theme_is_escalated(router, cv):
+    result = router.route("set the theme to fancy", cv)
+    assert result["intent"] == "set_theme" and not result["handled"]
+
+def test_questions_are_not_routed(router, cv):
+    assert router.route("what do you think of my summary?", cv) is None
+    assert router.get_stats()["misses"] == 1
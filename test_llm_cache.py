@@ -0,0 +1,59 @@
+"""
+Tests for the AI reply cache (utils/llm_cache.py).
+"""
+
+import os
+import time
+
+from utils.llm_cache import LLMResponseCache, normalize_message
+
+CV = "cv:\n  name: Jordan Reyes\n"
+
+def test_only_whitespace_is_normalized():
+    assert normalize_message("  Make it\n shorter  ") == "Make it shorter"
+    cache = LLMResponseCache()
+    key = cache.key_for("set my name to John Smith", CV, "gpt", "v1")
+    assert key == cache.key_for("set my name to  John Smith ", CV, "gpt", "v1")
+    assert key != cache.key_for("set my name to john smith", CV, "gpt", "v1")
+    assert key != cache.key_for("set my name to John Smith!", CV, "gpt", "v1")
+
+def test_cv_model_and_prompt_version_are_part_of_the_key():
+    cache = LLMResponseCache()
+    key = cache.key_for("hi", CV, "gpt", "v1")
+    assert key != cache.key_for("hi", CV + "\n", "gpt", "v1")
+    assert key != cache.key_for("hi", CV, "other", "v1")
+    assert key != cache.key_for("hi", CV, "gpt", "v2")
+
+def test_entries_expire_after_the_ttl():
+    cache = LLMResponseCache(ttl=60)
+    cache.put("k", "reply")
+    assert cache.get("k") == "reply"
+    cache._entries["k"] = (time.time() - 120, "reply")
+    assert cache.get("k") is None
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["expired"]) == (1, 1, 1)
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LLMResponseCache(max_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.get("a")
+    cache.put("c", "3")
+    assert cache.get("b") is None and cache.get("a") == "1"
+    assert cache.get_stats()["evictions"] == 1
+
+def test_disk_entries_survive_a_restart(tmp_path):
+    cache_dir = str(tmp_path / "llm")
+    cache = LLMResponseCache(cache_dir=cache_dir)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert LLMResponseCache(cache_dir=cache_dir).get("a") == "1"
+    # Expired and excess entries are dropped while loading
+    assert LLMResponseCache(cache_dir=cache_dir, ttl=0).get("a") is None
+    assert os.listdir(cache_dir) == []
+
+def test_clear_removes_the_files(tmp_path):
+    cache = LLMResponseCache(cache_dir=str(tmp_path))
+    cache.put("a", "1")
+    cache.clear()
+    assert cache.get("a") is None and os.listdir(tmp_path) == []
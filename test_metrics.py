@@ -0,0 +1,48 @@
+"""
+Tests for the Prometheus metrics registry (utils/metrics.py).
+"""
+
+from utils.metrics import MetricsRegistry
+
+def test_metrics_render_in_the_exposition_format():
+    registry = MetricsRegistry()
+    registry.counter("saves_total", "Saves", ["outcome"]).inc(outcome="ok")
+    registry.histogram("render_seconds", "Renders", buckets=(0.1, 1)).observe(0.5)
+    registry.gauge("queue_depth", "Queued renders", lambda: 3)
+    assert registry.render().splitlines() == [
+        "# HELP saves_total Saves",
+        "# TYPE saves_total counter",
+        'saves_total{outcome="ok"} 1',
+        "# HELP render_seconds Renders",
+        "# TYPE render_seconds histogram",
+        'render_seconds_bucket{le="0.1"} 0',
+        'render_seconds_bucket{le="1"} 1',
+        'render_seconds_bucket{le="+Inf"} 1',
+        "render_seconds_sum 0.5",
+        "render_seconds_count 1",
+        "# HELP queue_depth Queued renders",
+        "# TYPE queue_depth gauge",
+        "queue_depth 3",
+    ]
+
+def test_registering_a_name_twice_shares_the_series():
+    registry = MetricsRegistry()
+    registry.counter("saves_total", "Saves", ["outcome"]).inc(outcome="ok")
+    registry.counter("saves_total", "Saves", ["outcome"]).inc(outcome="ok")
+    assert registry.get("saves_total").value(outcome="ok") == 2
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.counter("errors_total", "Errors", ["reason"]).inc(reason='bad "quote"\n')
+    assert 'errors_total{reason="bad \\"quote\\"\\n"} 1' in registry.render()
+
+def test_histogram_times_a_block():
+    histogram = MetricsRegistry().histogram("stage_seconds", "Stages", ["stage"])
+    with histogram.time(stage="save"):
+        pass
+    assert histogram.count(stage="save") == 1 and histogram.count(stage="render") == 0
+
+def test_failing_gauge_is_left_out():
+    registry = MetricsRegistry()
+    registry.gauge("broken", "Broken", lambda: 1 / 0)
+    assert registry.render().splitlines() == ["# HELP broken Broken", "# TYPE broken gauge"]
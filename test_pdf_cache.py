@@ -0,0 +1,40 @@
+"""
+Tests for the in-memory PDF bytes cache (utils/pdf_cache.py).
+"""
+
+import os
+
+import pytest
+
+from utils.pdf_cache import PDFBytesCache
+
+def test_repeated_loads_are_served_from_memory(tmp_path):
+    path = tmp_path / "cv.pdf"
+    path.write_bytes(b"%PDF-1")
+    cache = PDFBytesCache()
+    data, etag = cache.load(str(path))
+    assert cache.load(str(path)) == (data, etag) == (b"%PDF-1", etag)
+    assert (cache.get_stats()["hits"], cache.get_stats()["misses"]) == (1, 1)
+
+def test_rewritten_file_gets_a_new_etag(tmp_path):
+    path = tmp_path / "cv.pdf"
+    path.write_bytes(b"%PDF-1")
+    cache = PDFBytesCache()
+    _, etag = cache.load(str(path))
+    path.write_bytes(b"%PDF-22")
+    os.utime(path, ns=(0, 10**9))
+    assert cache.load(str(path))[1] != etag
+
+def test_memory_budget_is_enforced(tmp_path):
+    cache = PDFBytesCache(max_bytes=10)
+    for name in ("a", "b", "c"):
+        (tmp_path / name).write_bytes(b"%" * 4)
+        cache.load(str(tmp_path / name))
+    (tmp_path / "big").write_bytes(b"%" * 11)
+    cache.load(str(tmp_path / "big"))
+    assert cache.get_stats()["bytes"] <= 10
+    assert cache.get_stats()["entries"] == 2
+
+def test_missing_file_raises(tmp_path):
+    with pytest.raises(OSError):
+        PDFBytesCache().load(str(tmp_path / "missing.pdf"))
@@ -0,0 +1,68 @@
+"""
+Tests for write-behind persistence of the working CV (utils/persistence.py).
+"""
+
+import os
+
+import pytest
+
+from utils import persistence
+from utils.persistence import WriteBehindFile, atomic_write
+
+@pytest.fixture(autouse=True)
+def _no_flush_at_exit(monkeypatch):
+    # Files left pending by these tests must not be written after tmp_path is gone
+    monkeypatch.setattr(persistence, "_open_files", persistence.weakref.WeakSet())
+
+def test_atomic_write_leaves_no_temp_file(tmp_path):
+    path = tmp_path / "cv.yaml"
+    atomic_write(str(path), "cv: {}\n")
+    assert path.read_text() == "cv: {}\n"
+    assert os.listdir(tmp_path) == ["cv.yaml"]
+
+def test_writes_are_deferred_and_coalesced(tmp_path):
+    path = tmp_path / "cv.yaml"
+    cv_file = WriteBehindFile(str(path), delay=60)
+    assert cv_file.write("a: 1\n") and cv_file.write("a: 2\n")
+    assert not path.exists() and cv_file.pending
+    assert cv_file.read() == "a: 2\n"
+    cv_file.flush()
+    assert path.read_text() == "a: 2\n"
+    stats = cv_file.get_stats()
+    assert (stats["writes"], stats["coalesced"], stats["pending"]) == (1, 1, False)
+
+def test_unchanged_content_is_not_rewritten(tmp_path):
+    path = tmp_path / "cv.yaml"
+    path.write_text("a: 1\n")
+    cv_file = WriteBehindFile(str(path), delay=60)
+    assert not cv_file.write("a: 1\n")
+    assert not cv_file.pending and cv_file.get_stats()["unchanged_skipped"] == 1
+
+def test_timer_flushes_in_the_background(tmp_path):
+    path = tmp_path / "cv.yaml"
+    cv_file = WriteBehindFile(str(path), delay=0.01)
+    cv_file.write("a: 1\n")
+    cv_file._timer.join(5)
+    assert path.read_text() == "a: 1\n"
+
+def test_failed_write_is_kept_and_retried_with_backoff(tmp_path, monkeypatch):
+    path = tmp_path / "cv.yaml"
+    cv_file = WriteBehindFile(str(path), delay=60, max_retry_delay=200)
+
+    def broken_write(path, content):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(persistence, "atomic_write", broken_write)
+    cv_file.write("a: 1\n")
+    cv_file.flush()
+    cv_file.flush()
+    assert cv_file.pending and cv_file.read() == "a: 1\n"
+    assert cv_file.get_stats()["errors"] == 2
+    assert cv_file._retry_delay == 200  # 60, then 120, capped at 200
+    # The same content is accepted again rather than skipped as unchanged
+    assert cv_file.write("a: 1\n")
+
+    monkeypatch.setattr(persistence, "atomic_write", atomic_write)
+    cv_file.flush()
+    assert path.read_text() == "a: 1\n"
+    assert cv_file._retry_delay == 60
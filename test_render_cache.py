@@ -0,0 +1,59 @@
+"""
+Tests for the content-addressed PDF cache (utils/render_cache.py).
+"""
+
+import os
+
+from utils.render_cache import RenderCache, make_cache_key, normalize_yaml
+
+def _pdf(tmp_path, name, size=10):
+    path = tmp_path / name
+    path.write_bytes(b"%" * size)
+    return str(path)
+
+def test_cosmetic_differences_share_a_key():
+    assert normalize_yaml("a: 1  \r\nb: 2\r\n\r\n") == "a: 1\nb: 2"
+    assert make_cache_key("a: 1\n", "2.3") == make_cache_key("a: 1   \n\n", "2.3")
+    assert make_cache_key("a: 1\n", "2.3") != make_cache_key("a: 2\n", "2.3")
+
+def test_rendercv_version_is_part_of_the_key():
+    assert make_cache_key("a: 1\n", "2.2") != make_cache_key("a: 1\n", "2.3")
+
+def test_put_then_get_returns_a_copy_in_the_cache(tmp_path):
+    cache = RenderCache(cache_dir=str(tmp_path / "cache"))
+    key = cache.key_for("cv: {}\n")
+    assert cache.get(key) is None
+    cached = cache.put(key, _pdf(tmp_path, "out.pdf"))
+    os.remove(tmp_path / "out.pdf")  # the render directory may be swept later
+    assert cache.get(key) == cached and os.path.exists(cached)
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = RenderCache(cache_dir=str(tmp_path / "cache"), max_entries=2)
+    for name in ("a", "b"):
+        cache.put(name, _pdf(tmp_path, f"{name}.pdf"))
+    cache.get("a")
+    cache.put("c", _pdf(tmp_path, "c.pdf"))
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c")
+    assert cache.get_stats()["evictions"] == 1
+
+def test_byte_budget_is_enforced(tmp_path):
+    cache = RenderCache(cache_dir=str(tmp_path / "cache"), max_bytes=25)
+    cache.put("a", _pdf(tmp_path, "a.pdf", size=10))
+    cache.put("b", _pdf(tmp_path, "b.pdf", size=10))
+    cache.put("c", _pdf(tmp_path, "c.pdf", size=10))
+    assert cache.get_stats()["bytes"] <= 25
+    assert cache.get("a") is None
+
+def test_entries_survive_a_restart(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    RenderCache(cache_dir=cache_dir).put("a", _pdf(tmp_path, "a.pdf"))
+    assert RenderCache(cache_dir=cache_dir).get("a") is not None
+
+def test_failed_copy_is_not_cached(tmp_path):
+    cache = RenderCache(cache_dir=str(tmp_path / "cache"))
+    assert cache.put("a", str(tmp_path / "missing.pdf")) is None
+    assert cache.get("a") is None
+    assert not [name for name in os.listdir(cache.cache_dir) if name.endswith(".tmp")]
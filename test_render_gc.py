@@ -0,0 +1,77 @@
+"""
+Tests for the temp_renders garbage collector (utils/render_gc.py).
+"""
+
+import os
+import time
+
+from utils.render_gc import RenderSweeper, SweeperGroup
+
+def _render(temp_dir, name, age=0, size=10):
+    path = temp_dir / name
+    path.mkdir(parents=True)
+    (path / "temp_cv.pdf").write_bytes(b"%" * size)
+    stamp = time.time() - age
+    os.utime(path, (stamp, stamp))
+    return str(path)
+
+def _names(temp_dir):
+    return sorted(os.listdir(temp_dir))
+
+def test_renders_older_than_max_age_are_deleted(tmp_path):
+    _render(tmp_path, "render_old", age=120)
+    _render(tmp_path, "render_new")
+    sweeper = RenderSweeper(str(tmp_path), max_age=60, max_count=0, max_bytes=0)
+    assert sweeper.sweep()["deleted"] == ["render_old"]
+    assert _names(tmp_path) == ["render_new"]
+
+def test_count_and_byte_budgets_keep_the_newest_renders(tmp_path):
+    for index in range(4):
+        _render(tmp_path, f"render_{index}", age=40 - index * 10)
+    RenderSweeper(str(tmp_path), max_age=0, max_count=2, max_bytes=0).sweep()
+    assert _names(tmp_path) == ["render_2", "render_3"]
+    sweeper = RenderSweeper(str(tmp_path), max_age=0, max_count=0, max_bytes=15)
+    sweeper.sweep()
+    assert _names(tmp_path) == ["render_3"]
+    assert sweeper.get_stats()["freed_bytes"] == 10
+
+def test_protected_renders_are_never_deleted(tmp_path):
+    current = _render(tmp_path, "render_current", age=3600)
+    pending = _render(tmp_path, "render_pending", age=3600)
+    _render(tmp_path, "render_stale", age=3600)
+    sweeper = RenderSweeper(str(tmp_path), max_age=60, max_count=1,
+                            protected=lambda: [current, pending, None])
+    sweeper.sweep()
+    assert _names(tmp_path) == ["render_current", "render_pending"]
+
+def test_only_directories_with_the_prefix_are_swept(tmp_path):
+    _render(tmp_path, "render_old", age=3600)
+    _render(tmp_path, "export_old", age=3600)
+    _render(tmp_path, "history", age=3600)
+    (tmp_path / "render_file").write_text("not a directory")
+    os.utime(tmp_path / "render_file", (0, 0))
+    RenderSweeper(str(tmp_path), max_age=60, prefix=("render_", "export_")).sweep()
+    assert _names(tmp_path) == ["history", "render_file"]
+
+def test_missing_temp_dir_is_not_an_error(tmp_path):
+    assert RenderSweeper(str(tmp_path / "missing")).sweep()["deleted"] == []
+
+def test_group_sweeps_every_directory_on_one_thread(tmp_path):
+    sweepers = [RenderSweeper(str(tmp_path / name), max_age=60) for name in ("a", "b")]
+    for sweeper in sweepers:
+        _render(tmp_path / sweeper.temp_dir, "render_old", age=3600)
+    group = SweeperGroup(interval=0.05)
+    for sweeper in sweepers:
+        group.add(sweeper)
+    group.add(sweepers[0])
+    assert group.get_stats()["directories"] == 2
+    group.start()
+    try:
+        deadline = time.time() + 5
+        while any(os.listdir(sweeper.temp_dir) for sweeper in sweepers):
+            assert time.time() < deadline
+            time.sleep(0.02)
+    finally:
+        group.stop()
+    group.remove(sweepers[1])
+    assert group.get_stats()["directories"] == 1
@@ -0,0 +1,44 @@
+"""
+Tests for the persistent render history (utils/render_history.py).
+"""
+
+import json
+
+from utils.render_history import RenderHistory
+
+def _pdf(tmp_path, name):
+    path = tmp_path / name
+    path.write_bytes(b"%PDF")
+    return str(path)
+
+def test_records_survive_a_restart(tmp_path):
+    index = str(tmp_path / "render_index.json")
+    history = RenderHistory(index)
+    history.add("1", _pdf(tmp_path, "1.pdf"), duration=0.25)
+    history.add("2", _pdf(tmp_path, "2.pdf"), cached=True)
+    restored = RenderHistory(index)
+    assert [record["id"] for record in restored.list()] == ["2", "1"]
+    assert restored.get("1")["duration_ms"] == 250.0
+    assert restored.get("2")["cached"]
+
+def test_history_is_bounded(tmp_path):
+    history = RenderHistory(str(tmp_path / "index.json"), max_entries=2)
+    for render_id in "123":
+        history.add(render_id, _pdf(tmp_path, f"{render_id}.pdf"))
+    assert history.get("1") is None
+    assert [record["id"] for record in history.list(limit=1)] == ["3"]
+    assert len(history) == 2
+
+def test_swept_renders_are_forgotten(tmp_path):
+    index = tmp_path / "index.json"
+    history = RenderHistory(str(index))
+    history.add("1", _pdf(tmp_path, "1.pdf"))
+    history.add("2", _pdf(tmp_path, "2.pdf"))
+    (tmp_path / "1.pdf").unlink()
+    assert history.get("1") is None
+    assert [record["id"] for record in json.loads(index.read_text())] == ["2"]
+
+def test_corrupt_index_starts_empty(tmp_path):
+    index = tmp_path / "index.json"
+    index.write_text("{not json")
+    assert len(RenderHistory(str(index))) == 0
@@ -0,0 +1,95 @@
+"""
+Tests for the shared render pool (utils/render_pool.py). The pool's workers
+are stand-ins: jobs are plain functions, so only scheduling is exercised.
+"""
+
+import threading
+import time
+
+import pytest
+
+from utils.render_pool import RenderPool
+
+class IdleWorker:
+    """Stands in for a RenderWorker; the pool only starts, stops and reports it."""
+
+    def __init__(self):
+        self.started = self.stopped = False
+
+    def start(self):
+        self.started = True
+        return True
+
+    def stop(self):
+        self.stopped = True
+
+    def get_stats(self):
+        return {"alive": self.started and not self.stopped}
+
+@pytest.fixture
+def pool():
+    pool = RenderPool(size=1, worker_factory=IdleWorker)
+    yield pool
+    pool.shutdown()
+
+def _blocked(pool, session_id="blocker"):
+    """Occupy the pool's only thread until the returned event is set."""
+    release = threading.Event()
+    future = pool.submit(session_id, release.wait, 10)
+    deadline = time.time() + 5
+    while not future.running():
+        assert time.time() < deadline
+        time.sleep(0.01)
+    return release, future
+
+def test_jobs_run_on_a_pool_thread_that_owns_a_worker(pool):
+    assert pool.submit("a", lambda: pool.current_worker()).result(5) is pool.workers[0]
+    assert pool.workers[0].started
+    assert pool.current_worker() is None
+
+def test_a_deferred_pool_starts_with_its_first_job():
+    pool = RenderPool(size=2, worker_factory=IdleWorker, start=False)
+    try:
+        assert not any(worker.started for worker in pool.workers)
+        assert pool.submit("a", lambda: "done").result(5) == "done"
+        deadline = time.time() + 5
+        while not all(worker.started for worker in pool.workers):
+            assert time.time() < deadline
+            time.sleep(0.01)
+    finally:
+        pool.shutdown()
+
+def test_sessions_are_served_round_robin(pool):
+    release, _ = _blocked(pool)
+    order = []
+    futures = [pool.submit(session_id, order.append, f"{session_id}{index}")
+               for session_id in ("a", "b") for index in range(3)]
+    release.set()
+    for future in futures:
+        future.result(5)
+    assert order == ["a0", "b0", "a1", "b1", "a2", "b2"]
+
+def test_errors_are_returned_through_the_future(pool):
+    with pytest.raises(ZeroDivisionError):
+        pool.submit("a", lambda: 1 / 0).result(5)
+    assert pool.submit("a", lambda: "still serving").result(5) == "still serving"
+
+def test_cancelled_queued_jobs_never_run(pool):
+    release, _ = _blocked(pool)
+    ran = []
+    future = pool.submit("a", ran.append, "cancelled")
+    assert future.cancel()
+    release.set()
+    pool.submit("a", ran.append, "next").result(5)
+    assert ran == ["next"]
+
+def test_shutdown_cancels_queued_jobs_and_stops_workers():
+    pool = RenderPool(size=1, worker_factory=IdleWorker)
+    release, running = _blocked(pool)
+    queued = pool.submit("a", lambda: None)
+    pool.shutdown()
+    release.set()
+    assert queued.cancelled() and running.result(5)
+    assert pool.workers[0].stopped
+    with pytest.raises(RuntimeError):
+        pool.submit("a", lambda: None)
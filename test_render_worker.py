@@ -0,0 +1,131 @@
+"""
+Tests for the resident RenderCV worker client (utils/render_worker.py).
+"""
+
+import subprocess
+import threading
+import time
+
+import pytest
+
+from utils.render_worker import RenderCancelled, RenderWorker
+
+ARGS = ["render", "cv.yaml", "--dont-generate-markdown"]
+
+def _write_cv(directory, text="cv:\n  name: Test\n"):
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / "cv.yaml").write_text(text, encoding="utf-8")
+    return str(directory)
+
+def test_jobs_share_one_resident_process(tmp_path, fake_rendercv):
+    worker = RenderWorker(timeout=10)
+    try:
+        for index in range(3):
+            result = worker.run(ARGS, cwd=_write_cv(tmp_path / f"job{index}"))
+            assert result["returncode"] == 0
+            assert result["worker"] == "resident"
+        assert len({job["pid"] for job in fake_rendercv.jobs()}) == 1
+        assert (tmp_path / "job2" / "rendercv_output" / "cv.pdf").exists()
+        assert worker.get_stats()["jobs"] == 3
+    finally:
+        worker.stop()
+
+def test_failed_render_reports_the_worker_output(tmp_path, fake_rendercv):
+    worker = RenderWorker(timeout=10)
+    try:
+        result = worker.run(ARGS, cwd=_write_cv(tmp_path / "job", "# fail\n"))
+        assert result["returncode"] == 1
+        assert result["stderr"] == "fake failure"
+        assert worker.is_alive()
+    finally:
+        worker.stop()
+
+def test_crash_falls_back_to_a_subprocess_and_restarts(tmp_path, fake_rendercv):
+    worker = RenderWorker(timeout=10)
+    try:
+        result = worker.run(ARGS, cwd=_write_cv(tmp_path / "crash", "# crash\n"))
+        # The crashing job is retried once outside the worker, where it crashes again
+        assert result["worker"] == "subprocess"
+        assert worker.get_stats()["crashes"] == 1
+        result = worker.run(ARGS, cwd=_write_cv(tmp_path / "after"))
+        assert result["worker"] == "resident" and result["returncode"] == 0
+        crashed, _, restarted = fake_rendercv.jobs()
+        assert restarted["pid"] != crashed["pid"]
+    finally:
+        worker.stop()
+
+def test_stuck_render_times_out_and_gets_a_fresh_worker(tmp_path, fake_rendercv):
+    worker = RenderWorker(timeout=10)
+    try:
+        with pytest.raises(subprocess.TimeoutExpired):
+            worker.run(ARGS, cwd=_write_cv(tmp_path / "slow", "# sleep: 5\n"), timeout=0.5)
+        assert not worker.is_alive()
+        assert worker.run(ARGS, cwd=_write_cv(tmp_path / "next"))["returncode"] == 0
+    finally:
+        worker.stop()
+
+def test_worker_that_cannot_start_uses_the_subprocess(tmp_path, fake_rendercv, monkeypatch):
+    monkeypatch.setenv("FAKE_WORKER_BROKEN", "1")
+    worker = RenderWorker(timeout=10, max_start_failures=2)
+    for index in range(3):
+        result = worker.run(ARGS, cwd=_write_cv(tmp_path / f"job{index}"))
+        assert result["worker"] == "subprocess" and result["returncode"] == 0
+    # After max_start_failures the worker is no longer tried
+    assert worker.get_stats()["fallbacks"] == 3
+    assert worker._start_failures == 2
+
+def test_disabled_worker_always_uses_the_subprocess(tmp_path, fake_rendercv):
+    worker = RenderWorker(timeout=10, enabled=False)
+    assert not worker.start()
+    assert worker.run(ARGS, cwd=_write_cv(tmp_path / "job"))["worker"] == "subprocess"
+
+def test_cancel_without_a_render_in_flight_does_nothing():
+    assert RenderWorker(enabled=False).cancel() is False
+
+def _run_in_background(worker, cwd):
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = worker.run(ARGS, cwd=cwd)
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    return thread, outcome
+
+def _wait_for_job(fake_rendercv, count):
+    deadline = time.time() + 10
+    while len(fake_rendercv.jobs()) < count:
+        assert time.time() < deadline, "the fake worker never received the job"
+        time.sleep(0.02)
+
+def test_cancel_discards_the_resident_render_and_keeps_the_worker(tmp_path, fake_rendercv):
+    worker = RenderWorker(timeout=30)
+    try:
+        assert worker.start()
+        pid = worker.get_stats()["pid"]
+        thread, outcome = _run_in_background(worker, _write_cv(tmp_path / "slow", "# sleep: 1\n"))
+        _wait_for_job(fake_rendercv, 1)
+        assert worker.cancel()
+        assert worker.is_alive()
+        thread.join(10)
+        # The job ran to completion, but its result is discarded
+        assert isinstance(outcome.get("error"), RenderCancelled)
+        assert (tmp_path / "slow" / "rendercv_output" / "cv.pdf").exists()
+        assert worker.get_stats()["cancellations"] == 1
+        # The same warm process serves the next render
+        assert worker.run(ARGS, cwd=_write_cv(tmp_path / "next"))["returncode"] == 0
+        assert [job["pid"] for job in fake_rendercv.jobs()] == [pid, pid]
+        assert worker.get_stats()["restarts"] == 0
+    finally:
+        worker.stop()
+
+def test_cancel_kills_a_fallback_subprocess(tmp_path, fake_rendercv):
+    worker = RenderWorker(timeout=30, enabled=False)
+    thread, outcome = _run_in_background(worker, _write_cv(tmp_path / "slow", "# sleep: 5\n"))
+    _wait_for_job(fake_rendercv, 1)
+    assert worker.cancel()
+    thread.join(10)
+    assert isinstance(outcome.get("error"), RenderCancelled)
@@ -0,0 +1,59 @@
+"""
+Tests for RenderCV schema validation (utils/schema_validation.py).
+"""
+
+import pytest
+
+from utils.schema_validation import SchemaValidator
+
+CV = "cv:\n  name: Jordan Reyes\n"
+BAD_DATE = CV + "  sections:\n    education:\n      - institution: Lisbon\n        area: Physics\n        start_date: someday\n"
+
+@pytest.fixture(scope="module")
+def validator():
+    pytest.importorskip("rendercv.data")
+    return SchemaValidator()
+
+def test_valid_cv_has_no_errors(validator):
+    assert validator.validate(CV) == []
+
+def test_errors_point_at_the_field_and_line(validator):
+    errors = validator.validate(BAD_DATE)
+    error = next(error for error in errors if error["field"].endswith("start_date"))
+    assert error["field"] == "cv.sections.education.0.start_date"
+    assert error["input"] == "someday"
+    assert error["line"] == 7
+    assert "not a valid date" in error["message"]
+
+def test_custom_errors_read_as_a_message_not_a_tuple(validator):
+    error = validator.validate(CV + "design:\n  theme: missingtheme\n")[0]
+    assert error["field"] == "design"
+    assert error["message"].startswith("The custom theme folder")
+    assert error["input"] == "missingtheme"
+    assert error["line"] == 3
+
+def test_plain_custom_exceptions_are_unpacked():
+    validator = SchemaValidator()
+    validator._load_rendercv = lambda: True
+    validator._validation_error = KeyError
+
+    def validate(data):
+        raise ValueError(("Unknown font!",), "font", "Comic Sans")
+
+    validator._validate = validate
+    assert validator.validate(CV) == [{"field": "font", "message": "Unknown font!", "input": "Comic Sans",
+                                       "line": None, "column": None}]
+
+def test_document_that_is_not_a_mapping_is_rejected(validator):
+    assert validator.validate("- just a list\n")[0]["message"] == "The CV must be a mapping with a `cv` key"
+
+def test_results_are_cached_per_content(validator):
+    hits = validator.get_stats()["hits"]
+    validator.validate(BAD_DATE)
+    validator.validate(BAD_DATE)
+    assert validator.get_stats()["hits"] >= hits + 1
+
+def test_disabled_validator_accepts_everything():
+    validator = SchemaValidator(enabled=False)
+    assert validator.validate("- just a list\n") == []
+    assert validator.get_stats()["misses"] == 0
@@ -0,0 +1,48 @@
+"""
+Tests for line-delta saves (utils/text_delta.py).
+"""
+
+import pytest
+
+from utils.text_delta import apply_line_patch, content_revision, line_patch
+
+BASE = "cv:\n  name: Jordan Reyes\n  location: Lisbon\n"
+
+def test_hunks_replace_insert_and_delete_lines():
+    assert apply_line_patch(BASE, []) == BASE
+    assert apply_line_patch(BASE, [{"start": 2, "delete": 1, "insert": ["  location: Porto"]}]) == \
+        BASE.replace("Lisbon", "Porto")
+    assert apply_line_patch(BASE, [{"start": 0, "insert": ["design:", "  theme: classic"]},
+                                   {"start": 1, "delete": 1}]) == "design:\n  theme: classic\ncv:\n  location: Lisbon\n"
+    assert apply_line_patch(BASE, [{"start": 3, "delete": 1, "insert": []}]) == BASE.rstrip("\n")
+
+@pytest.mark.parametrize("text", [
+    BASE,
+    BASE.replace("Lisbon", "Porto"),
+    BASE + "  phone: '+351 555 0100'\n",
+    "design:\n  theme: classic\n" + BASE,
+    "",
+    BASE.rstrip("\n"),
+])
+def test_line_patch_round_trips(text):
+    assert apply_line_patch(BASE, line_patch(BASE, text)) == text
+
+def test_patch_only_carries_changed_lines():
+    assert line_patch(BASE, BASE.replace("Lisbon", "Porto")) == [
+        {"start": 2, "delete": 1, "insert": ["  location: Porto"]}]
+
+@pytest.mark.parametrize("hunks", [
+    {"start": 0},
+    ["not a hunk"],
+    [{"start": 1, "delete": 0, "insert": []}, {"start": 0, "delete": 0, "insert": []}],
+    [{"start": 3, "delete": 5, "insert": []}],
+    [{"start": 0, "delete": -1, "insert": []}],
+    [{"start": 0, "delete": 0, "insert": [1]}],
+])
+def test_malformed_patches_are_rejected(hunks):
+    with pytest.raises(ValueError):
+        apply_line_patch(BASE, hunks)
+
+def test_revision_is_the_content_hash():
+    assert content_revision(BASE) == content_revision(str(BASE))
+    assert content_revision(BASE) != content_revision(BASE + "\n")
@@ -0,0 +1,86 @@
+"""
+Tests for the structural YAML diff (utils/tree_diff.py).
+"""
+
+import pytest
+
+yaml = pytest.importorskip("yaml")
+
+from utils.tree_diff import diff_documents, diff_trees, line_ranges, same_tree
+
+CV = """cv:
+  name: Jordan Reyes
+  sections:
+    experience:
+      - company: Aether Intelligence
+        position: Data Analyst
+        highlights:
+          - Built dashboards
+      - company: MarketHub Retail
+        position: Logistics Support Associate
+    skills:
+      - label: Languages
+        details: Python, SQL
+"""
+
+def _load(text):
+    return yaml.safe_load(text)
+
+def test_identical_documents_have_no_changes():
+    assert diff_trees(_load(CV), _load(CV)) == []
+    assert diff_documents(CV, CV) == []
+
+def test_scalar_change_is_a_single_replace():
+    changes = diff_trees(_load(CV), _load(CV.replace("Data Analyst", "Senior Data Analyst")))
+    assert changes == [{"op": "replace", "old_path": ("cv", "sections", "experience", 0, "position"),
+                        "new_path": ("cv", "sections", "experience", 0, "position")}]
+
+def test_list_entries_are_matched_by_identity():
+    old = _load(CV)
+    new = _load(CV)
+    new["cv"]["sections"]["experience"].reverse()
+    new["cv"]["sections"]["experience"][1]["position"] = "Lead Analyst"
+    changes = diff_trees(old, new)
+    # The reordered entry is moved, not rewritten field by field
+    assert {change["op"] for change in changes} <= {"add", "remove", "replace"}
+    assert not any(change["op"] == "replace" and change["old_path"][-1] == "company" for change in changes)
+
+def test_key_order_matters():
+    assert same_tree({"a": 1, "b": 2}, {"a": 1, "b": 2})
+    assert not same_tree({"a": 1, "b": 2}, {"b": 2, "a": 1})
+    assert not same_tree({"a": 1}, {"a": 1.0})
+
+def test_moved_key_is_removed_and_added_before_its_new_neighbour():
+    old = {"a": 1, "b": 2, "c": 3}
+    new = {"c": 3, "a": 1, "b": 2}
+    changes = diff_trees(old, new)
+    assert {"op": "remove", "old_path": ("c",), "new_path": None} in changes
+    assert {"op": "add", "old_path": None, "new_path": ("c",), "anchor": (("a",), "before")} in changes
+
+def test_appended_list_item_is_anchored_after_the_list():
+    old = {"items": [1, 2]}
+    new = {"items": [1, 2, 3]}
+    assert diff_trees(old, new) == [{"op": "add", "old_path": None, "new_path": ("items", 2),
+                                     "anchor": (("items",), "after")}]
+
+def test_line_ranges_start_at_keys():
+    ranges = line_ranges(CV)
+    assert ranges[("cv", "name")] == (1, 1)
+    assert ranges[("cv", "sections", "experience", "0")] == (4, 7)
+    assert ranges[("cv", "sections", "skills")] == (10, 12)
+
+def test_hunks_address_only_the_changed_lines():
+    new_text = CV.replace("Python, SQL", "Python, SQL, Go")
+    assert diff_documents(CV, new_text) == [{
+        "op": "replace", "path": "/cv/sections/skills/0/details", "start": 12, "delete": 1,
+        "insert": ["        details: Python, SQL, Go"]}]
+
+def test_added_entry_is_inserted_at_its_anchor():
+    new_text = CV.replace("    skills:\n", "    skills:\n      - label: Tools\n        details: Docker\n")
+    hunks = diff_documents(CV, new_text)
+    assert [(hunk["op"], hunk["start"], hunk["delete"]) for hunk in hunks] == [("add", 11, 0)]
+    assert hunks[0]["insert"] == ["      - label: Tools", "        details: Docker"]
+
+def test_unparseable_text_falls_back_to_a_line_diff():
+    hunks = diff_documents(CV, CV + "  bad: [unclosed\n")
+    assert hunks and all(hunk["op"] == "lines" for hunk in hunks)
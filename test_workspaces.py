@@ -0,0 +1,113 @@
+"""
+Tests for per-session workspaces (utils/workspaces.py).
+"""
+
+import threading
+import time
+
+from utils.workspaces import (DEFAULT_SESSION, Workspace, WorkspaceManager,
+                              is_valid_session_id, new_session_id)
+
+class FakeEditor:
+    def __init__(self):
+        self.rendering = False
+        self.closed = False
+
+    def busy(self):
+        return self.rendering
+
+    def close(self):
+        self.closed = True
+
+class Factory:
+    """Build workspaces with fake editors and record every session it built."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.built = []
+        self.workspaces = []
+
+    def __call__(self, session_id):
+        time.sleep(self.delay)
+        self.built.append(session_id)
+        workspace = Workspace(session_id, FakeEditor(), chat_manager=None)
+        self.workspaces.append(workspace)
+        return workspace
+
+def test_session_ids_are_validated():
+    assert is_valid_session_id(new_session_id())
+    assert is_valid_session_id(DEFAULT_SESSION)
+    for bad in (None, "", "../etc", "A" * 32, new_session_id() + "0"):
+        assert not is_valid_session_id(bad)
+
+def test_workspaces_are_created_once_per_session():
+    factory = Factory()
+    manager = WorkspaceManager(factory)
+    first = manager.get("a")
+    assert manager.get("a") is first
+    assert manager.get("b") is not first
+    assert factory.built == ["a", "b"]
+    assert len(manager) == 2
+
+def test_least_recently_used_idle_workspace_is_evicted():
+    manager = WorkspaceManager(Factory(), max_sessions=2)
+    a, b = manager.get("a"), manager.get("b")
+    manager.get("a")
+    manager.get("c")
+    assert b.editor.closed and not a.editor.closed
+    assert [workspace.session_id for workspace in manager.snapshot()] == ["a", "c"]
+    assert manager.get_stats()["evictions"] == 1
+
+def test_busy_workspaces_are_not_evicted():
+    manager = WorkspaceManager(Factory(), max_sessions=1)
+    a = manager.get("a")
+    a.editor.rendering = True
+    manager.get("b")
+    assert not a.editor.closed and len(manager) == 2
+    assert manager.get_stats()["deferred_evictions"] == 1
+    a.editor.rendering = False
+    manager.get("b")
+    assert a.editor.closed and len(manager) == 1
+
+def test_evicted_session_is_rebuilt_when_it_returns():
+    factory = Factory()
+    manager = WorkspaceManager(factory, max_sessions=1)
+    manager.get("a")
+    manager.get("b")
+    manager.get("a")
+    assert factory.built == ["a", "b", "a"]
+
+def _get_concurrently(manager, session_ids):
+    results = []
+    threads = [threading.Thread(target=lambda sid=sid: results.append(manager.get(sid)))
+               for sid in session_ids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def test_concurrent_first_requests_share_one_workspace():
+    factory = Factory(delay=0.05)
+    manager = WorkspaceManager(factory)
+    results = _get_concurrently(manager, ["a"] * 8)
+    kept = results[0]
+    assert all(workspace is kept for workspace in results)
+    # Builds that lost the race are closed, never handed out
+    losers = [workspace for workspace in factory.workspaces if workspace is not kept]
+    assert all(workspace.editor.closed for workspace in losers) and not kept.editor.closed
+    assert manager.get_stats()["discarded_builds"] == len(losers)
+    assert len(manager) == 1
+
+def test_a_slow_build_does_not_block_other_sessions():
+    factory = Factory()
+    manager = WorkspaceManager(factory)
+    manager.get("a")
+    factory.delay = 0.5
+    slow = threading.Thread(target=manager.get, args=("b",))
+    slow.start()
+    time.sleep(0.05)
+    started = time.perf_counter()
+    manager.get("a")
+    assert time.perf_counter() - started < 0.2
+    slow.join()
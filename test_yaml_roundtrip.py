@@ -0,0 +1,113 @@
+"""
+Tests for format-preserving YAML edits (utils/yaml_roundtrip.py): every
+byte outside the edited nodes must survive.
+"""
+
+import copy
+import difflib
+import os
+
+import pytest
+
+yaml = pytest.importorskip("yaml")
+
+from utils.yaml_roundtrip import update_text
+
+CV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "working_CV.yaml")
+
+TEXT = """# My CV
+cv:
+  name: "Jordan Reyes"   # quoted on purpose
+  email: jordan@example.com
+  sections:
+    experience:
+      - company: Aether Intelligence
+        position: Data Analyst
+
+      - company: MarketHub Retail
+        position: 'Logistics Support Associate'
+
+    skills:
+      - label: Languages
+        details: Python, SQL
+design:
+  theme: classic
+"""
+
+@pytest.fixture(scope="module")
+def cv_text():
+    with open(CV_PATH, encoding="utf-8") as f:
+        return f.read()
+
+def _changed_lines(before, after):
+    return [line for line in difflib.unified_diff(before.splitlines(), after.splitlines(), lineterm="", n=0)
+            if line[:1] in "+-" and line[:3] not in ("---", "+++")]
+
+def _edit(text, change):
+    document = yaml.safe_load(text)
+    change(document)
+    updated = update_text(text, document)
+    assert yaml.safe_load(updated) == document
+    return updated
+
+def test_unchanged_document_is_returned_as_is():
+    assert update_text(TEXT, yaml.safe_load(TEXT)) == TEXT
+
+def test_scalar_edit_keeps_quotes_and_comments():
+    updated = _edit(TEXT, lambda doc: doc["cv"].update(name="Alex Reyes"))
+    assert _changed_lines(TEXT, updated) == ['-  name: "Jordan Reyes"   # quoted on purpose',
+                                             '+  name: "Alex Reyes"   # quoted on purpose']
+
+def test_single_quoted_value_keeps_its_style():
+    def change(doc):
+        doc["cv"]["sections"]["experience"][1]["position"] = "Logistics Lead"
+    updated = _edit(TEXT, change)
+    assert "        position: 'Logistics Lead'\n" in updated
+    assert len(_changed_lines(TEXT, updated)) == 2
+
+def test_appended_list_item_keeps_blank_line_separators():
+    def change(doc):
+        doc["cv"]["sections"]["experience"].append({"company": "Nimbus", "position": "Engineer"})
+    updated = _edit(TEXT, change)
+    assert "        position: 'Logistics Support Associate'\n\n      - company: Nimbus\n" in updated
+    assert all(line.startswith("+") for line in _changed_lines(TEXT, updated))
+
+def test_removed_entry_takes_its_separator_along():
+    updated = _edit(TEXT, lambda doc: doc["cv"]["sections"]["experience"].pop(0))
+    assert "    experience:\n      - company: MarketHub Retail\n" in updated
+    assert "\n\n\n" not in updated
+
+def test_renamed_key_rewrites_only_the_key_line(cv_text):
+    def change(doc):
+        sections = doc["cv"]["sections"]
+        doc["cv"]["sections"] = {("Work History" if key == "experience" else key): value
+                                 for key, value in sections.items()}
+    updated = _edit(cv_text, change)
+    assert _changed_lines(cv_text, updated) == ["-    experience:", "+    Work History:"]
+
+def test_moved_section_keeps_blank_lines(cv_text):
+    def change(doc):
+        sections = doc["cv"]["sections"]
+        order = list(sections)
+        order.remove("experience")
+        order.insert(order.index("education"), "experience")
+        doc["cv"]["sections"] = {key: sections[key] for key in order}
+    updated = _edit(cv_text, change)
+    assert updated.count("\n\n") == cv_text.count("\n\n")
+    assert "\n\n\n" not in updated
+    # Moved lines come back unchanged
+    assert sorted(line[1:] for line in _changed_lines(cv_text, updated) if line[0] == "+") == \
+        sorted(line[1:] for line in _changed_lines(cv_text, updated) if line[0] == "-")
+
+def test_missing_final_newline_is_kept(cv_text):
+    assert not cv_text.endswith("\n")
+    updated = _edit(cv_text, lambda doc: doc["cv"].update(name="Alex Reyes"))
+    assert not updated.endswith("\n")
+    assert len(_changed_lines(cv_text, updated)) == 2
+
+def test_flow_collections_fall_back_to_a_full_dump():
+    text = "cv:\n  tags: [a, b]\n"
+    document = yaml.safe_load(text)
+    document["cv"]["tags"].append("c")
+    updated = update_text(text, copy.deepcopy(document))
+    assert yaml.safe_load(updated) == document
@@ -3,6 +3,30 @@ Utility functions for the Resume Agent system.
 
 Available utilities:
 - text_utils: Word counting and summary validation
+- render_cache: Content-addressed LRU cache of rendered PDFs
+- render_worker: Resident RenderCV worker process with subprocess fallback
+- render_events: Server-Sent Events broker for render progress
+- render_gc: Background sweeper bounding the temp_renders directory
+- render_profiles: Preview/export render profiles and per-profile timings
+- render_pool: Shared render worker pool with fair per-session scheduling
+- render_history: Persistent index of past renders and their PDFs
+- pdf_cache: In-memory LRU of served PDF bytes with content-hash ETags
+- metrics: Prometheus-style counters, histograms and gauges
+- schema_validation: Cached in-process RenderCV schema validation
+- persistence: Write-behind, atomic saving of the working CV
+- yaml_cache: Shared cache of parsed, immutable YAML documents
+- text_delta: Line-based patches and content revisions for delta saves
+- chat_stream: Incremental extraction of the reply text from streamed JSON
+- chat_engine: Asyncio event loop running AI requests with timeouts and cancellation
+- asgi: ASGI front serving chat routes as coroutines, the Flask app via a2wsgi on a thread pool
+- llm_cache: Opt-in TTL cache of AI chat replies
+- yaml_patch: JSON-Patch-style edit operations on parsed YAML documents
+- tree_diff: Structural YAML diff with line hunks for editor highlighting
+- yaml_roundtrip: Format-preserving rewrites of edited YAML documents
+- intent_router: Rule-based local handling of routine chat edits
+- chat_store: Bounded chat history and compact suggestion storage
+- chat_db: SQLite persistence of chat histories and suggestions with batched writes
+- workspaces: Per-session editor/chat workspaces
 - get_australian_english_instruction: Australian English toggle utility
 """
 
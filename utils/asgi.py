@@ -0,0 +1,173 @@
+"""
+ASGI front for the editor.
+Chat requests spend nearly all their time waiting on the AI. Under WSGI
+each of them holds a server thread for the whole round trip. Here, chosen
+routes are coroutines served on the ASGI server's event loop, so any number
+of chats can be waiting at once. Blocking work inside those routes (disk,
+YAML parsing, diffs) goes through run_blocking() so it never stalls the
+loop. Every other request is handed to the Flask (WSGI) app through a2wsgi
+on a bounded thread pool, with streamed responses (e.g. SSE) forwarded
+chunk by chunk.
+Run with any ASGI server, e.g. `uvicorn simple_yaml_editor:asgi_app`.
+"""
+
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Tuple
+import asyncio
+import functools
+import json
+from http.cookies import SimpleCookie
+
+try:
+    from a2wsgi import WSGIMiddleware
+except ImportError:  # only needed when the app is actually served over ASGI
+    WSGIMiddleware = None
+
+class ASGIRequest:
+    """The parts of an HTTP request that async handlers need."""
+
+    def __init__(self, scope: Dict[str, Any], body: bytes):
+        self.method = scope["method"]
+        self.path = scope["path"]
+        self.query_string = scope.get("query_string", b"").decode("latin-1")
+        self.headers = {}
+        for name, value in scope.get("headers", []):
+            self.headers[name.decode("latin-1").lower()] = value.decode("latin-1")
+        self.body = body
+
+    @property
+    def cookies(self) -> Dict[str, str]:
+        cookie = SimpleCookie()
+        try:
+            cookie.load(self.headers.get("cookie", ""))
+        except Exception:
+            return {}
+        return {name: morsel.value for name, morsel in cookie.items()}
+
+    def json(self) -> Dict[str, Any]:
+        """The JSON body, or {} if it is missing or invalid."""
+        try:
+            data = json.loads(self.body or b"{}")
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+
+class ASGIResponse:
+    """A complete response, or a streamed one when `body` is an async iterator of str."""
+
+    def __init__(self, body, status: int = 200, content_type: str = "application/json",
+                 headers: Optional[List[Tuple[str, str]]] = None):
+        self.body = body
+        self.status = status
+        self.headers = [("content-type", content_type)] + list(headers or [])
+
+def json_response(data: Dict[str, Any], status: int = 200,
+                  headers: Optional[List[Tuple[str, str]]] = None) -> ASGIResponse:
+    return ASGIResponse(json.dumps(data), status=status, headers=headers)
+
+Handler = Callable[[ASGIRequest], Awaitable[ASGIResponse]]
+
+async def run_blocking(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking call on the event loop's default thread pool and await it."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+class ASGIApp:
+    """
+    Serve `routes` ({(method, path): async handler}) on the event loop and
+    everything else through `wsgi_app` on up to `wsgi_threads` threads.
+    """
+
+    def __init__(self, wsgi_app, routes: Dict[Tuple[str, str], Handler], wsgi_threads: int = 32):
+        self.wsgi_app = wsgi_app
+        self.routes = routes
+        self.wsgi_threads = wsgi_threads
+        self.async_requests = 0
+        self.wsgi_requests = 0
+        self.disconnects = 0
+        self._wsgi = WSGIMiddleware(wsgi_app, workers=wsgi_threads) if WSGIMiddleware else None
+
+    async def __call__(self, scope, receive, send):
+        if self._wsgi is None:
+            raise RuntimeError("a2wsgi is required to serve the app over ASGI: pip install a2wsgi")
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        handler = self.routes.get((scope["method"], scope["path"]))
+        if handler is None:
+            self.wsgi_requests += 1
+            await self._wsgi(scope, receive, send)
+            return
+        body = await self._read_body(receive)
+        if body is None:
+            return
+        self.async_requests += 1
+        await self._serve(handler, ASGIRequest(scope, body), receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self._wsgi.executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    @staticmethod
+    async def _read_body(receive) -> Optional[bytes]:
+        """The full request body, or None if the client went away."""
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return None
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body"):
+                return b"".join(chunks)
+
+    @staticmethod
+    async def _wait_disconnect(receive):
+        while (await receive())["type"] != "http.disconnect":
+            pass
+
+    async def _serve(self, handler: Handler, request: ASGIRequest, receive, send):
+        response = await handler(request)
+        await send({"type": "http.response.start", "status": response.status,
+                    "headers": [(name.encode("latin-1"), value.encode("latin-1"))
+                                for name, value in response.headers]})
+        if not hasattr(response.body, "__aiter__"):
+            await send({"type": "http.response.body", "body": response.body.encode("utf-8")})
+            return
+
+        # Stream until done; a disconnect cancels the producer (and its AI request)
+        async def pump():
+            async for chunk in response.body:
+                await send({"type": "http.response.body", "body": chunk.encode("utf-8"), "more_body": True})
+
+        producer = asyncio.ensure_future(pump())
+        watcher = asyncio.ensure_future(self._wait_disconnect(receive))
+        try:
+            await asyncio.wait({producer, watcher}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            watcher.cancel()
+            if not producer.done():
+                self.disconnects += 1
+                producer.cancel()
+                await asyncio.gather(producer, return_exceptions=True)
+                await response.body.aclose()
+                return
+        producer.result()
+        await send({"type": "http.response.body", "body": b""})
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get request counts by route kind and disconnects during async streams.
+        """
+        return {
+            'async_requests': self.async_requests,
+            'wsgi_requests': self.wsgi_requests,
+            'wsgi_threads': self.wsgi_threads,
+            'disconnects': self.disconnects
+        }
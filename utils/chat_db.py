@@ -0,0 +1,259 @@
+"""
+SQLite persistence for chat histories and suggestions.
+One database file holds every session's messages and suggestions, so the
+server restarts warm. Each session keeps its bounded in-memory ChatStore
+as a hot cache in front of the database. Writes are queued and committed in
+batches, one transaction each, on a background timer, off the request
+path. Reads are served from memory when it holds the requested page. Older
+history pages and evicted suggestions come from indexed queries.
+"""
+
+from typing import Dict, Any, List, Optional
+import atexit
+import json
+import sqlite3
+import threading
+import time
+import weakref
+
+from utils.chat_store import ChatStore, expand_suggestion
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    timestamp TEXT,
+    yaml_content TEXT,
+    suggestion_id TEXT,
+    PRIMARY KEY (session_id, seq)
+);
+CREATE TABLE IF NOT EXISTS bases (
+    revision TEXT PRIMARY KEY,
+    text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS suggestions (
+    id TEXT PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    base_revision TEXT NOT NULL REFERENCES bases (revision),
+    record TEXT NOT NULL,
+    created_at TEXT,
+    resolved_at REAL
+);
+CREATE INDEX IF NOT EXISTS suggestions_by_session_status ON suggestions (session_id, status, created_at);
+"""
+
+INSERT_MESSAGE = ("INSERT OR REPLACE INTO messages (session_id, seq, id, role, content, timestamp, "
+                  "yaml_content, suggestion_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?)")
+INSERT_BASE = "INSERT OR IGNORE INTO bases (revision, text) VALUES (?, ?)"
+INSERT_SUGGESTION = ("INSERT OR REPLACE INTO suggestions (id, session_id, status, base_revision, record, "
+                     "created_at, resolved_at) VALUES (?, ?, ?, ?, ?, ?, ?)")
+UPDATE_STATUS = "UPDATE suggestions SET status = ?, resolved_at = ?, record = ? WHERE id = ?"
+
+MESSAGE_COLUMNS = ("seq", "id", "role", "content", "timestamp", "yaml_content", "suggestion_id")
+
+# Databases with queued writes, flushed when the interpreter exits
+_open_databases = weakref.WeakSet()
+
+def _flush_all():
+    for database in list(_open_databases):
+        database.flush()
+
+atexit.register(_flush_all)
+
+class ChatDatabase:
+    """
+    A SQLite file shared by all sessions, with batched background writes.
+    """
+
+    def __init__(self, path: str, delay: float = 0.5, max_retry_delay: float = 30):
+        self.path = path
+        self.delay = delay
+        self.max_retry_delay = max_retry_delay
+        self.batches = 0
+        self.rows_written = 0
+        self.errors = 0
+        self.queries = 0
+        self.last_batch_ms = None
+        self._pending = []  # (statement, parameters) in order
+        self._timer = None
+        self._retry_delay = delay  # doubles after each failed batch
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        _open_databases.add(self)
+
+    def session(self, session_id: str, memory: Optional[ChatStore] = None) -> "SQLiteChatStore":
+        """A session's store, warmed from the database."""
+        return SQLiteChatStore(self, session_id, memory or ChatStore())
+
+    def enqueue(self, statement: str, parameters: tuple):
+        """Queue a write; it is committed `delay` seconds later with the others."""
+        with self._lock:
+            self._pending.append((statement, parameters))
+            if self._timer is None:
+                self._schedule(self.delay)
+
+    def _schedule(self, delay: float):
+        """Start the flush timer. Called with the lock held."""
+        self._timer = threading.Timer(delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self):
+        """Commit all queued writes now, in one transaction."""
+        with self._write_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            if not batch:
+                return
+            started = time.perf_counter()
+            try:
+                with self._conn:
+                    # Consecutive writes of the same statement go in one executemany
+                    group, rows = None, []
+                    for statement, parameters in batch + [(None, None)]:
+                        if statement != group and rows:
+                            self._conn.executemany(group, rows)
+                            rows = []
+                        group = statement
+                        rows.append(parameters)
+                self.batches += 1
+                self.rows_written += len(batch)
+                self.last_batch_ms = round((time.perf_counter() - started) * 1000, 2)
+                self._retry_delay = self.delay
+            except sqlite3.Error as e:
+                self.errors += 1
+                print(f"Chat database could not be written: {e}")
+                with self._lock:
+                    # Keep the writes, in order, and retry them later, backing off while the database keeps failing
+                    self._pending = batch + self._pending
+                    if self._timer is None:
+                        self._schedule(self._retry_delay)
+                    self._retry_delay = min(self._retry_delay * 2, self.max_retry_delay)
+
+    def query(self, statement: str, parameters: tuple = ()) -> List[tuple]:
+        """Run a read, after committing the queued writes so it sees them."""
+        self.flush()
+        with self._write_lock:
+            self.queries += 1
+            return self._conn.execute(statement, parameters).fetchall()
+
+    def close(self):
+        self.flush()
+        with self._write_lock:
+            self._conn.close()
+        _open_databases.discard(self)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get batching, query and error counters.
+        """
+        with self._lock:
+            return {
+                'path': self.path,
+                'pending_writes': len(self._pending),
+                'batches': self.batches,
+                'rows_written': self.rows_written,
+                'queries': self.queries,
+                'errors': self.errors,
+                'delay_ms': round(self.delay * 1000),
+                'last_batch_ms': self.last_batch_ms
+            }
+
+class SQLiteChatStore:
+    """
+    A session's chat store: a ChatStore in memory, backed by a ChatDatabase.
+    Exposes the same methods as ChatStore.
+    """
+
+    def __init__(self, database: ChatDatabase, session_id: str, memory: ChatStore):
+        self.database = database
+        self.session_id = session_id
+        self.memory = memory
+        self.database_reads = 0
+        self._warm()
+
+    def _warm(self):
+        """Load the newest messages and pending suggestions of the session."""
+        rows = self.database.query(
+            f"SELECT {', '.join(MESSAGE_COLUMNS)} FROM messages WHERE session_id = ? ORDER BY seq DESC LIMIT ?",
+            (self.session_id, self.memory.max_messages))
+        self.memory.restore_messages([dict(zip(MESSAGE_COLUMNS, row)) for row in reversed(rows)])
+        rows = self.database.query(
+            "SELECT s.record, b.text FROM suggestions s JOIN bases b ON b.revision = s.base_revision "
+            "WHERE s.session_id = ? AND s.status = 'pending' ORDER BY s.created_at DESC LIMIT ?",
+            (self.session_id, self.memory.max_suggestions))
+        for record, base_text in reversed(rows):
+            self.memory.restore_suggestion(json.loads(record), base_text)
+
+    def add_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        message = self.memory.add_message(message)
+        self.database.enqueue(INSERT_MESSAGE, (self.session_id,) + tuple(message.get(column)
+                                                                          for column in MESSAGE_COLUMNS))
+        return message
+
+    def history(self, limit: Optional[int] = None, before: Optional[int] = None) -> List[Dict[str, Any]]:
+        messages = self.memory.history(limit=limit, before=before)
+        # Memory holds the newest messages contiguously: a full page, or a
+        # history that starts at seq 1, needs no query
+        if (limit and len(messages) == limit) or self.memory.oldest_seq() in (None, 1):
+            return messages
+        self.database_reads += 1
+        rows = self.database.query(
+            f"SELECT {', '.join(MESSAGE_COLUMNS)} FROM messages WHERE session_id = ? AND seq < ? "
+            "ORDER BY seq DESC LIMIT ?",
+            (self.session_id, before if before is not None else 2 ** 62, limit or -1))
+        return [dict(zip(MESSAGE_COLUMNS, row)) for row in reversed(rows)]
+
+    def add_suggestion(self, suggestion: Dict[str, Any]) -> Dict[str, Any]:
+        record = self.memory.add_suggestion(suggestion)
+        self.database.enqueue(INSERT_BASE, (record["base_revision"], suggestion["original_yaml"]))
+        self.database.enqueue(INSERT_SUGGESTION, (
+            record["id"], self.session_id, record["status"], record["base_revision"],
+            json.dumps(record), record.get("created_at"), record.get("resolved_at")))
+        return record
+
+    def _load(self, suggestion_id: str) -> Optional[Dict[str, Any]]:
+        """Bring a suggestion evicted from memory back from the database."""
+        self.database_reads += 1
+        rows = self.database.query(
+            "SELECT s.record, b.text FROM suggestions s JOIN bases b ON b.revision = s.base_revision "
+            "WHERE s.id = ? AND s.session_id = ?", (suggestion_id, self.session_id))
+        if not rows:
+            return None
+        record, base_text = json.loads(rows[0][0]), rows[0][1]
+        self.memory.restore_suggestion(record, base_text)
+        return expand_suggestion(record, base_text)
+
+    def get_suggestion(self, suggestion_id: str) -> Optional[Dict[str, Any]]:
+        return self.memory.get_suggestion(suggestion_id) or self._load(suggestion_id)
+
+    def set_status(self, suggestion_id: str, status: str) -> Optional[Dict[str, Any]]:
+        suggestion = self.memory.set_status(suggestion_id, status)
+        if suggestion is None and self._load(suggestion_id) is not None:
+            suggestion = self.memory.set_status(suggestion_id, status)
+        if suggestion is None:
+            return None
+        self.database.enqueue(UPDATE_STATUS, (status, suggestion["resolved_at"],
+                                              json.dumps(self.memory.record(suggestion_id)), suggestion_id))
+        return suggestion
+
+    def memory_bytes(self) -> int:
+        return self.memory.memory_bytes()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get the in-memory store's counters plus database reads and writes.
+        """
+        return dict(self.memory.get_stats(), backend="sqlite", database_reads=self.database_reads,
+                    database=self.database.get_stats())
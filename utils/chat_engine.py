@@ -0,0 +1,211 @@
+"""
+Asynchronous chat engine.
+LLM requests run as coroutines on one background asyncio event loop that
+owns a single pooled async OpenAI client. Requests get a timeout, and a
+stream whose consumer goes away (the browser disconnected) is cancelled.
+Async routes (see utils.asgi) await requests with `arun`/`astream` from the
+server's own event loop, so a waiting chat holds no thread. WSGI routes use
+the blocking `run`/`stream` views.
+"""
+
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, Iterator, Optional
+import asyncio
+import queue
+import threading
+
+class ChatTimeout(Exception):
+    """The AI request did not finish within the timeout."""
+
+class AsyncChatEngine:
+    """
+    Run chat coroutines on a dedicated event loop thread.
+    """
+
+    def __init__(self, timeout: float = 60.0):
+        self.timeout = timeout
+        self.completed = 0
+        self.timeouts = 0
+        self.cancelled = 0
+        self.errors = 0
+        self._active = 0
+        self._client = None
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever,
+                                                name="chat-engine", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def get_client(self, factory: Callable[[], Any]):
+        """Return the engine's shared (connection-pooled) client, creating it once."""
+        with self._lock:
+            if self._client is None:
+                self._client = factory()
+            return self._client
+
+    def _track(self, delta: int):
+        with self._lock:
+            self._active += delta
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = None):
+        """
+        Run a coroutine on the engine loop and wait for its result, blocking
+        the calling thread. Raises ChatTimeout if it takes longer than the timeout.
+        """
+        timeout = timeout or self.timeout
+        future = asyncio.run_coroutine_threadsafe(asyncio.wait_for(coro, timeout), self._ensure_loop())
+        self._track(1)
+        try:
+            result = future.result(timeout + 5)
+            self._count("completed")
+            return result
+        except (asyncio.TimeoutError, TimeoutError):
+            future.cancel()
+            self._count("timeouts")
+            raise ChatTimeout(f"No AI response within {timeout:.0f}s")
+        except Exception:
+            self._count("errors")
+            raise
+        finally:
+            self._track(-1)
+
+    async def arun(self, coro: Awaitable, timeout: Optional[float] = None):
+        """
+        Like run, but awaited from another event loop (an async route)
+        instead of blocking a thread. Cancelling the caller cancels the request.
+        """
+        timeout = timeout or self.timeout
+        future = asyncio.run_coroutine_threadsafe(asyncio.wait_for(coro, timeout), self._ensure_loop())
+        self._track(1)
+        try:
+            result = await asyncio.wrap_future(future)
+            self._count("completed")
+            return result
+        except (asyncio.TimeoutError, TimeoutError):
+            self._count("timeouts")
+            raise ChatTimeout(f"No AI response within {timeout:.0f}s")
+        except asyncio.CancelledError:
+            future.cancel()
+            self._count("cancelled")
+            raise
+        except Exception:
+            self._count("errors")
+            raise
+        finally:
+            self._track(-1)
+
+    def _start_stream(self, agen: AsyncIterator, timeout: float, put: Callable[[tuple], None]):
+        """
+        Consume `agen` on the engine loop, handing ("item", value), then
+        ("end", None) or ("error", exception) to `put`. Returns the
+        concurrent future of the consuming task.
+        """
+        async def consume():
+            async for item in agen:
+                put(("item", item))
+
+        async def runner():
+            try:
+                await asyncio.wait_for(consume(), timeout)
+                put(("end", None))
+            except asyncio.TimeoutError:
+                put(("error", ChatTimeout(f"No complete AI response within {timeout:.0f}s")))
+            except asyncio.CancelledError:
+                put(("end", None))
+                raise
+            except Exception as e:
+                put(("error", e))
+
+        return asyncio.run_coroutine_threadsafe(runner(), self._ensure_loop())
+
+    def _finish_stream(self, kind: str, value):
+        """Count a finished stream; raise its error if it failed."""
+        if kind == "end":
+            self._count("completed")
+            return
+        self._count("timeouts" if isinstance(value, ChatTimeout) else "errors")
+        raise value
+
+    def stream(self, agen: AsyncIterator, timeout: Optional[float] = None) -> Iterator:
+        """
+        Iterate an async generator from synchronous code (e.g. a Flask
+        response generator). Closing the returned iterator early cancels the
+        underlying task; exceeding the timeout raises ChatTimeout.
+        """
+        items = queue.Queue()
+        future = self._start_stream(agen, timeout or self.timeout, items.put)
+        self._track(1)
+        finished = False
+        try:
+            while True:
+                kind, value = items.get()
+                if kind == "item":
+                    yield value
+                    continue
+                finished = True
+                self._finish_stream(kind, value)
+                return
+        finally:
+            self._track(-1)
+            if not finished:
+                # The consumer went away (client disconnected): stop the request
+                future.cancel()
+                self._count("cancelled")
+
+    async def astream(self, agen: AsyncIterator, timeout: Optional[float] = None) -> AsyncIterator:
+        """
+        Like stream, but iterated from another event loop (an async route)
+        without blocking a thread.
+        """
+        loop = asyncio.get_running_loop()
+        items = asyncio.Queue()
+        future = self._start_stream(agen, timeout or self.timeout,
+                                    lambda item: loop.call_soon_threadsafe(items.put_nowait, item))
+        self._track(1)
+        finished = False
+        try:
+            while True:
+                kind, value = await items.get()
+                if kind == "item":
+                    yield value
+                    continue
+                finished = True
+                self._finish_stream(kind, value)
+                return
+        finally:
+            self._track(-1)
+            if not finished:
+                future.cancel()
+                self._count("cancelled")
+
+    def stop(self):
+        """Stop the event loop thread."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get active, completed, timed out and cancelled request counts.
+        """
+        with self._lock:
+            return {
+                'running': self._thread is not None and self._thread.is_alive(),
+                'active': self._active,
+                'completed': self.completed,
+                'timeouts': self.timeouts,
+                'cancelled': self.cancelled,
+                'errors': self.errors,
+                'timeout_s': self.timeout
+            }
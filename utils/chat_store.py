@@ -0,0 +1,191 @@
+"""
+Bounded storage for a session's chat history and suggestions.
+Messages are kept in a fixed-size ring. Suggestions are capped in number
+(resolved ones are evicted before pending ones), and accepted or declined
+ones expire after a TTL. Each suggestion is stored compactly: the revision
+hash of the CV it was made against plus a line patch to the suggested text. Base texts are shared by every suggestion
+made against the same revision. The full original and suggested YAML are
+rebuilt on read.
+"""
+
+from typing import Dict, Any, List, Optional
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+
+from utils.text_delta import apply_line_patch, content_revision, line_patch
+
+def _size(value) -> int:
+    """Approximate in-memory footprint of a JSON-like value, in bytes."""
+    return len(json.dumps(value, default=str))
+
+def expand_suggestion(record: Dict[str, Any], base_text: str) -> Dict[str, Any]:
+    """Rebuild a full suggestion from its compact record and base text."""
+    suggestion = {key: value for key, value in record.items() if key not in ("base_revision", "patch")}
+    suggestion["original_yaml"] = base_text
+    suggestion["suggested_yaml"] = apply_line_patch(base_text, record["patch"])
+    return suggestion
+
+class ChatStore:
+    """
+    In-memory message ring and suggestion store with size and age limits.
+    """
+
+    def __init__(self, max_messages: int = 500, max_suggestions: int = 50, resolved_ttl: float = 3600):
+        self.max_messages = max_messages
+        self.max_suggestions = max_suggestions
+        self.resolved_ttl = resolved_ttl
+        self.evicted_messages = 0
+        self.evicted_suggestions = 0
+        self.expired_suggestions = 0
+        self._messages = deque()
+        self._next_seq = 1
+        self._suggestions = OrderedDict()  # id -> (compact record, size)
+        self._bases = {}  # revision -> [text, reference count]
+        self._message_bytes = 0
+        self._suggestion_bytes = 0
+        self._lock = threading.Lock()
+
+    def add_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Append a message, numbering it with a sequence number (`seq`)."""
+        with self._lock:
+            message["seq"] = self._next_seq
+            self._next_seq += 1
+            size = _size(message)
+            self._messages.append((message, size))
+            self._message_bytes += size
+            while len(self._messages) > self.max_messages:
+                _, dropped = self._messages.popleft()
+                self._message_bytes -= dropped
+                self.evicted_messages += 1
+        return message
+
+    def restore_messages(self, messages: List[Dict[str, Any]]):
+        """Load already numbered messages (oldest first), e.g. from persistent storage."""
+        with self._lock:
+            for message in messages:
+                size = _size(message)
+                self._messages.append((message, size))
+                self._message_bytes += size
+                self._next_seq = max(self._next_seq, message["seq"] + 1)
+            while len(self._messages) > self.max_messages:
+                _, dropped = self._messages.popleft()
+                self._message_bytes -= dropped
+
+    def oldest_seq(self) -> Optional[int]:
+        """Sequence number of the oldest message still held, or None."""
+        with self._lock:
+            return self._messages[0][0]["seq"] if self._messages else None
+
+    def history(self, limit: Optional[int] = None, before: Optional[int] = None) -> List[Dict[str, Any]]:
+        """The newest `limit` messages (all if None) with seq below `before`, oldest first."""
+        with self._lock:
+            messages = [message for message, _ in self._messages if before is None or message["seq"] < before]
+        return messages[-limit:] if limit else messages
+
+    def add_suggestion(self, suggestion: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Store a suggestion (with original_yaml and suggested_yaml) compactly.
+        Returns the compact record (with base_revision and patch).
+        """
+        original = suggestion["original_yaml"]
+        record = {key: value for key, value in suggestion.items() if key not in ("original_yaml", "suggested_yaml")}
+        record["base_revision"] = content_revision(original)
+        record["patch"] = line_patch(original, suggestion["suggested_yaml"])
+        self.restore_suggestion(record, original)
+        return record
+
+    def restore_suggestion(self, record: Dict[str, Any], base_text: str):
+        """Store a compact suggestion record against its base text."""
+        size = _size(record)
+        with self._lock:
+            if record["id"] in self._suggestions:
+                self._drop(record["id"])
+            base = self._bases.setdefault(record["base_revision"], [base_text, 0])
+            if base[1] == 0:
+                self._suggestion_bytes += len(base_text)
+            base[1] += 1
+            self._suggestions[record["id"]] = (record, size)
+            self._suggestion_bytes += size
+            self._evict()
+
+    def _drop(self, suggestion_id: str):
+        """Forget a suggestion and release its base text. Called with the lock held."""
+        record, size = self._suggestions.pop(suggestion_id)
+        self._suggestion_bytes -= size
+        base = self._bases[record["base_revision"]]
+        base[1] -= 1
+        if base[1] == 0:
+            self._suggestion_bytes -= len(base[0])
+            del self._bases[record["base_revision"]]
+
+    def _evict(self):
+        """
+        Expire old resolved suggestions, then cap the count: the oldest
+        resolved ones go first, pending ones only when nothing else is left.
+        Called with the lock held.
+        """
+        cutoff = time.time() - self.resolved_ttl
+        for suggestion_id, (record, _) in list(self._suggestions.items()):
+            if record.get("resolved_at") is not None and record["resolved_at"] < cutoff:
+                self._drop(suggestion_id)
+                self.expired_suggestions += 1
+        excess = len(self._suggestions) - self.max_suggestions
+        if excess <= 0:
+            return
+        resolved, pending = [], []
+        for suggestion_id, (record, _) in self._suggestions.items():
+            (pending if record.get("resolved_at") is None else resolved).append(suggestion_id)
+        for suggestion_id in (resolved + pending)[:excess]:
+            self._drop(suggestion_id)
+            self.evicted_suggestions += 1
+
+    def _expand(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        return expand_suggestion(record, self._bases[record["base_revision"]][0])
+
+    def get_suggestion(self, suggestion_id: str) -> Optional[Dict[str, Any]]:
+        """Return a suggestion with its full original and suggested YAML, or None."""
+        with self._lock:
+            self._evict()
+            entry = self._suggestions.get(suggestion_id)
+            return self._expand(entry[0]) if entry else None
+
+    def set_status(self, suggestion_id: str, status: str) -> Optional[Dict[str, Any]]:
+        """Mark a suggestion accepted or declined, starting its TTL. Returns it, or None."""
+        with self._lock:
+            entry = self._suggestions.get(suggestion_id)
+            if entry is None:
+                return None
+            entry[0]["status"] = status
+            entry[0]["resolved_at"] = time.time()
+            return self._expand(entry[0])
+
+    def record(self, suggestion_id: str) -> Optional[Dict[str, Any]]:
+        """A copy of a suggestion's compact record, or None."""
+        with self._lock:
+            entry = self._suggestions.get(suggestion_id)
+            return dict(entry[0]) if entry else None
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by messages, suggestions and base texts."""
+        with self._lock:
+            return self._message_bytes + self._suggestion_bytes
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get sizes, limits and eviction counters.
+        """
+        with self._lock:
+            return {
+                'messages': len(self._messages),
+                'max_messages': self.max_messages,
+                'suggestions': len(self._suggestions),
+                'max_suggestions': self.max_suggestions,
+                'base_revisions': len(self._bases),
+                'resolved_ttl_s': self.resolved_ttl,
+                'evicted_messages': self.evicted_messages,
+                'evicted_suggestions': self.evicted_suggestions,
+                'expired_suggestions': self.expired_suggestions,
+                'memory_bytes': self._message_bytes + self._suggestion_bytes
+            }
@@ -0,0 +1,81 @@
+"""
+Helpers for streaming chat replies.
+The assistant answers in JSON ({"chat_response": ..., "yaml_changes": ...}),
+so the raw token stream is not fit to show. JSONFieldStreamer pulls the text
+of one string field out of the partial JSON as tokens arrive, letting the
+browser display the reply while the rest of the object is still generating.
+"""
+
+import json
+import re
+
+_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+class JSONFieldStreamer:
+    """
+    Incrementally decode the value of a top-level JSON string field.
+    If the reply turns out not to be JSON, the raw text is passed through.
+    """
+
+    def __init__(self, field: str = "chat_response"):
+        self._key = re.compile(r'"%s"\s*:\s*"' % re.escape(field))
+        self._buffer = ""
+        self._position = None  # index of the next undecoded char of the value
+        self._finished = False
+        self._raw = None  # True once the reply is known not to be JSON
+
+    def feed(self, chunk: str) -> str:
+        """Add a chunk of the reply and return the newly decoded field text."""
+        self._buffer += chunk
+        if self._raw is None:
+            stripped = self._buffer.lstrip()
+            if not stripped:
+                return ""
+            self._raw = not stripped.startswith(("{", "```json"))
+            if self._raw:
+                return self._buffer
+        if self._raw:
+            return chunk
+        if self._finished:
+            return ""
+        if self._position is None:
+            match = self._key.search(self._buffer)
+            if not match:
+                return ""
+            self._position = match.end()
+        return self._decode()
+
+    def _decode(self) -> str:
+        out = []
+        buffer, i = self._buffer, self._position
+        while i < len(buffer):
+            char = buffer[i]
+            if char == '"':
+                self._finished = True
+                i += 1
+                break
+            if char != '\\':
+                out.append(char)
+                i += 1
+                continue
+            # Escape sequence: wait for the rest of it if it is split across chunks
+            if i + 1 >= len(buffer):
+                break
+            code = buffer[i + 1]
+            if code == 'u':
+                if i + 6 > len(buffer):
+                    break
+                # A high surrogate is only decodable together with its low half
+                length = 12 if buffer[i + 2:i + 4].lower() in ("d8", "d9", "da", "db") else 6
+                if i + length > len(buffer):
+                    break
+                try:
+                    out.append(json.loads(f'"{buffer[i:i + length]}"'))
+                except ValueError:
+                    pass
+                i += length
+            else:
+                out.append(_ESCAPES.get(code, code))
+                i += 2
+        self._position = i
+        return "".join(out)
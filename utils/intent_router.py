@@ -0,0 +1,439 @@
+"""
+Local intent router for routine chat edits.
+Messages such as "add Docker to my skills", "set the theme to classic" or
+"move Aether Intelligence to the top" are matched against a table of
+precompiled rules and applied to the parsed CV directly, in milliseconds and
+without an LLM round trip. Every match carries a confidence; below the
+router's threshold (an ambiguous target, an unknown theme...) the message is
+escalated to the model instead.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import re
+import threading
+import time
+
+from utils.tree_diff import same_tree
+from utils.yaml_cache import thaw
+
+# RenderCV 2 built-in themes and page sizes
+THEMES = ("classic", "engineeringclassic", "engineeringresumes", "moderncv", "sb2nov")
+PAGE_SIZES = {
+    "a4": "a4", "a5": "a5", "a3": "a3",
+    "letter": "us-letter", "us letter": "us-letter", "us-letter": "us-letter",
+    "legal": "us-legal", "us legal": "us-legal", "us-legal": "us-legal",
+    "executive": "us-executive", "us-executive": "us-executive"
+}
+CONTACT_FIELDS = {"name": "name", "email": "email", "e-mail": "email", "phone": "phone",
+                  "phone number": "phone", "location": "location", "website": "website"}
+# Fields naming an entry, in the order they are tried
+ENTRY_FIELDS = ("company", "institution", "name", "title", "label", "position", "degree", "area")
+
+_POLITE_PREFIX = re.compile(r"^(?:(?:please|pls|kindly|can you|could you|would you|"
+                            r"i want to|i'd like to|i would like to)\s+)+", re.I)
+_TRAILER = re.compile(r"(?:[\s,]+(?:please|thanks|thank you))?[\s.!?]*$", re.I)
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_PHONE = re.compile(r"\+?[\d\s().-]{6,}")
+_LIST_SPLIT = re.compile(r"\s*,\s*(?:and\s+)?|\s+and\s+")
+_URL = re.compile(r"(?:https?://)?[\w-]+(?:\.[\w-]+)+(?:/\S*)?", re.I)
+_LEADING_LINK = re.compile(r"^(?:(?:to|as|be)\b\s*)+", re.I)
+# "and", "but", "then", ";" or a sentence break: a second instruction follows
+_CLAUSE_BREAK = re.compile(r"\s(?:and|but|then)\s|;|[.!?]\s", re.I)
+_PROPER_WORDS = re.compile(r"[A-Z][\w'.-]*(?:\s+[A-Z][\w'.-]*)*")
+
+Outcome = Optional[Tuple[str, float]]
+
+def normalize_request(message: str) -> str:
+    """Strip politeness and trailing punctuation so rules can match the whole message."""
+    text = _POLITE_PREFIX.sub("", message.strip())
+    return _TRAILER.sub("", text).strip()
+
+def _key(text: str) -> str:
+    """Loose comparison form of a name: case, separators and plural 's' ignored."""
+    return re.sub(r"[\s_-]+", "", str(text).lower()).rstrip("s")
+
+def _unquote(text: str) -> str:
+    return text.strip().strip("\"'“”‘’").strip()
+
+def _sections(document) -> Dict[str, Any]:
+    sections = document["cv"]["sections"]
+    if not isinstance(sections, dict):
+        raise KeyError("sections")
+    return sections
+
+def _find_section(document, name: str) -> Optional[str]:
+    wanted = _key(name)
+    return next((key for key in _sections(document) if _key(key) == wanted), None)
+
+def _find_entries(document, name: str) -> List[Tuple[str, int, dict]]:
+    """Entries in any section whose naming fields match `name`."""
+    wanted = name.lower()
+    matches = []
+    for section, entries in _sections(document).items():
+        if not isinstance(entries, list):
+            continue
+        for index, entry in enumerate(entries):
+            if isinstance(entry, dict) and any(
+                    isinstance(entry.get(field), str) and entry[field].lower() == wanted for field in ENTRY_FIELDS):
+                matches.append((section, index, entry))
+    if not matches:
+        # Fall back to partial names ("Aether" for "Aether Intelligence")
+        for section, entries in _sections(document).items():
+            for index, entry in enumerate(entries if isinstance(entries, list) else []):
+                if isinstance(entry, dict) and any(
+                        isinstance(entry.get(field), str) and wanted in entry[field].lower() for field in ENTRY_FIELDS):
+                    matches.append((section, index, entry))
+    return matches
+
+def _set_contact(document, match) -> Outcome:
+    field = CONTACT_FIELDS[match.group("field").lower()]
+    # "change name to", "set location to be in Sydney": the link words are not the value
+    value = _unquote(_LEADING_LINK.sub("", match.group("value").strip()))
+    cv = document["cv"]
+    # "change the name of my experience section to..." is not about the CV name
+    if not value or cv.get(field) == value or re.match(r"(?:of|for|in)\b", value, re.I) \
+            or _CLAUSE_BREAK.search(value):
+        return None
+    # Free text is only taken as-is when it looks like the field
+    if field == "email":
+        confidence = 0.95 if _EMAIL.fullmatch(value) else 0.3
+    elif field == "phone":
+        confidence = 0.95 if _PHONE.fullmatch(value) else 0.3
+    elif field == "website":
+        confidence = 0.95 if _URL.fullmatch(value) else 0.3
+    elif field == "name":
+        confidence = 0.9 if _PROPER_WORDS.fullmatch(value) and len(value.split()) <= 5 else 0.5
+    else:
+        words = [word.strip() for word in value.split(",")]
+        confidence = 0.9 if all(_PROPER_WORDS.fullmatch(word) for word in words) else 0.5
+    previous = cv.get(field)
+    cv[field] = value
+    return f"Updated {field} from '{previous}' to '{value}'", confidence
+
+def _design(document) -> dict:
+    design = document.setdefault("design", {})
+    if not isinstance(design, dict):
+        raise TypeError("design")
+    return design
+
+def _set_theme(document, match) -> Outcome:
+    theme = match.group("theme").lower()
+    design = _design(document)
+    if design.get("theme") == theme:
+        return None
+    previous = design.get("theme")
+    design["theme"] = theme
+    return f"Changed the theme from '{previous}' to '{theme}'", 0.95 if theme in THEMES else 0.3
+
+def _set_font_size(document, match) -> Outcome:
+    size = f"{match.group('size')}{(match.group('unit') or 'pt').lower()}"
+    text = _design(document).setdefault("text", {})
+    if text.get("font_size") == size:
+        return None
+    text["font_size"] = size
+    return f"Set the font size to {size}", 0.95
+
+def _set_font(document, match) -> Outcome:
+    font = _unquote(match.group("font"))
+    text = _design(document).setdefault("text", {})
+    if not font or text.get("font_family") == font:
+        return None
+    text["font_family"] = font
+    return f"Set the font to '{font}'", 0.85
+
+def _set_page_size(document, match) -> Outcome:
+    requested = match.group("size").lower()
+    size = PAGE_SIZES.get(requested)
+    page = _design(document).setdefault("page", {})
+    if page.get("size") == (size or requested):
+        return None
+    page["size"] = size or requested
+    return f"Set the page size to {size or requested}", 0.95 if size else 0.3
+
+def _add_skill(document, match) -> Outcome:
+    section = _find_section(document, "skills")
+    if section is None:
+        return None
+    entries = _sections(document)[section]
+    skills = [_unquote(skill) for skill in _LIST_SPLIT.split(match.group("skill")) if skill.strip()]
+    label = match.groupdict().get("label")
+    if label and re.fullmatch(r"skills?(?:\s+section)?", label, re.I):
+        label = None
+    if all(isinstance(entry, str) for entry in entries):
+        added = [skill for skill in skills if skill not in entries]
+        entries.extend(added)
+        return (f"Added {', '.join(added)} to {section}", 0.9) if added else None
+
+    candidates = [entry for entry in entries if isinstance(entry, dict) and "details" in entry]
+    if label:
+        target = next((entry for entry in candidates if _key(entry.get("label", "")) == _key(label)), None)
+        if target is None:
+            # "technical skills" may mean an existing group under another name: let the model decide
+            entries.append({"label": _unquote(label), "details": ", ".join(skills)})
+            return f"Added a '{_unquote(label)}' skill group with {', '.join(skills)}", 0.4
+        confidence = 0.95
+    elif len(candidates) == 1:
+        target, confidence = candidates[0], 0.85
+    else:
+        # Which group the skill belongs to is a judgement call for the model
+        if not candidates:
+            return None
+        target, confidence = candidates[-1], 0.4
+    existing = [item.strip().lower() for item in str(target.get("details", "")).split(",")]
+    added = [skill for skill in skills if skill.lower() not in existing]
+    if not added:
+        return None
+    target["details"] = ", ".join(filter(None, [str(target.get("details", "")).strip()] + added))
+    return f"Added {', '.join(added)} to {target.get('label', section)}", confidence
+
+def _remove_skill(document, match) -> Outcome:
+    section = _find_section(document, "skills")
+    if section is None:
+        return None
+    entries = _sections(document)[section]
+    skill = _unquote(match.group("skill"))
+    wanted = skill.lower()
+    for index, entry in enumerate(entries):
+        if (isinstance(entry, str) and entry.lower() == wanted) or (
+                isinstance(entry, dict) and str(entry.get("label", "")).lower() == wanted):
+            del entries[index]
+            return f"Removed {skill} from {section}", 0.9
+    removed_from = []
+    for entry in entries:
+        if not isinstance(entry, dict) or not isinstance(entry.get("details"), str):
+            continue
+        items = [item.strip() for item in entry["details"].split(",")]
+        kept = [item for item in items if item.lower() != wanted]
+        if len(kept) != len(items):
+            entry["details"] = ", ".join(kept)
+            removed_from.append(str(entry.get("label", section)))
+    if not removed_from:
+        return None
+    return f"Removed {skill} from {', '.join(removed_from)}", 0.9
+
+def _rename_section(document, match) -> Outcome:
+    old = _find_section(document, match.group("old"))
+    new_name = _unquote(match.group("new"))
+    if old is None or not new_name:
+        return None
+    # Keep the key style of the document (snake_case or titles)
+    new_key = re.sub(r"\s+", "_", new_name.lower()) if old == old.lower() else new_name
+    sections = _sections(document)
+    if new_key in sections:
+        return None
+    renamed = {(new_key if key == old else key): value for key, value in sections.items()}
+    document["cv"]["sections"] = renamed
+    return f"Renamed the '{old}' section to '{new_key}'", 0.95
+
+def _reorder(items: list, index: int, where: str, other: Optional[int]) -> Optional[int]:
+    """New position of items[index], or None if it does not move."""
+    where = where.lower()
+    if where == "up":
+        position = index - 1
+    elif where == "down":
+        position = index + 1
+    elif where == "first" or where.endswith("top"):
+        position = 0
+    elif where == "last" or where.endswith(("bottom", "end")):
+        position = len(items) - 1
+    elif other is None:
+        return None
+    elif where.startswith(("before", "above")):
+        position = other if other < index else other - 1
+    else:
+        position = other + 1 if other > index else other
+    position = max(0, min(position, len(items) - 1))
+    if position == index:
+        return None
+    items.insert(position, items.pop(index))
+    return position
+
+def _move(document, match) -> Outcome:
+    target, where, other = match.group("target"), match.group("where"), match.group("other")
+    section = _find_section(document, target)
+    if section is not None:
+        keys = list(_sections(document))
+        other_index = None
+        if other:
+            other_section = _find_section(document, other)
+            if other_section is None:
+                return None
+            other_index = keys.index(other_section)
+        if _reorder(keys, keys.index(section), where.split()[0] if other else where, other_index) is None:
+            return None
+        sections = _sections(document)
+        document["cv"]["sections"] = {key: sections[key] for key in keys}
+        return f"Moved the '{section}' section {where}", 0.9
+
+    matches = _find_entries(document, target)
+    if not matches:
+        return None
+    section, index, entry = matches[0]
+    entries = _sections(document)[section]
+    other_index = None
+    if other:
+        others = [found for found in _find_entries(document, other) if found[0] == section]
+        if not others:
+            return None
+        other_index = others[0][1]
+    if _reorder(entries, index, where.split()[0] if other else where, other_index) is None:
+        return None
+    name = next(entry[field] for field in ENTRY_FIELDS if isinstance(entry.get(field), str))
+    return f"Moved '{name}' {where} in {section}", 0.9 if len(matches) == 1 else 0.4
+
+def _add_highlight(document, match) -> Outcome:
+    matches = _find_entries(document, _unquote(match.group("entry")))
+    text = _unquote(match.group("text"))
+    if not matches or not text:
+        return None
+    section, _, entry = matches[0]
+    highlights = entry.setdefault("highlights", [])
+    if not isinstance(highlights, list) or text in highlights:
+        return None
+    highlights.append(text)
+    name = next(entry[field] for field in ENTRY_FIELDS if isinstance(entry.get(field), str))
+    return f"Added a highlight to '{name}' in {section}", 0.95 if len(matches) == 1 else 0.4
+
+def _remove_highlight(document, match) -> Outcome:
+    wanted = _unquote(match.group("text")).lower()
+    scope = match.group("entry")
+    entries = _find_entries(document, _unquote(scope)) if scope else [
+        (section, index, entry) for section, items in _sections(document).items() if isinstance(items, list)
+        for index, entry in enumerate(items) if isinstance(entry, dict)]
+    found = [(entry, position) for _, _, entry in entries if isinstance(entry.get("highlights"), list)
+             for position, highlight in enumerate(entry["highlights"])
+             if isinstance(highlight, str) and wanted in highlight.lower()]
+    if not found:
+        return None
+    entry, position = found[0]
+    removed = entry["highlights"].pop(position)
+    return f"Removed the highlight '{removed}'", 0.95 if len(found) == 1 else 0.4
+
+class IntentRule:
+    """
+    One routine edit: a pattern matched against the whole (normalized)
+    message and a handler that applies it to a mutable document, returning
+    (explanation, confidence) or None when it does not apply.
+    """
+
+    def __init__(self, name: str, patterns: List[str], handler: Callable[[dict, Any], Outcome]):
+        self.name = name
+        self.patterns = [re.compile(pattern, re.I) for pattern in patterns]
+        self.handler = handler
+
+    def match(self, text: str):
+        return next((match for match in (pattern.fullmatch(text) for pattern in self.patterns) if match), None)
+
+_THE = r"(?:(?:the|my)\s+)?"
+_BULLET = r"(?:highlight|bullet(?:\s+point)?)"
+_ENTRY_SUFFIX = r"(?:\s+(?:entry|role|job|position|section))?"
+
+# Tried in order; more specific rules first (font size before font, highlights before skills)
+RULES = [
+    IntentRule("set_contact", [
+        r"(?:change|update|set)\s+" + _THE + r"(?P<field>name|email|e-mail|phone(?:\s+number)?|location|website)"
+        r"\s+(?:to\s+|as\s+)?(?P<value>.+)"], _set_contact),
+    IntentRule("set_theme", [
+        r"(?:change|set|switch|update)\s+" + _THE + r"(?:cv\s+)?theme\s+(?:to\s+)?(?P<theme>[\w-]+)",
+        r"(?:use|switch\s+to|apply)\s+" + _THE + r"(?P<theme>[\w-]+)\s+theme"], _set_theme),
+    IntentRule("set_font_size", [
+        r"(?:change|set|make|update)\s+" + _THE + r"(?:text\s+)?font\s+size\s+(?:to\s+)?"
+        r"(?P<size>\d+(?:\.\d+)?)\s*(?P<unit>pt|px|em|mm|cm|in)?"], _set_font_size),
+    IntentRule("set_font", [
+        r"(?:change|set|update)\s+" + _THE + r"font(?:\s+family)?\s+(?:to\s+)?(?P<font>.+)",
+        r"use\s+(?:the\s+)?(?P<font>.+?)\s+font"], _set_font),
+    IntentRule("set_page_size", [
+        r"(?:change|set|use|switch|update)\s+" + _THE + r"(?:page|paper)(?:\s+size)?\s+(?:to\s+)?(?P<size>[\w -]+?)"
+        r"(?:\s+(?:paper|size))?"], _set_page_size),
+    IntentRule("add_highlight", [
+        r"add\s+(?:a\s+|another\s+|the\s+)?" + _BULLET + r"\s+(?:to|for|under)\s+" + _THE + r"(?P<entry>.+?)" +
+        _ENTRY_SUFFIX + r"\s*:\s*(?P<text>.+)",
+        r"add\s+(?:a\s+|another\s+|the\s+)?" + _BULLET + r"\s+(?P<text>[\"'“].+?[\"'”])\s+(?:to|for|under)\s+" +
+        _THE + r"(?P<entry>.+?)" + _ENTRY_SUFFIX], _add_highlight),
+    IntentRule("remove_highlight", [
+        r"(?:remove|delete|drop)\s+(?:the\s+)?" + _BULLET + r"\s+(?:about|containing|mentioning|on|that\s+says)\s+"
+        r"(?P<text>.+?)(?:\s+from\s+" + _THE + r"(?P<entry>.+?)" + _ENTRY_SUFFIX + r")?"], _remove_highlight),
+    IntentRule("add_skill", [
+        r"add\s+(?:the\s+|a\s+(?:new\s+)?)?skills?\s+(?P<skill>.+?)(?:\s+(?:under|to|in)\s+" + _THE +
+        r"(?P<label>.+?))?",
+        r"add\s+(?P<skill>.+?)\s+to\s+" + _THE + r"skills?(?:\s+section)?(?:\s+(?:under|in)\s+" + _THE +
+        r"(?P<label>.+?))?",
+        r"add\s+(?P<skill>.+?)\s+to\s+" + _THE + r"(?P<label>.+?)\s+skills?"], _add_skill),
+    IntentRule("remove_skill", [
+        r"(?:remove|delete|drop)\s+(?:the\s+)?skills?\s+(?P<skill>.+?)(?:\s+from\s+" + _THE + r"skills?)?",
+        r"(?:remove|delete|drop)\s+(?P<skill>.+?)\s+from\s+" + _THE + r"(?:[\w ]+?\s+)?skills?(?:\s+section)?"],
+        _remove_skill),
+    IntentRule("rename_section", [
+        r"rename\s+" + _THE + r"(?P<old>.+?)(?:\s+section)?\s+(?:section\s+)?(?:to|as)\s+(?P<new>.+?)(?:\s+section)?"],
+        _rename_section),
+    IntentRule("move", [
+        r"move\s+" + _THE + r"(?P<target>.+?)(?:\s+section|\s+entry)?\s+(?P<where>up|down|first|last|"
+        r"to\s+the\s+(?:top|bottom|end)|(?:before|above|after|below)\s+" + _THE +
+        r"(?P<other>.+?)(?:\s+section|\s+entry)?)"], _move),
+]
+
+class IntentRouter:
+    """
+    Match chat messages against the rule table and apply confident matches
+    to a copy of the document.
+    """
+
+    def __init__(self, threshold: float = 0.8, rules: Optional[List[IntentRule]] = None):
+        self.threshold = threshold
+        self.rules = rules if rules is not None else RULES
+        self.handled = {}  # intent -> count answered locally
+        self.escalated = {}  # intent -> count passed on to the model
+        self.misses = 0
+        self.route_seconds = 0.0
+        self.routed = 0
+        self._lock = threading.Lock()
+
+    def route(self, message: str, document) -> Optional[Dict[str, Any]]:
+        """
+        Find the first rule that applies to `message`. Returns None if none
+        does, else {"intent", "confidence", "handled", "explanation",
+        "document"} where `document` is an edited copy; `handled` tells
+        whether the confidence reaches the threshold.
+        """
+        started = time.perf_counter()
+        text = normalize_request(message)
+        result = None
+        for rule in self.rules:
+            match = rule.match(text)
+            if not match:
+                continue
+            candidate = thaw(document)
+            try:
+                outcome = rule.handler(candidate, match)
+            except (KeyError, IndexError, TypeError, ValueError):
+                outcome = None
+            if outcome is None or same_tree(document, candidate):
+                continue
+            explanation, confidence = outcome
+            result = {"intent": rule.name, "confidence": confidence, "handled": confidence >= self.threshold,
+                      "explanation": explanation, "document": candidate}
+            break
+
+        with self._lock:
+            self.routed += 1
+            self.route_seconds += time.perf_counter() - started
+            if result is None:
+                self.misses += 1
+            else:
+                counts = self.handled if result["handled"] else self.escalated
+                counts[result["intent"]] = counts.get(result["intent"], 0) + 1
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get per-intent counts and the mean routing time.
+        """
+        with self._lock:
+            return {
+                'threshold': self.threshold,
+                'rules': len(self.rules),
+                'handled': dict(self.handled),
+                'escalated': dict(self.escalated),
+                'misses': self.misses,
+                'mean_route_ms': round(self.route_seconds / self.routed * 1000, 3) if self.routed else None
+            }
@@ -0,0 +1,145 @@
+"""
+Opt-in cache of AI chat replies.
+Repeated questions about an unchanged CV are answered from the cache
+instead of another LLM round trip. The key covers the normalized message,
+the CV content, the model and the prompt version, so any change to one of
+them misses. Entries expire after a TTL, the cache is size-bounded, and it
+can optionally persist to disk across restarts.
+"""
+
+from typing import Dict, Any, Optional
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+def normalize_message(message: str) -> str:
+    """
+    Whitespace-insensitive form of a chat message. Case and punctuation are
+    kept: they can end up in the CV ("set my name to John Smith").
+    """
+    return re.sub(r"\s+", " ", message.strip())
+
+class LLMResponseCache:
+    """
+    TTL + LRU cache of raw AI replies, optionally backed by a directory.
+    """
+
+    def __init__(self, ttl: float = 3600, max_entries: int = 256, cache_dir: Optional[str] = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.cache_dir = os.path.abspath(cache_dir) if cache_dir else None
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (created_at, response)
+        self._lock = threading.Lock()
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._load()
+
+    def key_for(self, message: str, yaml_content: str, model: str, prompt_version: str) -> str:
+        """Build the cache key for a chat request."""
+        material = json.dumps([normalize_message(message),
+                               hashlib.sha256(yaml_content.encode("utf-8")).hexdigest(),
+                               model, prompt_version])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load(self):
+        """Load unexpired entries from disk, oldest first."""
+        records = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.cache_dir, name), 'r', encoding='utf-8') as file:
+                    record = json.load(file)
+                records.append((record["created_at"], name[:-5], record["response"]))
+            except (OSError, ValueError, KeyError):
+                continue
+        now = time.time()
+        for created_at, key, response in sorted(records):
+            if now - created_at <= self.ttl:
+                self._entries[key] = (created_at, response)
+            else:
+                self._remove_file(key)
+        while len(self._entries) > self.max_entries:
+            self._drop_oldest()
+
+    def _remove_file(self, key: str):
+        if self.cache_dir:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _drop_oldest(self):
+        """Evict the least recently used entry. Called with the lock held."""
+        key, _ = self._entries.popitem(last=False)
+        self._remove_file(key)
+        self.evictions += 1
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a cached reply, or None on a miss or an expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[0] > self.ttl:
+                del self._entries[key]
+                self._remove_file(key)
+                self.expired += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, response: str):
+        """Store a reply."""
+        created_at = time.time()
+        with self._lock:
+            self._entries[key] = (created_at, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._drop_oldest()
+            if self.cache_dir:
+                tmp_path = f"{self._path(key)}.tmp"
+                try:
+                    with open(tmp_path, 'w', encoding='utf-8') as file:
+                        json.dump({"created_at": created_at, "response": response}, file)
+                    os.replace(tmp_path, self._path(key))
+                except OSError as e:
+                    print(f"AI response cache could not be saved: {e}")
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            for key in list(self._entries):
+                self._remove_file(key)
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get hit rate, size and eviction counters.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'expired': self.expired,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_s': self.ttl,
+                'disk': self.cache_dir is not None
+            }
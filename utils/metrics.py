@@ -0,0 +1,188 @@
+"""
+Minimal Prometheus-style metrics (counters, histograms, gauges).
+Metrics are kept in memory and rendered in the Prometheus text exposition
+format, so `/metrics` can be scraped without extra dependencies.
+"""
+
+from typing import Dict, Any, Callable, Iterable, List, Optional, Tuple
+import threading
+import time
+from contextlib import contextmanager
+
+# Buckets (seconds) sized for the render path: sub-ms validation to slow renders
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    """Render a label set as {a="x",b="y"}."""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    """Base class holding the name, help text and label names."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(_Metric):
+    """Monotonically increasing count, optionally per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+                for key, value in items]
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series = {}  # label values -> [bucket counts, sum, count]
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][index] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time of a `with` block."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return series[2] if series else 0
+
+    def samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            items = sorted((key, (list(series[0]), series[1], series[2]))
+                           for key, series in self._series.items())
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+class Gauge(_Metric):
+    """Value read from a callback at scrape time (queue depth, cache size...)."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], float],
+                 kind: str = "gauge"):
+        super().__init__(name, documentation)
+        self.callback = callback
+        self.kind = kind
+
+    def samples(self) -> List[str]:
+        try:
+            value = self.callback()
+        except Exception as e:
+            print(f"Metric {self.name} could not be collected: {e}")
+            return []
+        return [f"{self.name} {_format_value(value)}"] if value is not None else []
+
+class MetricsRegistry:
+    """
+    Named collection of metrics rendered together at `/metrics`.
+    Registering a name twice returns the existing metric, so every editor
+    (one per session) shares the same process-wide series.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, name: str, factory: Callable[[], _Metric]) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = factory()
+            return metric
+
+    def counter(self, name: str, documentation: str, labels: Iterable[str] = ()) -> Counter:
+        return self._register(name, lambda: Counter(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: Iterable[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(name, lambda: Histogram(name, documentation, labels, buckets))
+
+    def gauge(self, name: str, documentation: str, callback: Callable[[], float],
+              kind: str = "gauge") -> Gauge:
+        """Register a callback-backed metric. Use kind="counter" for totals kept elsewhere."""
+        return self._register(name, lambda: Gauge(name, documentation, callback, kind))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        with self._lock:
+            return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,70 @@
+"""
+In-memory LRU of recently served PDF bytes with content-hash ETags.
+Repeated views of the same render are answered from memory, and the ETag
+lets browsers revalidate with a cheap 304 instead of re-downloading.
+"""
+
+from typing import Dict, Any, Tuple
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+class PDFBytesCache:
+    """
+    Size-bounded LRU keyed on (path, mtime, size) holding PDF bytes and ETags.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, max_entries: int = 32):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (data, etag)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def load(self, path: str) -> Tuple[bytes, str]:
+        """
+        Return (data, etag) for a PDF, reading and hashing it only on a miss.
+        Raises OSError if the file cannot be read.
+        """
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        with open(path, 'rb') as file:
+            data = file.read()
+        etag = hashlib.sha256(data).hexdigest()[:32]
+
+        with self._lock:
+            if key not in self._entries and len(data) <= self.max_bytes:
+                self._entries[key] = (data, etag)
+                self._bytes += len(data)
+                while self._entries and (len(self._entries) > self.max_entries or
+                                         self._bytes > self.max_bytes):
+                    _, (old_data, _) = self._entries.popitem(last=False)
+                    self._bytes -= len(old_data)
+        return data, etag
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss counters and memory usage.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes
+            }
@@ -0,0 +1,151 @@
+"""
+Write-behind, atomic persistence for the working CV file.
+Saves return as soon as the new content is accepted: unchanged content is
+never rewritten, rapid saves are coalesced into one write, and every write
+goes to a temp file that is renamed over the target so a crash can never
+leave a truncated CV behind.
+"""
+
+from typing import Dict, Any, Optional
+import atexit
+import hashlib
+import os
+import threading
+import time
+import weakref
+
+# Files with unwritten content, flushed when the interpreter exits
+_open_files = weakref.WeakSet()
+
+def _flush_all():
+    for persisted in list(_open_files):
+        persisted.flush()
+
+atexit.register(_flush_all)
+
+def atomic_write(path: str, content: str):
+    """Write text to `path` via a temp file and rename, fsyncing the data."""
+    directory = os.path.dirname(os.path.abspath(path))
+    tmp_path = os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        file.write(content)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+class WriteBehindFile:
+    """
+    A text file whose writes are hashed, batched and applied in the background.
+    """
+
+    def __init__(self, path: str, delay: float = 0.5, max_retry_delay: float = 30):
+        self.path = path
+        self.delay = delay
+        self.max_retry_delay = max_retry_delay
+        self.writes = 0
+        self.unchanged = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.last_write_ms = None
+        self._pending = None  # newest content not yet on disk
+        self._timer = None
+        self._retry_delay = delay  # doubles after each failed write
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._hash = self._file_hash()  # hash of the newest accepted content
+        _open_files.add(self)
+
+    @staticmethod
+    def _digest(content: str) -> str:
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _file_hash(self) -> Optional[str]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                return self._digest(file.read())
+        except OSError:
+            return None
+
+    def write(self, content: str) -> bool:
+        """
+        Accept new content. Returns False if it matches what is already saved.
+        The disk write happens `delay` seconds later on a background thread.
+        """
+        digest = self._digest(content)
+        with self._lock:
+            if digest == self._hash:
+                self.unchanged += 1
+                return False
+            if self._pending is not None:
+                self.coalesced += 1
+            self._hash = digest
+            self._pending = content
+            if self._timer is None:
+                self._schedule(self.delay)
+        return True
+
+    def _schedule(self, delay: float):
+        """Start the flush timer. Called with the lock held."""
+        self._timer = threading.Timer(delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def read(self) -> Optional[str]:
+        """Return the newest content, including writes still pending."""
+        with self._lock:
+            if self._pending is not None:
+                return self._pending
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    def flush(self):
+        """Write any pending content now."""
+        with self._write_lock:
+            with self._lock:
+                content = self._pending
+                self._pending = None
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            if content is None:
+                return
+            started = time.perf_counter()
+            try:
+                atomic_write(self.path, content)
+                self.writes += 1
+                self.last_write_ms = round((time.perf_counter() - started) * 1000, 2)
+                self._retry_delay = self.delay
+            except OSError as e:
+                self.errors += 1
+                print(f"Could not save {self.path}: {e}")
+                with self._lock:
+                    # Keep the content and retry it later, backing off while the disk keeps failing
+                    if self._pending is None:
+                        self._pending = content
+                        self._hash = None
+                    if self._timer is None:
+                        self._schedule(self._retry_delay)
+                    self._retry_delay = min(self._retry_delay * 2, self.max_retry_delay)
+
+    @property
+    def pending(self) -> bool:
+        with self._lock:
+            return self._pending is not None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get write, skip and coalescing counters.
+        """
+        with self._lock:
+            return {
+                'writes': self.writes,
+                'unchanged_skipped': self.unchanged,
+                'coalesced': self.coalesced,
+                'errors': self.errors,
+                'pending': self._pending is not None,
+                'delay_ms': round(self.delay * 1000),
+                'last_write_ms': self.last_write_ms
+            }
@@ -0,0 +1,166 @@
+"""
+Content-addressed on-disk cache for rendered CV PDFs.
+Identical YAML documents rendered with the same RenderCV version map to the
+same cache entry, so re-saving unchanged content never spawns a new render.
+"""
+
+from typing import Dict, Any, Optional
+import hashlib
+import os
+import shutil
+import threading
+from collections import OrderedDict
+
+def get_rendercv_version() -> str:
+    """
+    Return the installed RenderCV version, or 'unknown' if it is not installed.
+    """
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+    except ImportError:  # pragma: no cover - Python < 3.8
+        return "unknown"
+    try:
+        return version("rendercv")
+    except PackageNotFoundError:
+        return "unknown"
+
+def normalize_yaml(yaml_content: str) -> str:
+    """
+    Normalize YAML text so cosmetic differences do not change the cache key.
+    Line endings are unified and trailing whitespace/blank lines are dropped.
+    """
+    lines = yaml_content.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    return '\n'.join(line.rstrip() for line in lines).strip('\n')
+
+def make_cache_key(yaml_content: str, rendercv_version: Optional[str] = None) -> str:
+    """
+    Build the cache key from the normalized YAML and the RenderCV version.
+    """
+    if rendercv_version is None:
+        rendercv_version = get_rendercv_version()
+    digest = hashlib.sha256()
+    digest.update(rendercv_version.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(normalize_yaml(yaml_content).encode('utf-8'))
+    return digest.hexdigest()
+
+class RenderCache:
+    """
+    LRU cache of rendered PDFs stored on disk, bounded by entry count and size.
+    """
+
+    def __init__(self, cache_dir: str = "render_cache", max_entries: int = 50,
+                 max_bytes: int = 200 * 1024 * 1024):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.rendercv_version = get_rendercv_version()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> size in bytes, least recent first
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_existing()
+
+    def _load_existing(self):
+        """Index PDFs left over from a previous run, oldest access first."""
+        found = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.pdf'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            found.append((stat.st_mtime, name[:-4], stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+        self._evict()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pdf")
+
+    def key_for(self, yaml_content: str) -> str:
+        """Return the cache key for a YAML document."""
+        return make_cache_key(yaml_content, self.rendercv_version)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Return the cached PDF path for a key, or None on a miss.
+        """
+        with self._lock:
+            path = self._path(key)
+            if key in self._entries and os.path.exists(path):
+                self._entries.move_to_end(key)
+                try:
+                    os.utime(path, None)
+                except OSError:
+                    pass
+                self.hits += 1
+                return path
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+    def put(self, key: str, pdf_path: str) -> Optional[str]:
+        """
+        Copy a freshly rendered PDF into the cache and return the cached path.
+        """
+        with self._lock:
+            path = self._path(key)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            try:
+                shutil.copyfile(pdf_path, tmp_path)
+                os.replace(tmp_path, path)
+                size = os.path.getsize(path)
+            except OSError as e:
+                print(f"Render cache write failed: {e}")
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return None
+            self._entries[key] = size
+            self._entries.move_to_end(key)
+            self._evict()
+            return path if key in self._entries else None
+
+    def _evict(self):
+        """Drop least recently used entries until both limits are satisfied."""
+        total = sum(self._entries.values())
+        while self._entries and (len(self._entries) > self.max_entries or total > self.max_bytes):
+            key, size = self._entries.popitem(last=False)
+            total -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def clear(self):
+        """Remove every cached PDF."""
+        with self._lock:
+            for key in list(self._entries):
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss counters and current cache usage.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': sum(self._entries.values()),
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'rendercv_version': self.rendercv_version
+            }
@@ -0,0 +1,80 @@
+"""
+Server-Sent Events broker for render progress.
+The render path publishes render-started / render-finished / render-failed
+events and every connected browser receives them on its own queue.
+"""
+
+from typing import Dict, Any, Iterator
+import json
+import queue
+import threading
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """
+    Format a single Server-Sent Events message.
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+class RenderEventBroker:
+    """
+    Fan out render events to every subscribed client.
+    """
+
+    def __init__(self, max_queue: int = 100, heartbeat: float = 15.0):
+        self.max_queue = max_queue
+        self.heartbeat = heartbeat
+        self.published = 0
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> queue.Queue:
+        """Register a new client and return its event queue."""
+        subscriber = queue.Queue(maxsize=self.max_queue)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: queue.Queue):
+        """Forget a disconnected client."""
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, event: str, data: Dict[str, Any]):
+        """
+        Send an event to every client. Slow clients that fall behind lose
+        their oldest events rather than blocking the render path.
+        """
+        message = format_sse(event, data)
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self.published += 1
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(message)
+            except queue.Full:
+                try:
+                    subscriber.get_nowait()
+                    subscriber.put_nowait(message)
+                except (queue.Empty, queue.Full):
+                    pass
+
+    def stream(self) -> Iterator[str]:
+        """
+        Yield SSE messages for one client until it disconnects.
+        """
+        subscriber = self.subscribe()
+        try:
+            yield format_sse("connected", {"subscribers": self.subscriber_count})
+            while True:
+                try:
+                    yield subscriber.get(timeout=self.heartbeat)
+                except queue.Empty:
+                    # Comment line keeps proxies and the browser from timing out
+                    yield ": keep-alive\n\n"
+        finally:
+            self.unsubscribe(subscriber)
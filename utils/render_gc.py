@@ -0,0 +1,191 @@
+"""
+Bounded garbage collection for temporary render directories.
+A background sweeper keeps `temp_renders/render_<timestamp>/` (and other
+prefixed directories, such as exports) within an age, count and size budget
+while never touching renders that are still in use.
+"""
+
+from typing import Dict, Any, Callable, Iterable, Optional, Tuple, Union
+import os
+import shutil
+import threading
+import time
+
+def directory_size(path: str) -> int:
+    """
+    Total size in bytes of all files below a directory.
+    """
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+class RenderSweeper:
+    """
+    Delete old render directories by maximum age, count and total bytes.
+    A limit of 0 disables that limit.
+    """
+
+    def __init__(self, temp_dir: str, max_age: float = 24 * 3600, max_count: int = 20,
+                 max_bytes: int = 500 * 1024 * 1024, interval: float = 60,
+                 protected: Optional[Callable[[], Iterable[str]]] = None,
+                 prefix: Union[str, Tuple[str, ...]] = "render_"):
+        self.temp_dir = temp_dir
+        self.max_age = max_age
+        self.max_count = max_count
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.protected = protected or (lambda: ())
+        self.prefix = prefix
+        self.sweeps = 0
+        self.deleted = 0
+        self.freed_bytes = 0
+        self.last_sweep = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def sweep(self) -> Dict[str, Any]:
+        """
+        Run one collection pass and return what was kept and deleted.
+        """
+        with self._lock:
+            protected = {os.path.abspath(path) for path in self.protected() if path}
+            now = time.time()
+
+            renders = []
+            try:
+                names = os.listdir(self.temp_dir)
+            except OSError:
+                names = []
+            for name in names:
+                path = os.path.join(self.temp_dir, name)
+                if not name.startswith(self.prefix) or not os.path.isdir(path):
+                    continue
+                try:
+                    mtime = os.path.getmtime(path)
+                except OSError:
+                    continue
+                renders.append((mtime, path, directory_size(path)))
+
+            # Newest first: the count and byte budgets are spent on recent renders
+            renders.sort(reverse=True)
+            kept_count = 0
+            kept_bytes = 0
+            deleted = []
+            for mtime, path, size in renders:
+                over_age = self.max_age and now - mtime > self.max_age
+                over_count = self.max_count and kept_count >= self.max_count
+                over_bytes = self.max_bytes and kept_bytes + size > self.max_bytes
+                if os.path.abspath(path) in protected or not (over_age or over_count or over_bytes):
+                    kept_count += 1
+                    kept_bytes += size
+                    continue
+                shutil.rmtree(path, ignore_errors=True)
+                deleted.append(os.path.basename(path))
+                self.deleted += 1
+                self.freed_bytes += size
+
+            self.sweeps += 1
+            self.last_sweep = {
+                "time": now,
+                "kept": kept_count,
+                "kept_bytes": kept_bytes,
+                "deleted": deleted
+            }
+            if deleted:
+                print(f"🧹 Removed {len(deleted)} old render directories")
+            return self.last_sweep
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"Render sweep failed: {e}")
+
+    def start(self):
+        """Start sweeping in a background thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="render-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread."""
+        self._stop.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get the retention policy and sweep counters.
+        """
+        return {
+            'max_age': self.max_age,
+            'max_count': self.max_count,
+            'max_bytes': self.max_bytes,
+            'interval': self.interval,
+            'sweeps': self.sweeps,
+            'deleted': self.deleted,
+            'freed_bytes': self.freed_bytes,
+            'last_sweep': self.last_sweep
+        }
+
+class SweeperGroup:
+    """
+    Run the sweeps of many RenderSweepers (one per session directory) on a
+    single background thread instead of one thread each.
+    """
+
+    def __init__(self, interval: float = 60):
+        self.interval = interval
+        self._sweepers = []
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def add(self, sweeper: RenderSweeper):
+        with self._lock:
+            if sweeper not in self._sweepers:
+                self._sweepers.append(sweeper)
+
+    def remove(self, sweeper: RenderSweeper):
+        with self._lock:
+            if sweeper in self._sweepers:
+                self._sweepers.remove(sweeper)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                sweepers = list(self._sweepers)
+            for sweeper in sweepers:
+                try:
+                    sweeper.sweep()
+                except Exception as e:
+                    print(f"Render sweep failed: {e}")
+
+    def start(self):
+        """Start sweeping in a background thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="render-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread."""
+        self._stop.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get the number of swept directories.
+        """
+        with self._lock:
+            return {
+                'directories': len(self._sweepers),
+                'interval': self.interval
+            }
@@ -0,0 +1,111 @@
+"""
+Persistent index of past renders.
+Maps render ids (timestamps) to their PDF artifacts so any render still on
+disk can be served, and keeps the index in a JSON file across restarts.
+"""
+
+from typing import Dict, Any, List, Optional
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+class RenderHistory:
+    """
+    Bounded, persisted mapping of render id -> artifact record.
+    """
+
+    def __init__(self, index_path: str, max_entries: int = 200):
+        self.index_path = index_path
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # oldest first
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """Load the index from disk, dropping renders whose PDF is gone."""
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as file:
+                records = json.load(file)
+        except (OSError, ValueError) as e:
+            print(f"Render history could not be loaded: {e}")
+            return
+        for record in records:
+            if os.path.exists(record.get("pdf_path", "")):
+                self._entries[record["id"]] = record
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _persist(self):
+        """Write the index atomically. Called with the lock held."""
+        tmp_path = f"{self.index_path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                json.dump(list(self._entries.values()), file)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"Render history could not be saved: {e}")
+
+    def add(self, render_id: str, pdf_path: str, temp_dir: Optional[str] = None,
+            duration: Optional[float] = None, profile: str = "preview",
+            cached: bool = False) -> Dict[str, Any]:
+        """
+        Record a finished render and return its record.
+        """
+        try:
+            size = os.path.getsize(pdf_path)
+        except OSError:
+            size = None
+        record = {
+            "id": render_id,
+            "pdf_path": os.path.abspath(pdf_path),
+            "temp_dir": os.path.abspath(temp_dir) if temp_dir else None,
+            "created_at": datetime.now().isoformat(),
+            "duration_ms": round(duration * 1000, 1) if duration is not None else None,
+            "size_bytes": size,
+            "profile": profile,
+            "cached": cached
+        }
+        with self._lock:
+            self._entries[render_id] = record
+            self._entries.move_to_end(render_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._persist()
+        return record
+
+    def get(self, render_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the record of a retained render, or None if unknown or deleted.
+        """
+        with self._lock:
+            record = self._entries.get(render_id)
+            if record is None:
+                return None
+            if not os.path.exists(record["pdf_path"]):
+                # The artifact was garbage collected
+                del self._entries[render_id]
+                self._persist()
+                return None
+            return record
+
+    def list(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        List retained renders, newest first, pruning any whose PDF is gone.
+        """
+        with self._lock:
+            missing = [render_id for render_id, record in self._entries.items()
+                       if not os.path.exists(record["pdf_path"])]
+            for render_id in missing:
+                del self._entries[render_id]
+            if missing:
+                self._persist()
+            records = list(reversed(self._entries.values()))
+        return records[:limit] if limit else records
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,136 @@
+"""
+Shared, bounded pool of render workers with fair scheduling between sessions.
+Each pool thread owns one resident RenderWorker. Jobs are queued per session
+and sessions are served round-robin, with at most `max_per_session` jobs of a
+session running at once, so one busy session cannot starve the others.
+"""
+
+from typing import Dict, Any, Callable, Optional
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+
+from utils.render_worker import RenderWorker
+
+class RenderPool:
+    """
+    Run render jobs on a fixed set of RenderWorker-owning threads.
+    """
+
+    def __init__(self, size: int = 2, max_per_session: int = 1,
+                 worker_factory: Callable[[], RenderWorker] = RenderWorker, start: bool = True):
+        self.size = max(1, size)
+        self.max_per_session = max(1, max_per_session)
+        self.completed = 0
+        self.workers = [worker_factory() for _ in range(self.size)]
+        self._queues = OrderedDict()  # session id -> deque of jobs, round-robin order
+        self._active = {}  # session id -> running job count
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._stopping = False
+        self._threads = []
+        if start:
+            self.start()
+
+    def start(self):
+        """
+        Start the pool threads, which warm up their workers. Called by the
+        first submit() if the pool was created with start=False.
+        """
+        with self._cond:
+            if self._threads or self._stopping:
+                return
+            for index, worker in enumerate(self.workers):
+                thread = threading.Thread(target=self._run, args=(worker,),
+                                          name=f"render-pool-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, session_id: str, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Queue `fn(*args, **kwargs)` for a session and return its Future.
+        """
+        self.start()
+        future = Future()
+        with self._cond:
+            if self._stopping:
+                raise RuntimeError("render pool is shut down")
+            self._queues.setdefault(session_id, deque()).append((future, fn, args, kwargs))
+            self._cond.notify()
+        return future
+
+    def current_worker(self) -> Optional[RenderWorker]:
+        """The RenderWorker owned by the calling pool thread, if any."""
+        return getattr(self._local, "worker", None)
+
+    def _next_job(self):
+        """Pick the next job round-robin across sessions. Called with _cond held."""
+        for session_id in list(self._queues):
+            if self._active.get(session_id, 0) >= self.max_per_session:
+                continue
+            jobs = self._queues[session_id]
+            while jobs:
+                future, fn, args, kwargs = jobs.popleft()
+                if future.set_running_or_notify_cancel():
+                    if jobs:
+                        self._queues.move_to_end(session_id)
+                    else:
+                        del self._queues[session_id]
+                    self._active[session_id] = self._active.get(session_id, 0) + 1
+                    return session_id, future, fn, args, kwargs
+            del self._queues[session_id]
+        return None
+
+    def _run(self, worker: RenderWorker):
+        self._local.worker = worker
+        # Warm the worker up before the first render reaches it
+        worker.start()
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None and not self._stopping:
+                    self._cond.wait()
+                    job = self._next_job()
+                if job is None:
+                    return
+            session_id, future, fn, args, kwargs = job
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                with self._cond:
+                    self._active[session_id] -= 1
+                    if not self._active[session_id]:
+                        del self._active[session_id]
+                    self.completed += 1
+                    self._cond.notify_all()
+
+    def shutdown(self):
+        """Stop the pool threads and their workers."""
+        with self._cond:
+            self._stopping = True
+            for jobs in self._queues.values():
+                for future, _, _, _ in jobs:
+                    future.cancel()
+            self._queues.clear()
+            self._cond.notify_all()
+        for worker in self.workers:
+            worker.stop()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get queue depth, running jobs and the state of every worker.
+        """
+        with self._cond:
+            queued = {session_id: len(jobs) for session_id, jobs in self._queues.items()}
+            active = dict(self._active)
+        return {
+            'size': self.size,
+            'max_per_session': self.max_per_session,
+            'queue_depth': sum(queued.values()),
+            'sessions_queued': len(queued),
+            'running': sum(active.values()),
+            'completed': self.completed,
+            'workers': [worker.get_stats() for worker in self.workers]
+        }
@@ -0,0 +1,71 @@
+"""
+Render profiles and per-profile timing statistics.
+The interactive preview only needs the PDF, so it skips RenderCV's Markdown,
+HTML and PNG outputs; the export profile produces every output format.
+"""
+
+from typing import Dict, Any, List
+import threading
+
+RENDER_PROFILES = {
+    "preview": {
+        "description": "PDF only, for the live preview",
+        "args": ["--dont-generate-markdown", "--dont-generate-html", "--dont-generate-png"]
+    },
+    "export": {
+        "description": "PDF, Typst, Markdown, HTML and PNG outputs",
+        "args": []
+    }
+}
+
+def render_args(yaml_filename: str, profile: str = "preview") -> List[str]:
+    """
+    Build the RenderCV command arguments for a profile.
+    """
+    if profile not in RENDER_PROFILES:
+        raise ValueError(f"Unknown render profile: {profile}")
+    return ["render", yaml_filename] + RENDER_PROFILES[profile]["args"]
+
+class RenderTimings:
+    """
+    Collect render durations per profile so the profiles can be compared.
+    """
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, profile: str, seconds: float, success: bool = True):
+        """Record one render duration."""
+        with self._lock:
+            stats = self._stats.setdefault(profile, {
+                'count': 0, 'failures': 0, 'total': 0.0,
+                'min': None, 'max': None, 'last': None
+            })
+            stats['count'] += 1
+            if not success:
+                stats['failures'] += 1
+            stats['total'] += seconds
+            stats['min'] = seconds if stats['min'] is None else min(stats['min'], seconds)
+            stats['max'] = seconds if stats['max'] is None else max(stats['max'], seconds)
+            stats['last'] = seconds
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get count, failures and mean/min/max/last duration (ms) per profile.
+        """
+        def ms(value):
+            return round(value * 1000, 1) if value is not None else None
+
+        with self._lock:
+            return {
+                profile: {
+                    'count': stats['count'],
+                    'failures': stats['failures'],
+                    'mean_ms': ms(stats['total'] / stats['count']),
+                    'min_ms': ms(stats['min']),
+                    'max_ms': ms(stats['max']),
+                    'last_ms': ms(stats['last'])
+                }
+                for profile, stats in self._stats.items()
+            }
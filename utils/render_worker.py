@@ -0,0 +1,302 @@
+"""
+Long-lived RenderCV worker process.
+Keeps RenderCV, pydantic and Typst imported in a resident child process and
+feeds it render jobs over a JSON-lines pipe, so each preview render skips
+interpreter startup and module imports. Falls back to a one-off
+`python -m rendercv` subprocess if the worker cannot start or crashes.
+"""
+
+from typing import Dict, Any, List, Optional
+import contextlib
+import io
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import traceback
+
+# Put on the response queue when the worker's stdout closes, so that a
+# crash is never mistaken for a timeout
+WORKER_EXITED = object()
+
+class RenderCancelled(Exception):
+    """Raised when an in-flight render is cancelled in favour of a newer one."""
+
+class RenderWorker:
+    """
+    Client side of the resident RenderCV worker with crash recovery.
+    """
+
+    def __init__(self, timeout: int = 15, startup_timeout: int = 60,
+                 enabled: bool = True, max_start_failures: int = 3):
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+        self.enabled = enabled
+        self.max_start_failures = max_start_failures
+        self.jobs = 0
+        self.restarts = 0
+        self.crashes = 0
+        self.fallbacks = 0
+        self.cancellations = 0
+        self._start_failures = 0
+        self._process = None
+        self._responses = None
+        self._lock = threading.Lock()
+        # Guards the in-flight job so cancel() can run while run() holds _lock
+        self._job_lock = threading.Lock()
+        self._busy = False
+        self._cancelled = False
+        self._subprocess = None
+
+    def is_alive(self) -> bool:
+        """Check whether the resident worker process is running."""
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> bool:
+        """
+        Start the worker if needed and wait until RenderCV is imported.
+        """
+        with self._lock:
+            return self._ensure_started()
+
+    def _ensure_started(self) -> bool:
+        if self.is_alive():
+            return True
+        if not self.enabled or self._start_failures >= self.max_start_failures:
+            return False
+
+        if self._process is not None:
+            self.restarts += 1
+        self._stop_process()
+
+        try:
+            self._process = subprocess.Popen(
+                [sys.executable, "-m", "utils.render_worker"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                encoding='utf-8',
+                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            )
+        except OSError as e:
+            print(f"Render worker failed to start: {e}")
+            self._start_failures += 1
+            return False
+
+        # Read responses on a thread so waits can time out on every platform
+        self._responses = queue.Queue()
+        threading.Thread(
+            target=self._read_responses,
+            args=(self._process.stdout, self._responses),
+            daemon=True
+        ).start()
+
+        ready = self._next_response(self.startup_timeout)
+        if ready is WORKER_EXITED:
+            ready = {"error": "worker exited"}
+        if not ready or not ready.get("ready"):
+            error = ready.get("error") if ready else "no response"
+            print(f"Render worker failed to start: {error}")
+            self._start_failures += 1
+            self._stop_process()
+            return False
+
+        self._start_failures = 0
+        print(f"Render worker ready (pid {self._process.pid})")
+        return True
+
+    @staticmethod
+    def _read_responses(stream, responses):
+        for line in stream:
+            try:
+                responses.put(json.loads(line))
+            except ValueError:
+                continue
+        responses.put(WORKER_EXITED)
+
+    def _next_response(self, timeout: float):
+        """The next response, WORKER_EXITED, or None if `timeout` passed first."""
+        try:
+            return self._responses.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def run(self, args: List[str], cwd: str, timeout: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Run a RenderCV command (e.g. ["render", "cv.yaml"]) in the given directory.
+        Returns a dict with returncode, stdout, stderr and the path used.
+        Raises subprocess.TimeoutExpired if the render takes too long and
+        RenderCancelled if cancel() was called while it was running.
+        """
+        timeout = timeout or self.timeout
+        with self._lock:
+            self.jobs += 1
+            with self._job_lock:
+                self._busy = True
+                self._cancelled = False
+            try:
+                if self._ensure_started():
+                    try:
+                        result = self._run_in_worker(args, cwd, timeout)
+                    except (BrokenPipeError, OSError, EOFError) as e:
+                        # Worker died mid-job: restart it on the next call
+                        self._stop_process()
+                        self.crashes += 1
+                        print(f"Render worker crashed ({e}), falling back to subprocess")
+                    else:
+                        # A cancelled job is left to finish so the worker stays warm
+                        if self._cancelled:
+                            raise RenderCancelled()
+                        return result
+                if self._cancelled:
+                    raise RenderCancelled()
+                self.fallbacks += 1
+                return self._run_subprocess(args, cwd, timeout)
+            finally:
+                with self._job_lock:
+                    self._busy = False
+                    self._subprocess = None
+
+    def cancel(self) -> bool:
+        """
+        Cancel the render currently in flight, if any. A fallback subprocess
+        is killed; a job on the resident worker runs to completion and run()
+        discards its result, so the warm worker is never lost to a cancel.
+        Returns True if a render was cancelled.
+        """
+        with self._job_lock:
+            if not self._busy or self._cancelled:
+                return False
+            self._cancelled = True
+            self.cancellations += 1
+            process = self._subprocess
+        if process is not None and process.poll() is None:
+            process.kill()
+        return True
+
+    def _run_in_worker(self, args, cwd, timeout):
+        job = {"args": args, "cwd": os.path.abspath(cwd)}
+        self._process.stdin.write(json.dumps(job) + "\n")
+        self._process.stdin.flush()
+
+        result = self._next_response(timeout)
+        if result is WORKER_EXITED:
+            raise EOFError("render worker exited")
+        if result is None:
+            # Stuck render: kill the worker so the next job gets a fresh one
+            self._stop_process()
+            raise subprocess.TimeoutExpired(args, timeout)
+        result["worker"] = "resident"
+        return result
+
+    def _run_subprocess(self, args, cwd, timeout):
+        cmd = [sys.executable, "-m", "rendercv"] + list(args)
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                   text=True, cwd=cwd)
+        with self._job_lock:
+            self._subprocess = process
+            cancelled = self._cancelled
+        if cancelled:
+            process.kill()
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise
+        if self._cancelled:
+            raise RenderCancelled()
+        return {
+            "returncode": process.returncode,
+            "stdout": stdout,
+            "stderr": stderr,
+            "worker": "subprocess"
+        }
+
+    def _stop_process(self):
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        if process.poll() is None:
+            process.kill()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+
+    def stop(self):
+        """Shut the worker down."""
+        with self._lock:
+            self._stop_process()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get worker state and job counters.
+        """
+        return {
+            'alive': self.is_alive(),
+            'pid': self._process.pid if self.is_alive() else None,
+            'jobs': self.jobs,
+            'restarts': self.restarts,
+            'crashes': self.crashes,
+            'fallbacks': self.fallbacks,
+            'cancellations': self.cancellations
+        }
+
+def _run_job(cli, job: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one RenderCV CLI invocation in-process, capturing its output."""
+    stdout, stderr = io.StringIO(), io.StringIO()
+    original_cwd = os.getcwd()
+    returncode = 0
+    try:
+        os.chdir(job["cwd"])
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                result = cli.app(args=job["args"], prog_name="rendercv", standalone_mode=False)
+                if isinstance(result, int):
+                    returncode = result
+            except SystemExit as e:
+                returncode = e.code if isinstance(e.code, int) else 1
+            except Exception:
+                traceback.print_exc()
+                returncode = 1
+    except OSError as e:
+        stderr.write(f"Render worker error: {e}\n")
+        returncode = 1
+    finally:
+        os.chdir(original_cwd)
+    return {"returncode": returncode, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+def main():
+    """Worker entry point: answer JSON render jobs read from stdin."""
+    # Keep the protocol channel private; anything else printed to fd 1 goes to stderr
+    channel = os.fdopen(os.dup(sys.stdout.fileno()), 'w', encoding='utf-8')
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    def send(message):
+        channel.write(json.dumps(message) + "\n")
+        channel.flush()
+
+    try:
+        from rendercv import cli
+        if not hasattr(cli, "app"):
+            raise ImportError("RenderCV is only partially installed")
+    except Exception as e:
+        send({"ready": False, "error": str(e)})
+        return
+
+    send({"ready": True})
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        send(_run_job(cli, json.loads(line)))
+
+if __name__ == "__main__":
+    main()
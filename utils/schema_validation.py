@@ -0,0 +1,169 @@
+"""
+In-process RenderCV schema validation.
+Checks a parsed CV against RenderCV's data model before any render is
+started, so structural mistakes (wrong entry types, bad dates, unknown
+themes) come back as field-level errors in milliseconds instead of as
+stderr from a failed render. Results are cached per content hash.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+import ast
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from utils.yaml_cache import thaw
+
+def _literal(text: str) -> Any:
+    """Evaluate a Python literal, or return None if `text` is not one."""
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return None
+
+def _custom_error(args: Any) -> Optional[Tuple[str, str, Any]]:
+    """
+    Split a RenderCV custom error, raised as (message, location, input) with
+    the message sometimes wrapped in further tuples, into its three parts.
+    Returns None if `args` is not such a tuple.
+    """
+    if not isinstance(args, tuple) or len(args) != 3:
+        return None
+    message, location, value = args
+    while isinstance(message, tuple) and message:
+        message = message[0]
+    return str(message), str(location or ""), value
+
+class SchemaValidator:
+    """
+    Validate CV documents with RenderCV's data model, caching by content hash.
+    When RenderCV cannot be imported validation is skipped and every document
+    is reported as valid, leaving the render to surface any problems.
+    """
+
+    def __init__(self, max_entries: int = 128, enabled: bool = True):
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.invalid = 0
+        self.total_seconds = 0.0
+        self._results = OrderedDict()  # content hash -> list of errors
+        self._lock = threading.Lock()
+        self._validate = None
+        self._parse_errors = None
+        self._validation_error = None
+
+    def _load_rendercv(self) -> bool:
+        """Import RenderCV's validator lazily; it takes ~0.5 s to import."""
+        if self._validate is not None:
+            return True
+        try:
+            import pydantic
+            from rendercv.data import (parse_validation_errors,
+                                       validate_input_dictionary_and_return_the_data_model)
+        except ImportError as e:
+            print(f"⚠️  RenderCV schema validation unavailable: {e}")
+            self.enabled = False
+            return False
+        self._validation_error = pydantic.ValidationError
+        self._parse_errors = parse_validation_errors
+        self._validate = validate_input_dictionary_and_return_the_data_model
+        return True
+
+    def warm_up(self):
+        """Import RenderCV in the background so the first save does not pay for it."""
+        if self.enabled:
+            threading.Thread(target=self._load_rendercv, name="schema-warm-up", daemon=True).start()
+
+    def validate(self, yaml_content: str, data: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Return the field-level errors of a document (an empty list if valid).
+        `data` is the already parsed (possibly frozen) document, if the caller has it.
+        """
+        if not self.enabled:
+            return []
+        key = hashlib.sha256(yaml_content.encode("utf-8")).hexdigest()
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return self._results[key]
+            self.misses += 1
+        if not self._load_rendercv():
+            return []
+
+        started = time.perf_counter()
+        errors = self._check(yaml_content, data)
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            self.total_seconds += elapsed
+            if errors:
+                self.invalid += 1
+            self._results[key] = errors
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+        return errors
+
+    def _check(self, yaml_content: str, data: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if data is None:
+            import yaml
+            data = yaml.safe_load(yaml_content)
+        # RenderCV expects plain dicts and lists
+        data = thaw(data)
+        if not isinstance(data, dict):
+            return [{"field": "", "message": "The CV must be a mapping with a `cv` key",
+                     "input": None, "line": 1, "column": 1}]
+        try:
+            self._validate(data)
+            return []
+        except self._validation_error as e:
+            try:
+                parsed = self._parse_errors(e, yaml_content)
+            except Exception:
+                # Locating errors in the YAML text is best-effort
+                parsed = self._parse_errors(e)
+            return [self._format_error(error) for error in parsed]
+        except Exception as e:
+            # Validators that raise plain exceptions (e.g. a bad custom theme)
+            message, field, value = _custom_error(e.args) or (str(e), "", None)
+            return [{"field": field, "message": message, "input": value or None,
+                     "line": None, "column": None}]
+
+    @staticmethod
+    def _format_error(error: Dict[str, Any]) -> Dict[str, Any]:
+        location = error.get("yaml_loc")
+        field = ".".join(str(part) for part in error.get("loc", ()))
+        message = str(error.get("msg", ""))
+        value = error.get("input")
+        # RenderCV cannot unpack some of its own custom errors and passes on
+        # the repr of their (message, location, input) tuple
+        custom = _custom_error(_literal(message)) if message.startswith("(") else None
+        if custom:
+            message, custom_field, value = custom
+            field = ".".join(part for part in (field, custom_field) if part)
+        return {
+            "field": field,
+            "message": message,
+            "input": value or None,
+            "line": location[0][0] if location else None,
+            "column": location[0][1] if location else None
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache hit rate, invalid document count and mean validation time.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'invalid': self.invalid,
+                'entries': len(self._results),
+                'mean_ms': round(self.total_seconds / self.misses * 1000, 1) if self.misses else None
+            }
@@ -0,0 +1,48 @@
+"""
+Line-based text deltas for incremental saves.
+The browser sends only the lines that changed since the last revision the
+server acknowledged, plus a checksum of the full new text; the server
+rebuilds the document from its copy and verifies the checksum.
+"""
+
+from typing import Any, Dict, List
+from difflib import SequenceMatcher
+import hashlib
+
+def content_revision(text: str) -> str:
+    """Revision id of a document: the SHA-256 of its UTF-8 text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def apply_line_patch(base: str, hunks: List[Dict[str, Any]]) -> str:
+    """
+    Apply hunks of the form {"start": line, "delete": count, "insert": [lines]}
+    to `base`. Line numbers refer to `base` split on "\\n" and hunks must be
+    sorted and non-overlapping. Raises ValueError on a malformed patch.
+    """
+    if not isinstance(hunks, list):
+        raise ValueError("patch must be a list of hunks")
+    lines = base.split("\n")
+    result = []
+    position = 0
+    for hunk in hunks:
+        if not isinstance(hunk, dict):
+            raise ValueError("hunk must be an object")
+        start, delete, insert = hunk.get("start"), hunk.get("delete", 0), hunk.get("insert", [])
+        if not isinstance(start, int) or not isinstance(delete, int) or start < position or delete < 0:
+            raise ValueError("hunks must be sorted and non-overlapping")
+        if start + delete > len(lines):
+            raise ValueError("hunk extends past the end of the base revision")
+        if not isinstance(insert, list) or not all(isinstance(line, str) for line in insert):
+            raise ValueError("hunk insert must be a list of strings")
+        result.extend(lines[position:start])
+        result.extend(insert)
+        position = start + delete
+    result.extend(lines[position:])
+    return "\n".join(result)
+
+def line_patch(base: str, text: str) -> List[Dict[str, Any]]:
+    """Hunks turning `base` into `text`: the inverse of apply_line_patch."""
+    old_lines, new_lines = base.split("\n"), text.split("\n")
+    matcher = SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    return [{"start": i1, "delete": i2 - i1, "insert": new_lines[j1:j2]}
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != "equal"]
@@ -0,0 +1,198 @@
+"""
+Structural diff of YAML documents for suggestions.
+A line diff of a re-serialized CV is dominated by quoting and wrapping
+noise. This compares the parsed trees instead: mappings by key (and key
+order), lists by entry identity (company, institution, name, ...), and reports only the
+nodes that changed. Each change is turned into a line hunk against the
+original text, in the same {"start", "delete", "insert"} form as
+utils.text_delta, so the editor can highlight it in place.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from collections.abc import Mapping
+from difflib import SequenceMatcher
+
+import yaml
+
+from utils.text_delta import line_patch
+from utils.yaml_cache import YAML_LOADER
+from utils.yaml_patch import format_pointer
+
+# Fields that identify a list entry even when its other fields change
+IDENTITY_KEYS = ("company", "institution", "name", "label", "title", "date")
+
+def _is_list(value) -> bool:
+    return isinstance(value, (list, tuple))
+
+def _identity(value):
+    """Hashable identity of a list entry, used to match entries across versions."""
+    if isinstance(value, Mapping):
+        for key in IDENTITY_KEYS:
+            if isinstance(value.get(key), (str, int, float)):
+                return (key, value[key])
+    if isinstance(value, (str, int, float, bool, type(None))):
+        return ("scalar", value)
+    return ("value", repr(value))
+
+def diff_trees(old, new) -> List[Dict[str, Any]]:
+    """
+    Compare two parsed documents. Returns changes of the form
+    {"op": "add" | "remove" | "replace", "old_path": tokens, "new_path": tokens,
+    "anchor": (tokens, "before" | "after")}; adds carry an anchor in the old
+    document telling where the new node goes.
+    """
+    changes = []
+    _diff(old, new, (), (), changes)
+    return changes
+
+def same_tree(first, second) -> bool:
+    """Deep equality that, unlike ==, also compares key order and value types."""
+    return not diff_trees(first, second)
+
+def _diff(old, new, old_path, new_path, changes):
+    if isinstance(old, Mapping) and isinstance(new, Mapping):
+        _diff_mapping(old, new, old_path, new_path, changes)
+    elif _is_list(old) and _is_list(new):
+        _diff_list(old, new, old_path, new_path, changes)
+    elif type(old) is not type(new) or old != new:
+        changes.append({"op": "replace", "old_path": old_path, "new_path": new_path})
+
+def _diff_mapping(old, new, old_path, new_path, changes):
+    # Keys whose order changed are reported as removed and re-added
+    moved = set()
+    common_old = [key for key in old if key in new]
+    common_new = [key for key in new if key in old]
+    if common_old != common_new:
+        matcher = SequenceMatcher(None, common_old, common_new, autojunk=False)
+        kept = {common_old[block.a + offset] for block in matcher.get_matching_blocks()
+                for offset in range(block.size)}
+        moved = set(common_old) - kept
+
+    for key in old:
+        if key not in new or key in moved:
+            changes.append({"op": "remove", "old_path": old_path + (key,), "new_path": None})
+    keys = list(new)
+    for index, key in enumerate(keys):
+        if key in old and key not in moved:
+            _diff(old[key], new[key], old_path + (key,), new_path + (key,), changes)
+            continue
+        # Insert before the next key that stays in place, else at the end
+        following = next((later for later in keys[index + 1:] if later in old and later not in moved), None)
+        anchor = (old_path + (following,), "before") if following is not None else (old_path, "after")
+        changes.append({"op": "add", "old_path": None, "new_path": new_path + (key,), "anchor": anchor})
+
+def _diff_list(old, new, old_path, new_path, changes):
+    matcher = SequenceMatcher(None, [_identity(item) for item in old],
+                              [_identity(item) for item in new], autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal" or (tag == "replace" and i2 - i1 == j2 - j1):
+            for offset in range(i2 - i1):
+                _diff(old[i1 + offset], new[j1 + offset],
+                      old_path + (i1 + offset,), new_path + (j1 + offset,), changes)
+            continue
+        for i in range(i1, i2):
+            changes.append({"op": "remove", "old_path": old_path + (i,), "new_path": None})
+        anchor = (old_path + (i2,), "before") if i2 < len(old) else (old_path, "after")
+        for j in range(j1, j2):
+            changes.append({"op": "add", "old_path": None, "new_path": new_path + (j,), "anchor": anchor})
+
+def line_ranges(text: str) -> Dict[Tuple[str, ...], Tuple[int, int]]:
+    """
+    Map every node path (tokens as strings) to its 0-based, inclusive line
+    range in `text`. A mapping entry's range starts at its key.
+    """
+    ranges = {}
+    root = yaml.compose(text, Loader=YAML_LOADER)
+    if root is not None:
+        _walk(root, (), ranges)
+    return ranges
+
+def _walk(node, path, ranges) -> int:
+    """Record the ranges below `node` and return its last line."""
+    if isinstance(node, yaml.MappingNode):
+        end = node.end_mark.line
+        for key_node, value_node in node.value:
+            child = path + (str(key_node.value),)
+            end = _walk(value_node, child, ranges)
+            ranges[child] = (key_node.start_mark.line, end)
+    elif isinstance(node, yaml.SequenceNode):
+        end = node.end_mark.line
+        for index, item in enumerate(node.value):
+            end = _walk(item, path + (str(index),), ranges)
+    else:
+        end = node.end_mark.line
+        # Block scalars end at the start of the following line
+        if node.end_mark.column == 0 and end > node.start_mark.line:
+            end -= 1
+    ranges[path] = (node.start_mark.line, end)
+    return end
+
+def _line_hunks(old_text: str, new_text: str) -> List[Dict[str, Any]]:
+    """Fallback for documents that do not parse: a plain line diff."""
+    return [dict(hunk, op="lines", path=None) for hunk in line_patch(old_text, new_text)]
+
+def diff_documents(old_text: str, new_text: str,
+                   load: Optional[Callable[[str], Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Structural diff of two YAML texts as sorted, non-overlapping line hunks:
+    {"op", "path", "start", "delete", "insert"}, where `start` and `delete`
+    address lines of `old_text` and `insert` holds lines of `new_text`.
+    `load` parses a text (e.g. ParsedDocCache.get); falls back to a line diff
+    when either text does not parse.
+    """
+    load = load or (lambda text: yaml.load(text, Loader=YAML_LOADER))
+    try:
+        changes = diff_trees(load(old_text), load(new_text))
+        old_ranges, new_ranges = line_ranges(old_text), line_ranges(new_text)
+        hunks = [_to_hunk(change, old_ranges, new_ranges) for change in changes]
+    except (yaml.YAMLError, KeyError):
+        return _line_hunks(old_text, new_text)
+
+    new_lines = new_text.split("\n")
+    merged = []
+    for hunk in sorted(hunks, key=lambda h: (h["start"], h["new_start"] if h["new_start"] is not None else -1)):
+        previous = merged[-1] if merged else None
+        # Several nodes on one line (flow style) produce overlapping hunks
+        if previous and hunk["start"] < previous["start"] + previous["delete"]:
+            end = max(previous["start"] + previous["delete"], hunk["start"] + hunk["delete"])
+            previous["delete"] = end - previous["start"]
+            spans = [span for span in ((previous["new_start"], previous["new_end"]),
+                                       (hunk["new_start"], hunk["new_end"])) if span[0] is not None]
+            if spans:
+                previous["new_start"] = min(span[0] for span in spans)
+                previous["new_end"] = max(span[1] for span in spans)
+            previous["op"], previous["path"] = "replace", _common_path(previous["path"], hunk["path"])
+            continue
+        merged.append(hunk)
+
+    return [{"op": hunk["op"], "path": hunk["path"], "start": hunk["start"], "delete": hunk["delete"],
+             "insert": new_lines[hunk["new_start"]:hunk["new_end"]] if hunk["new_start"] is not None else []}
+            for hunk in merged]
+
+def _key(path) -> Tuple[str, ...]:
+    return tuple(str(token) for token in path)
+
+def _common_path(first: str, second: str) -> str:
+    common = []
+    for a, b in zip(first.split("/"), second.split("/")):
+        if a != b:
+            break
+        common.append(a)
+    return "/".join(common)
+
+def _to_hunk(change, old_ranges, new_ranges) -> Dict[str, Any]:
+    op = change["op"]
+    hunk = {"op": op, "new_start": None, "new_end": None}
+    if change["new_path"] is not None:
+        start, end = new_ranges[_key(change["new_path"])]
+        hunk["new_start"], hunk["new_end"] = start, end + 1
+    if op == "add":
+        path, where = change["anchor"]
+        start, end = old_ranges[_key(path)]
+        hunk["start"], hunk["delete"] = (start if where == "before" else end + 1), 0
+        hunk["path"] = format_pointer(change["new_path"])
+    else:
+        start, end = old_ranges[_key(change["old_path"])]
+        hunk["start"], hunk["delete"] = start, end - start + 1
+        hunk["path"] = format_pointer(change["new_path"] if op == "replace" else change["old_path"])
+    return hunk
@@ -0,0 +1,136 @@
+"""
+Per-session workspaces for the editor.
+Each browser session gets its own CV file, render state and chat state while
+sharing one process (and one render pool) with every other session.
+"""
+
+from typing import Dict, Any, Callable, List, Optional
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+DEFAULT_SESSION = "default"
+SESSION_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+def new_session_id() -> str:
+    """
+    Generate a random session id that is safe to use as a directory name.
+    """
+    return uuid.uuid4().hex
+
+def is_valid_session_id(session_id: Optional[str]) -> bool:
+    """
+    Check that a session id (e.g. from a cookie) has the expected format.
+    """
+    return bool(session_id) and (session_id == DEFAULT_SESSION or
+                                 bool(SESSION_ID_PATTERN.fullmatch(session_id)))
+
+class Workspace:
+    """
+    The editor and chat state that belong to one session.
+    """
+
+    def __init__(self, session_id: str, editor, chat_manager):
+        self.session_id = session_id
+        self.editor = editor
+        self.chat_manager = chat_manager
+        self.created_at = time.time()
+        self.last_seen = self.created_at
+
+    def busy(self) -> bool:
+        """Whether the workspace has renders queued or running."""
+        busy = getattr(self.editor, "busy", None)
+        return bool(busy and busy())
+
+    def close(self):
+        """Release background resources held by the workspace."""
+        close = getattr(self.editor, "close", None)
+        if close:
+            close()
+
+class WorkspaceManager:
+    """
+    Create workspaces on demand and keep at most `max_sessions` in memory,
+    evicting the least recently used idle one. Workspaces with renders in
+    flight are never evicted, so the cap may be exceeded briefly. Evicted
+    sessions keep their files on disk and are recreated from them when the
+    session returns. Workspaces are built outside the lock; if two requests
+    build the same session at once, the first one stored wins and the other
+    is closed.
+    """
+
+    def __init__(self, factory: Callable[[str], Workspace], max_sessions: int = 50):
+        self.factory = factory
+        self.max_sessions = max_sessions
+        self.evictions = 0
+        self.deferred_evictions = 0
+        self.discarded_builds = 0
+        self._workspaces = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Workspace:
+        """Return the workspace for a session, creating it if needed."""
+        built = None
+        while True:
+            with self._lock:
+                if built is None:
+                    workspace = self._workspaces.get(session_id)
+                else:
+                    workspace = self._workspaces.setdefault(session_id, built)
+                if workspace is not None:
+                    evicted = self._touch(session_id, workspace)
+                    if built is not None and built is not workspace:
+                        # Another request built the same session first
+                        self.discarded_builds += 1
+                        evicted.append(built)
+                    break
+            # Build outside the lock: loading a session reads its files from
+            # disk, and requests for other sessions must not wait on that
+            built = self.factory(session_id)
+        for old in evicted:
+            old.close()
+        return workspace
+
+    def _touch(self, session_id: str, workspace: Workspace) -> List[Workspace]:
+        """Mark a workspace as used and unlink idle ones over the cap. Call with _lock held."""
+        self._workspaces.move_to_end(session_id)
+        workspace.last_seen = time.time()
+
+        evicted = []
+        excess = len(self._workspaces) - self.max_sessions
+        for old_id, old in list(self._workspaces.items()):
+            if excess <= 0 or old_id == session_id:
+                break
+            if old.busy():
+                self.deferred_evictions += 1
+                continue
+            del self._workspaces[old_id]
+            evicted.append(old)
+            self.evictions += 1
+            excess -= 1
+        return evicted
+
+    def snapshot(self) -> List[Workspace]:
+        """The live workspaces, for aggregate statistics."""
+        with self._lock:
+            return list(self._workspaces.values())
+
+    def __len__(self):
+        with self._lock:
+            return len(self._workspaces)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get the number of live sessions. Session ids are never exposed since
+        they act as the session credential.
+        """
+        with self._lock:
+            return {
+                'sessions': len(self._workspaces),
+                'max_sessions': self.max_sessions,
+                'evictions': self.evictions,
+                'deferred_evictions': self.deferred_evictions,
+                'discarded_builds': self.discarded_builds
+            }
@@ -0,0 +1,100 @@
+"""
+Shared cache of parsed YAML documents.
+The same CV text is parsed by saving, validation, quick edits, chat and
+export. This cache parses each revision once (with libyaml's C loader when
+PyYAML was built with it) and hands every consumer the same immutable view;
+callers that need to modify the document take a mutable copy with `thaw`.
+"""
+
+from typing import Dict, Any
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from types import MappingProxyType
+
+import yaml
+
+# libyaml's loader is several times faster than the pure-Python one
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+def freeze(value):
+    """Return a read-only view: mappings become MappingProxyType, lists tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+def thaw(value):
+    """Return a mutable deep copy of a (possibly frozen) document."""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+class ParsedDocCache:
+    """
+    LRU of content hash -> frozen parsed document (or the parse error).
+    """
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.parse_seconds = 0.0
+        self._entries = OrderedDict()  # hash -> (document, error)
+        self._lock = threading.Lock()
+
+    def get(self, yaml_content: str):
+        """
+        Return the immutable parsed document for a YAML text.
+        Raises yaml.YAMLError (cached as well) if the text does not parse.
+        """
+        key = hashlib.sha256(yaml_content.encode("utf-8")).hexdigest()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if entry is None:
+            started = time.perf_counter()
+            try:
+                entry = (freeze(yaml.load(yaml_content, Loader=YAML_LOADER)), None)
+            except yaml.YAMLError as e:
+                entry = (None, e)
+            with self._lock:
+                self.parse_seconds += time.perf_counter() - started
+                self._entries[key] = entry
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        document, error = entry
+        if error is not None:
+            raise error.with_traceback(None)
+        return document
+
+    def load_mutable(self, yaml_content: str):
+        """Return a private, mutable copy of the parsed document."""
+        return thaw(self.get(yaml_content))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get hit rate, size and mean parse time.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'loader': YAML_LOADER.__name__,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'mean_parse_ms': round(self.parse_seconds / self.misses * 1000, 2) if self.misses else None
+            }
@@ -0,0 +1,121 @@
+"""
+Structured edits for parsed YAML documents.
+Instead of returning a whole rewritten CV, the assistant returns a short
+list of JSON-Patch-style operations ({"op", "path", "value"}) addressing
+nodes by JSON Pointer, e.g. "/cv/sections/experience/0/highlights/-".
+They are applied here to a mutable copy of the parsed document.
+"""
+
+from typing import Any, Dict, List
+import re
+
+OPERATIONS = ("add", "remove", "replace", "move")
+
+class PatchError(ValueError):
+    """An edit operation is malformed or does not fit the document."""
+
+def parse_pointer(path: str) -> List[str]:
+    """Split a JSON Pointer ("/a/b/0") into unescaped tokens."""
+    if not isinstance(path, str) or (path and not path.startswith("/")):
+        raise PatchError(f"Invalid path {path!r}: must start with '/'")
+    if not path:
+        return []
+    return [token.replace("~1", "/").replace("~0", "~") for token in path[1:].split("/")]
+
+def format_pointer(tokens: List[Any]) -> str:
+    """Join tokens back into a JSON Pointer."""
+    return "".join("/" + str(token).replace("~", "~0").replace("/", "~1") for token in tokens)
+
+def _index(container: list, token: str, path: str, allow_end: bool = False) -> int:
+    if allow_end and token == "-":
+        return len(container)
+    if not re.fullmatch(r"0|[1-9]\d*", token):
+        raise PatchError(f"Invalid list index {token!r} in {path}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise PatchError(f"List index {index} out of range in {path}")
+    return index
+
+def _parent(document, tokens: List[str], path: str):
+    """Resolve the container holding the last token of a path."""
+    if not tokens:
+        raise PatchError("The document root cannot be edited")
+    node = document
+    for token in tokens[:-1]:
+        if isinstance(node, dict):
+            if token not in node:
+                raise PatchError(f"Path not found: {path}")
+            node = node[token]
+        elif isinstance(node, list):
+            node = node[_index(node, token, path)]
+        else:
+            raise PatchError(f"Path not found: {path}")
+    return node, tokens[-1]
+
+def _add(document, path: str, value):
+    container, token = _parent(document, parse_pointer(path), path)
+    if isinstance(container, dict):
+        container[token] = value
+    elif isinstance(container, list):
+        container.insert(_index(container, token, path, allow_end=True), value)
+    else:
+        raise PatchError(f"Cannot add below a scalar at {path}")
+
+def _remove(document, path: str):
+    container, token = _parent(document, parse_pointer(path), path)
+    if isinstance(container, dict):
+        if token not in container:
+            raise PatchError(f"Path not found: {path}")
+        return container.pop(token)
+    if isinstance(container, list):
+        return container.pop(_index(container, token, path))
+    raise PatchError(f"Path not found: {path}")
+
+def _replace(document, path: str, value):
+    container, token = _parent(document, parse_pointer(path), path)
+    if isinstance(container, dict):
+        if token not in container:
+            raise PatchError(f"Path not found: {path}")
+        container[token] = value
+    elif isinstance(container, list):
+        container[_index(container, token, path)] = value
+    else:
+        raise PatchError(f"Path not found: {path}")
+
+def validate_operations(operations) -> List[Dict[str, Any]]:
+    """Check the shape of a patch. Returns it unchanged or raises PatchError."""
+    if not isinstance(operations, list):
+        raise PatchError("Edits must be a list of operations")
+    for operation in operations:
+        if not isinstance(operation, dict):
+            raise PatchError("Each edit must be an object")
+        op = operation.get("op")
+        if op not in OPERATIONS:
+            raise PatchError(f"Unsupported edit operation {op!r}")
+        parse_pointer(operation.get("path"))
+        if op in ("add", "replace") and "value" not in operation:
+            raise PatchError(f"'{op}' at {operation.get('path')} needs a value")
+        if op == "move":
+            parse_pointer(operation.get("from"))
+    return operations
+
+def apply_patch(document, operations: List[Dict[str, Any]]):
+    """
+    Apply operations in order to `document`, which is modified in place and
+    returned. Use a mutable copy: if an operation fails, PatchError is raised
+    and the document may be partially edited.
+    """
+    for operation in validate_operations(operations):
+        op, path = operation["op"], operation["path"]
+        if op == "add":
+            _add(document, path, operation["value"])
+        elif op == "remove":
+            _remove(document, path)
+        elif op == "replace":
+            _replace(document, path, operation["value"])
+        elif op == "move":
+            source = operation["from"]
+            if path.startswith(source + "/"):
+                raise PatchError(f"Cannot move {source} into itself")
+            _add(document, path, _remove(document, source))
+    return document
@@ -0,0 +1,304 @@
+"""
+Format-preserving edits of YAML text.
+Dumping a whole CV again after a one-field change drops comments, quoting
+and blank lines and rewrites every line, which defeats render caching and
+bloats diffs. `update_text` compares the original document with the edited
+one and rewrites only the text of the nodes that changed, located through
+the node marks of PyYAML's composer; every other byte is kept. Edits that
+cannot be made in place (flow collections, several entries on one line...)
+or whose result does not parse back to the edited document fall back to
+dumping the whole document.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import yaml
+
+from utils.tree_diff import diff_trees, same_tree
+from utils.yaml_cache import YAML_LOADER
+
+# Keep long CV lines on one line instead of wrapping them at 80 columns
+DUMP_WIDTH = 4096
+
+class _IndentedDumper(yaml.SafeDumper):
+    """Indent block sequences under their key, as RenderCV files do."""
+
+    def increase_indent(self, flow=False, indentless=False):
+        return super().increase_indent(flow, False)
+
+def dump_document(document) -> str:
+    """Serialize a whole document; the fallback when edits cannot be made in place."""
+    return yaml.dump(document, Dumper=_IndentedDumper, default_flow_style=False,
+                     sort_keys=False, allow_unicode=True, width=DUMP_WIDTH)
+
+class _NotInPlace(Exception):
+    """An edit that cannot be expressed by splicing the original text."""
+
+def _dump_lines(value) -> List[str]:
+    return dump_document(value).splitlines()
+
+def _inline_scalar(value, style: Optional[str]) -> Optional[str]:
+    """Single-line text for a scalar, keeping the original quote style for strings."""
+    text = yaml.dump([value], Dumper=_IndentedDumper, default_style=style if isinstance(value, str) else None,
+                     allow_unicode=True, width=DUMP_WIDTH)
+    text = text[2:].rstrip("\n")
+    return None if "\n" in text else text
+
+def _index_nodes(root) -> Dict[Tuple[str, ...], Tuple[Any, Any]]:
+    """Map node paths (tokens as strings) to (node, key node or None)."""
+    nodes = {}
+    pending = [(root, (), None)]
+    while pending:
+        node, path, key_node = pending.pop()
+        nodes[path] = (node, key_node)
+        if isinstance(node, yaml.MappingNode):
+            pending.extend((value, path + (str(key.value),), key) for key, value in node.value)
+        elif isinstance(node, yaml.SequenceNode):
+            pending.extend((item, path + (str(index),), None) for index, item in enumerate(node.value))
+    return nodes
+
+def _last_line(node) -> int:
+    while isinstance(node, (yaml.MappingNode, yaml.SequenceNode)) and node.value:
+        node = node.value[-1][1] if isinstance(node, yaml.MappingNode) else node.value[-1]
+    line = node.end_mark.line
+    # Block scalars end at the start of the following line
+    if node.end_mark.column == 0 and line > node.start_mark.line:
+        line -= 1
+    return line
+
+def _child_spans(container) -> List[Tuple[int, int]]:
+    """(first line, end line exclusive) of each entry of a block mapping or sequence."""
+    if isinstance(container, yaml.MappingNode):
+        return [(key.start_mark.line, _last_line(value) + 1) for key, value in container.value]
+    return [(item.start_mark.line, _last_line(item) + 1) for item in container.value]
+
+class _Splicer:
+    """Collect line edits against the original text."""
+
+    def __init__(self, text: str, original, document):
+        self.lines = text.splitlines(keepends=True)
+        # Splice on whole lines; the original ending is restored in result()
+        self.final_newline = text.endswith("\n")
+        if self.lines and not self.final_newline:
+            self.lines[-1] += "\n"
+        self.nodes = _index_nodes(yaml.compose(text, Loader=YAML_LOADER))
+        self.original = original
+        self.document = document
+        self.edits = []  # (start line, end line exclusive, new lines)
+        self.removed = []  # [old path, first line, end line exclusive, reused] of deleted blocks
+
+    @staticmethod
+    def _value(document, path):
+        for token in path:
+            document = document[token]
+        return document
+
+    def _moved_block(self, parent, new_path, value) -> Optional[List[str]]:
+        """Original lines of a removed sibling holding the same value (a move)."""
+        for removed in self.removed:
+            path, start, end, reused = removed
+            if reused or path[:-1] != parent or isinstance(path[-1], int) != isinstance(new_path[-1], int):
+                continue
+            if (isinstance(path[-1], int) or path[-1] == new_path[-1]) and \
+                    same_tree(self._value(self.original, path), value):
+                removed[3] = True
+                return self.lines[start:end]
+        return None
+
+    def _container(self, path):
+        try:
+            container, _ = self.nodes[tuple(str(token) for token in path)]
+        except KeyError:
+            raise _NotInPlace(path)
+        return container
+
+    def _separator(self, container) -> List[str]:
+        """The blank lines between a container's first two entries, used between added ones."""
+        spans = _child_spans(container)
+        if len(spans) < 2:
+            return []
+        gap = self.lines[spans[0][1]:spans[1][0]]
+        return gap if all(not line.strip() for line in gap) else []
+
+    def _with_separator(self, start: int, end: int, path) -> Tuple[int, int]:
+        """
+        Widen a removed entry's lines by the blank separator next to it: the
+        one below, or above for the last entry. Leaves no double gap behind.
+        """
+        spans = _child_spans(self._container(path[:-1]))
+        index = next((i for i, span in enumerate(spans) if span[0] == start), None)
+        if index is None:
+            return start, end
+        if index + 1 < len(spans):
+            gap = (end, spans[index + 1][0])
+        elif index > 0:
+            gap = (spans[index - 1][1], start)
+        else:
+            return start, end
+        if all(not line.strip() for line in self.lines[gap[0]:gap[1]]):
+            return min(start, gap[0]), max(end, gap[1])
+        return start, end
+
+    def rename(self, old_path, new_key):
+        """Rewrite only the key of a mapping entry whose value is unchanged."""
+        _, key_node = self.nodes.get(tuple(str(token) for token in old_path), (None, None))
+        # Plain keys compose with style None or "" depending on the loader
+        if not isinstance(key_node, yaml.ScalarNode) or key_node.style not in (None, "", "'", '"') \
+                or key_node.start_mark.line != key_node.end_mark.line:
+            raise _NotInPlace(old_path)
+        text = _inline_scalar(new_key, key_node.style or None)
+        if text is None:
+            raise _NotInPlace(old_path)
+        line = self.lines[key_node.start_mark.line]
+        self.edits.append((key_node.start_mark.line, key_node.start_mark.line + 1,
+                           [line[:key_node.start_mark.column] + text + line[key_node.end_mark.column:]]))
+
+    def _entry(self, path, allow_dash: bool):
+        """Locate a mapping entry or list item: (first line, column, line prefix, node, key)."""
+        try:
+            node, key_node = self.nodes[tuple(str(token) for token in path)]
+        except KeyError:
+            raise _NotInPlace(path)
+        mark = (key_node or node).start_mark
+        prefix = self.lines[mark.line][:mark.column]
+        # A mapping entry must start its line; a list item follows its dash
+        allowed = ("", "-") if key_node is not None and allow_dash else ("",) if key_node is not None else ("-",)
+        if prefix.strip() not in allowed:
+            raise _NotInPlace(path)
+        return mark.line, mark.column, prefix, node, key_node
+
+    def _render(self, path, value, prefix: str, column: int) -> List[str]:
+        """Lines for a mapping entry or list item holding `value`."""
+        if isinstance(path[-1], int):
+            body = [line[2:] for line in _dump_lines([value])]
+        else:
+            body = _dump_lines({path[-1]: value})
+        return [prefix + body[0] + "\n"] + [" " * column + line + "\n" for line in body[1:]]
+
+    def replace(self, old_path, new_path):
+        if not old_path:
+            raise _NotInPlace(old_path)
+        value = self._value(self.document, new_path)
+        line, column, prefix, node, key_node = self._entry(old_path, allow_dash=True)
+        if (isinstance(node, yaml.ScalarNode) and node.style in (None, "'", '"')
+                and node.start_mark.line == node.end_mark.line and not isinstance(value, (dict, list))):
+            text = _inline_scalar(value, node.style)
+            if text is not None:
+                source = self.lines[node.start_mark.line]
+                self.edits.append((node.start_mark.line, node.start_mark.line + 1,
+                                   [source[:node.start_mark.column] + text + source[node.end_mark.column:]]))
+                return
+        self.edits.append((line, _last_line(node) + 1, self._render(new_path, value, prefix, column)))
+
+    def remove(self, old_path):
+        line, column, prefix, node, key_node = self._entry(old_path, allow_dash=True)
+        if key_node is None or not prefix.strip():
+            self.edits.append((*self._with_separator(line, _last_line(node) + 1, old_path), []))
+            self.removed.append([tuple(old_path), line, _last_line(node) + 1, False])
+            return
+        # First key of a list item: the next key takes over the dash
+        parent, _ = self.nodes[tuple(str(token) for token in old_path[:-1])]
+        if len(parent.value) < 2:
+            raise _NotInPlace(old_path)
+        following = parent.value[1][0].start_mark
+        if following.column != column:
+            raise _NotInPlace(old_path)
+        self.edits.append((line, following.line + 1, [prefix + self.lines[following.line][column:]]))
+
+    def add(self, new_path, anchor):
+        path, where = anchor
+        value = self._value(self.document, new_path)
+        moved = self._moved_block(tuple(path[:-1]) if where == "before" else tuple(path), new_path, value)
+        if where == "before":
+            line, column, prefix, _, _ = self._entry(path, allow_dash=False)
+            block = moved or self._render(new_path, value, prefix, column)
+            self.edits.append((line, line, block + self._separator(self._container(path[:-1]))))
+            return
+        container = self._container(path)
+        if not isinstance(container, (yaml.MappingNode, yaml.SequenceNode)) or container.flow_style \
+                or not container.value:
+            raise _NotInPlace(path)
+        if isinstance(container, yaml.MappingNode):
+            # Line up with the keys; only the first one of a list item has a dash
+            column = container.value[-1][0].start_mark.column
+            prefix = " " * column
+        else:
+            mark = container.value[-1].start_mark
+            column, prefix = mark.column, self.lines[mark.line][:mark.column]
+            if prefix.strip() != "-":
+                raise _NotInPlace(path)
+        position = _last_line(container) + 1
+        block = moved or self._render(new_path, value, prefix, column)
+        self.edits.append((position, position, self._separator(container) + block))
+
+    def result(self) -> str:
+        out, position = [], 0
+        for start, end, new_lines in sorted(self.edits, key=lambda edit: (edit[0], edit[1])):
+            if start < position:
+                # Neighbouring removals may both claim the blank lines between them
+                if new_lines or any(line.strip() for line in self.lines[start:position]):
+                    raise _NotInPlace("overlapping edits")
+                start = position
+                end = max(end, position)
+            out.extend(self.lines[position:start])
+            out.extend(new_lines)
+            position = end
+        out.extend(self.lines[position:])
+        result = "".join(out)
+        if not self.final_newline and result.endswith("\n"):
+            result = result[:-1]
+        return result
+
+def _renames(changes, original, document) -> List[Tuple[tuple, Any]]:
+    """
+    Pair a removed and an added mapping key that hold the same value at the
+    same position: a renamed key. The pairs are taken out of `changes`.
+    """
+    renames = []
+    for add in [change for change in changes if change["op"] == "add"]:
+        parent_path, where = add["anchor"]
+        parent_path = tuple(parent_path[:-1]) if where == "before" else tuple(parent_path)
+        new_parent = _Splicer._value(document, add["new_path"][:-1])
+        if not isinstance(new_parent, dict):
+            continue
+        position = list(new_parent).index(add["new_path"][-1])
+        for remove in [change for change in changes if change["op"] == "remove"]:
+            old_path = tuple(remove["old_path"])
+            old_parent = _Splicer._value(original, old_path[:-1])
+            if old_path[:-1] != parent_path or not isinstance(old_parent, dict) \
+                    or list(old_parent).index(old_path[-1]) != position:
+                continue
+            if same_tree(old_parent[old_path[-1]], new_parent[add["new_path"][-1]]):
+                renames.append((old_path, add["new_path"][-1]))
+                changes.remove(add)
+                changes.remove(remove)
+                break
+    return renames
+
+def update_text(text: str, document, load: Optional[Callable[[str], Any]] = None) -> str:
+    """
+    Return `text` rewritten so that it parses to `document` (a plain,
+    mutable document), changing only the lines of nodes that differ.
+    `load` parses a text (e.g. ParsedDocCache.get).
+    """
+    load = load or (lambda source: yaml.load(source, Loader=YAML_LOADER))
+    try:
+        original = load(text)
+        splicer = _Splicer(text, original, document)
+        changes = diff_trees(original, document)
+        for old_path, new_key in _renames(changes, original, document):
+            splicer.rename(old_path, new_key)
+        # Removals first, so that moved entries can reuse their original lines
+        for change in sorted(changes, key=lambda change: change["op"] != "remove"):
+            if change["op"] == "replace":
+                splicer.replace(change["old_path"], change["new_path"])
+            elif change["op"] == "remove":
+                splicer.remove(change["old_path"])
+            else:
+                splicer.add(change["new_path"], change["anchor"])
+        updated = splicer.result()
+        if same_tree(load(updated), document):
+            return updated
+    except (_NotInPlace, yaml.YAMLError, KeyError, IndexError, TypeError):
+        pass
+    return dump_document(document)